@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+End-to-end backtest benchmark on synthetic 0-7 DTE chains.
+
+Generates a deterministic SQLite database at the requested scale
+(symbols x days x minutes x expirations x strikes), then runs Backtest
+with each strategy in a fresh interpreter and records ticks/sec, peak RSS
+and database queries/rows fetched. Results can be saved as a JSON
+baseline and later runs compared against it to catch regressions in
+DataHandler, Portfolio and friends.
+
+Usage:
+    python benchmarks/bench_backtest.py [--days 2] [--minutes 60] [--strikes 21]
+        [--expirations 4] [--symbols SPY] [--json out.json]
+        [--save-baseline benchmarks/baseline_backtest.json]
+        [--baseline benchmarks/baseline_backtest.json] [--tolerance 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+STRATEGIES = {
+    'BuyAndHoldStrategy': 'strategy',
+    'SimplePremiumSelling': 'example_strategy',
+}
+
+# Parameter overrides so every strategy actually trades on synthetic data
+# (a flat synthetic surface never reaches the default IV rank threshold)
+STRATEGY_PARAMS = {
+    'SimplePremiumSelling': {'iv_rank_threshold': 40.0},
+}
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline_backtest.json')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (None if unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_scenario(db_path: str, strategy_name: str, start_date: str, end_date: str,
+                 symbols: list) -> dict:
+    """
+    Run one backtest in this process and measure it.
+
+    Args:
+        db_path: Synthetic SQLite database
+        strategy_name: Key of STRATEGIES
+        start_date: Backtest start (YYYY-MM-DD)
+        end_date: Backtest end (YYYY-MM-DD)
+        symbols: Underlying symbols
+
+    Returns:
+        Metrics dictionary
+    """
+    import importlib
+    from contextlib import redirect_stdout
+    from database import get_database
+    from backtest import Backtest
+
+    strategy_class = getattr(importlib.import_module(STRATEGIES[strategy_name]), strategy_name)
+    db = get_database(db_type='sqlite', db_path=db_path)
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        backtest = Backtest(
+            symbols=symbols,
+            start_date=start_date,
+            end_date=end_date,
+            initial_capital=100000,
+            strategy_class=strategy_class,
+            db_connection=db.get_connection(),
+            enable_checkpoints=False,
+            quiet=True,
+            profile=True
+        )
+        for name, value in STRATEGY_PARAMS.get(strategy_name, {}).items():
+            setattr(backtest.strategy, name, value)
+
+        start = time.perf_counter()
+        results = backtest.run(verbose=False)
+        wall_seconds = time.perf_counter() - start
+
+    profiler = backtest.profiler
+    peak_rss = peak_rss_mb()
+    ticks = len(backtest.equity_curve)
+    stages = {row['stage']: row for row in results['profile']}
+
+    return {
+        'ticks': ticks,
+        'loop_seconds': round(profiler.loop_seconds, 4),
+        'wall_seconds': round(wall_seconds, 4),
+        'ticks_per_sec': round(ticks / profiler.loop_seconds, 2) if profiler.loop_seconds else None,
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+        'queries': sum(row['queries'] for row in results['profile']),
+        'rows_fetched': sum(row['rows'] for row in results['profile']),
+        'trades': int(results.get('total_trades', 0)),
+        'final_value': float(results.get('final_value', 0.0)),
+        'stages_ms': {name: row['total_ms'] for name, row in stages.items()},
+    }
+
+
+def run_isolated(db_path: str, strategy_name: str, start_date: str, end_date: str,
+                 symbols: list) -> dict:
+    """Run a scenario in a fresh interpreter so peak RSS is per scenario."""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-one', strategy_name,
+         '--db', db_path, '--start-date', start_date, '--end-date', end_date,
+         '--symbols', *symbols],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{strategy_name} benchmark failed:\n{proc.stderr}")
+
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compare a run against a baseline.
+
+    Throughput may drop and memory may grow by at most `tolerance`
+    (fractional). Query and row counts are deterministic, so any increase
+    is reported.
+
+    Args:
+        current: Benchmark output
+        baseline: Previous benchmark output at the same scale
+        tolerance: Allowed relative slowdown / memory growth
+
+    Returns:
+        List of regression descriptions (empty if none)
+    """
+    regressions = []
+
+    if current['scale'] != baseline['scale']:
+        return [f"scale differs from baseline ({baseline['scale']}), not comparable"]
+
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+
+        if before.get('ticks_per_sec') and now.get('ticks_per_sec'):
+            if now['ticks_per_sec'] < before['ticks_per_sec'] * (1 - tolerance):
+                regressions.append(
+                    f"{name}: ticks/sec {now['ticks_per_sec']:.1f} < baseline {before['ticks_per_sec']:.1f}"
+                )
+
+        if before.get('peak_rss_mb') and now.get('peak_rss_mb'):
+            if now['peak_rss_mb'] > before['peak_rss_mb'] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: peak RSS {now['peak_rss_mb']:.0f} MB > baseline {before['peak_rss_mb']:.0f} MB"
+                )
+
+        for key in ('queries', 'rows_fetched'):
+            if now[key] > before[key]:
+                regressions.append(f"{name}: {key} {now[key]:,} > baseline {before[key]:,}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest throughput benchmark on synthetic chains')
+    parser.add_argument('--symbols', nargs='+', default=['SPY'])
+    parser.add_argument('--days', type=int, default=2)
+    parser.add_argument('--minutes', type=int, default=60, help='Snapshots per day (max 390)')
+    parser.add_argument('--strikes', type=int, default=21, help='Strikes per expiration')
+    parser.add_argument('--expirations', type=int, default=4, help='Daily expirations per snapshot')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--strategies', nargs='+', default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument('--db', help='Reuse/keep the synthetic database at this path')
+    parser.add_argument('--json', dest='json_path', help='Write results as JSON')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE,
+                        help=f'Save results as the baseline (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE,
+                        help='Compare against a saved baseline and fail on regression')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown / memory growth (default: 0.25)')
+    parser.add_argument('--run-one', help=argparse.SUPPRESS)
+    parser.add_argument('--start-date', default='2024-01-15', help='First synthetic session')
+    parser.add_argument('--end-date', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_scenario(args.db, args.run_one, args.start_date,
+                                      args.end_date, args.symbols)))
+        return
+
+    import pandas as pd
+    from synthetic_data import write_synthetic_db
+
+    scale = {
+        'symbols': args.symbols,
+        'days': args.days,
+        'minutes': args.minutes,
+        'strikes': args.strikes,
+        'expirations': args.expirations,
+        'seed': args.seed,
+    }
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='bench_backtest_'), 'synthetic.db')
+    generate_seconds = 0.0
+    if not os.path.exists(db_path):
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull:
+            from contextlib import redirect_stdout
+            with redirect_stdout(devnull):
+                rows = write_synthetic_db(db_path, start_date=args.start_date, **scale)
+        generate_seconds = time.perf_counter() - start
+    else:
+        rows = None
+
+    # End date covers every generated session
+    end_date = (pd.bdate_range(args.start_date, periods=args.days)[-1] + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
+    print("=" * 60)
+    print("BACKTEST BENCHMARK")
+    print("=" * 60)
+    print(f"Scale: {len(args.symbols)} symbols x {args.days} days x {args.minutes} min x "
+          f"{args.expirations} exp x {args.strikes} strikes x 2 types")
+    if rows is not None:
+        print(f"Synthetic rows: {rows:,} ({generate_seconds:.1f}s to generate)")
+    print(f"Database: {db_path}\n")
+
+    results = {}
+    for name in args.strategies:
+        metrics = run_isolated(db_path, name, args.start_date, end_date, args.symbols)
+        results[name] = metrics
+        print(f"{name:22} {metrics['ticks_per_sec']:>9.1f} ticks/s  {metrics['ticks']:>6} ticks  "
+              f"{metrics['peak_rss_mb'] or 0:>7.1f} MB  {metrics['queries']:>7,} queries  "
+              f"{metrics['rows_fetched']:>11,} rows  {metrics['trades']:>4} trades")
+
+    output = {
+        'benchmark': 'backtest',
+        'scale': scale,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(output, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(output, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(output, baseline, args.tolerance)
+        print("=" * 60)
+        if regressions:
+            for regression in regressions:
+                print(f"✗ {regression}")
+            sys.exit(1)
+        print(f"✓ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
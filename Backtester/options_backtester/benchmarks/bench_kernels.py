@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the backtester's inner-loop kernels.
+
+Times each kernel at chain sizes from 10 to 10,000 contracts and compares
+scalar (per-contract Python calls, as the event loop uses them today)
+against vectorized paths:
+
+- greeks:    GreeksCalculator.calculate_greeks per contract vs
+             GreeksCalculator.vectorized_greeks vs a plain NumPy
+             Black-Scholes reference
+- slippage:  ExecutionHandler.model_slippage per contract (pd.Series rows,
+             as execute_market_order calls it) vs the same on plain dicts
+             vs ExecutionHandler.model_slippage_batch when available
+- aggregate: MultiTimeframeAggregator.aggregate_bar per minute bar vs a
+             pandas resample of the same bars
+
+Each measurement is repeated (pytest-benchmark style) and reported as
+min/median/mean/stddev per call plus per-contract cost and speedup over
+the scalar path.
+
+Usage:
+    python benchmarks/bench_kernels.py [--sizes 10 100 1000 10000]
+        [--kernels greeks slippage aggregate] [--min-time 0.2] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+from queue import Queue
+
+import numpy as np
+import pandas as pd
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from greeks import GreeksCalculator
+from execution import ExecutionHandler
+from event_log import EventLogger
+from timeframe_aggregator import MultiTimeframeAggregator
+from synthetic_data import black_scholes
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+KERNELS = ('greeks', 'slippage', 'aggregate')
+
+
+def make_chain(n: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Random but plausible 0-7 DTE chain with n contracts.
+
+    Args:
+        n: Number of contracts
+        seed: Random seed
+
+    Returns:
+        DataFrame with the columns the kernels read
+    """
+    rng = np.random.default_rng(seed)
+    S = np.full(n, 470.0)
+    K = 470.0 + rng.integers(-25, 26, n).astype(float)
+    hours = rng.uniform(0.25, 7 * 24, n)
+    t = hours / (365 * 24)
+    sigma = rng.uniform(0.10, 0.50, n)
+    is_call = np.arange(n) % 2 == 0
+
+    mid = np.maximum(black_scholes(S, K, t, sigma, is_call)['price'], 0.05)
+    spread = np.maximum(0.01, mid * rng.uniform(0.02, 0.30, n))
+
+    return pd.DataFrame({
+        'option_type': np.where(is_call, 'C', 'P'),
+        'underlying_price': S,
+        'strike': K,
+        'time_to_expiry_years': t,
+        'hours_to_expiry': hours,
+        'implied_vol': sigma,
+        'mid_price': mid,
+        'bid_price': np.maximum(mid - spread / 2, 0.0),
+        'ask_price': mid + spread / 2,
+        'quantity': rng.integers(1, 150, n),
+        'side': np.where(rng.random(n) < 0.5, 'BUY', 'SELL'),
+    })
+
+
+def make_minute_bars(n: int, seed: int = 0) -> list:
+    """n one-minute session bars (dicts, as DataHandler feeds them)."""
+    rng = np.random.default_rng(seed)
+    prices = 470.0 * np.exp(np.cumsum(rng.normal(0, 0.0005, n)))
+
+    # Regular sessions only (9:30-16:00 on business days), like real data
+    sessions = pd.bdate_range('2024-01-15', periods=n // 390 + 1)
+    minutes = pd.to_timedelta(np.arange(390), unit='min') + pd.Timedelta(hours=9, minutes=30)
+    timestamps = (sessions.values[:, None] + minutes.values[None, :]).ravel()[:n]
+    timestamps = pd.DatetimeIndex(timestamps)
+    return [
+        {'timestamp': ts, 'open': p, 'high': p, 'low': p, 'close': p, 'volume': 0}
+        for ts, p in zip(timestamps, prices)
+    ]
+
+
+def measure(fn, min_time: float = 0.2, max_rounds: int = 200, min_rounds: int = 3) -> dict:
+    """
+    Time repeated calls of fn.
+
+    Runs until min_time has elapsed (and at least min_rounds calls), like
+    pytest-benchmark's calibration, without the plugin dependency.
+
+    Args:
+        fn: Zero-argument callable
+        min_time: Minimum total measurement time (seconds)
+        max_rounds: Upper bound on calls
+        min_rounds: Lower bound on calls
+
+    Returns:
+        Dict with rounds and min/median/mean/stddev/max in milliseconds
+    """
+    fn()  # Warm up (imports, caches)
+
+    samples = []
+    total = 0.0
+    while (total < min_time or len(samples) < min_rounds) and len(samples) < max_rounds:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed)
+        total += elapsed
+
+    samples_ms = [s * 1000 for s in samples]
+    return {
+        'rounds': len(samples),
+        'min_ms': min(samples_ms),
+        'median_ms': statistics.median(samples_ms),
+        'mean_ms': statistics.fmean(samples_ms),
+        'stddev_ms': statistics.stdev(samples_ms) if len(samples_ms) > 1 else 0.0,
+        'max_ms': max(samples_ms),
+    }
+
+
+def greeks_cases(chain: pd.DataFrame) -> dict:
+    calc = GreeksCalculator(risk_free_rate=0.043)
+    rows = list(zip(chain['option_type'], chain['underlying_price'], chain['strike'],
+                    chain['time_to_expiry_years'], chain['implied_vol']))
+    S = chain['underlying_price'].to_numpy()
+    K = chain['strike'].to_numpy()
+    t = chain['time_to_expiry_years'].to_numpy()
+    sigma = chain['implied_vol'].to_numpy()
+    is_call = (chain['option_type'] == 'C').to_numpy()
+
+    def scalar():
+        for option_type, s, k, tt, vol in rows:
+            calc.calculate_greeks(option_type, s, k, tt, calc.risk_free_rate, vol)
+
+    def vectorized():
+        calc.vectorized_greeks(chain.copy())
+
+    def numpy_reference():
+        black_scholes(S, K, t, sigma, is_call, r=calc.risk_free_rate)
+
+    return {
+        'scalar': scalar,
+        'vectorized': vectorized,
+        'numpy': numpy_reference,
+    }
+
+
+def slippage_cases(chain: pd.DataFrame) -> dict:
+    execution = ExecutionHandler(Queue(), None, logger=EventLogger(sink='off'))
+    series_rows = [row for _, row in chain.iterrows()]
+    dict_rows = chain.to_dict('records')
+
+    def scalar():
+        for row in series_rows:
+            execution.model_slippage(row, row['side'], row['hours_to_expiry'], row['quantity'])
+
+    def scalar_dict():
+        for row in dict_rows:
+            execution.model_slippage(row, row['side'], row['hours_to_expiry'], row['quantity'])
+
+    cases = {
+        'scalar': scalar,
+        'scalar_dict': scalar_dict,
+    }
+
+    if hasattr(execution, 'model_slippage_batch'):
+        def batch():
+            execution.model_slippage_batch(chain, chain['side'].to_numpy(),
+                                           chain['hours_to_expiry'].to_numpy(),
+                                           chain['quantity'].to_numpy())
+        cases['vectorized'] = batch
+
+    return cases
+
+
+def aggregate_cases(n: int) -> dict:
+    bars = make_minute_bars(n)
+    frame = pd.DataFrame(bars).set_index('timestamp')
+    timeframes = MultiTimeframeAggregator().timeframes
+
+    def scalar():
+        aggregator = MultiTimeframeAggregator()
+        for bar in bars:
+            aggregator.aggregate_bar(bar)
+
+    def vectorized():
+        for tf in timeframes:
+            frame.resample(f'{tf}min').agg({'open': 'first', 'high': 'max', 'low': 'min',
+                                            'close': 'last', 'volume': 'sum'})
+
+    return {
+        'scalar': scalar,
+        'vectorized': vectorized,
+    }
+
+
+def run_kernel(kernel: str, size: int, min_time: float) -> list:
+    """Measure every path of one kernel at one size."""
+    if kernel == 'aggregate':
+        cases = aggregate_cases(size)
+    else:
+        chain = make_chain(size)
+        cases = greeks_cases(chain) if kernel == 'greeks' else slippage_cases(chain)
+
+    rows = []
+    for path, fn in cases.items():
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                stats = measure(fn, min_time=min_time)
+        except Exception as e:
+            # e.g. py_vollib_vectorized failing to compile under this numba
+            rows.append({'kernel': kernel, 'path': path, 'size': size,
+                         'error': f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"})
+            continue
+
+        stats.update({
+            'kernel': kernel,
+            'path': path,
+            'size': size,
+            'per_item_us': stats['median_ms'] * 1000 / size,
+        })
+        rows.append(stats)
+
+    scalar_ms = next((r['median_ms'] for r in rows if r['path'] == 'scalar' and 'error' not in r), None)
+    for row in rows:
+        if 'error' not in row:
+            row['speedup_vs_scalar'] = scalar_ms / row['median_ms'] if scalar_ms and row['median_ms'] > 0 else None
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inner-loop kernel micro-benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Chain sizes (contracts, or minute bars for aggregate)')
+    parser.add_argument('--kernels', nargs='+', default=list(KERNELS), choices=KERNELS)
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='Minimum measurement time per case in seconds (default: 0.2)')
+    parser.add_argument('--json', dest='json_path', help='Write results as JSON')
+    args = parser.parse_args()
+
+    results = []
+
+    print("=" * 78)
+    print("KERNEL MICRO-BENCHMARKS")
+    print("=" * 78)
+    print(f"{'Kernel':<10}{'Path':<13}{'Size':>7}{'Rounds':>8}{'Median ms':>12}"
+          f"{'Stddev ms':>11}{'us/item':>10}{'Speedup':>9}")
+    print("-" * 78)
+
+    for kernel in args.kernels:
+        for size in args.sizes:
+            for row in run_kernel(kernel, size, args.min_time):
+                results.append(row)
+                if 'error' in row:
+                    print(f"{row['kernel']:<10}{row['path']:<13}{row['size']:>7}  failed: {row['error'][:40]}")
+                    continue
+                print(f"{row['kernel']:<10}{row['path']:<13}{row['size']:>7}{row['rounds']:>8}"
+                      f"{row['median_ms']:>12.3f}{row['stddev_ms']:>11.3f}"
+                      f"{row['per_item_us']:>10.2f}{row['speedup_vs_scalar'] or 0:>8.2f}x")
+        print("-" * 78)
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({
+                'benchmark': 'kernels',
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'platform': platform.platform(),
+                'results': results,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for run_backtest.py.
+
+Every backtest the web server spawns pays for interpreter startup and
+module-level imports before simulating a single tick. This measures the
+import cost with `python -X importtime` and fails if it exceeds a budget
+or if a deferred heavy dependency is imported eagerly again.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms 800] [--runs 5] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy modules that must only be imported on first use
+DEFERRED_MODULES = [
+    'sklearn',
+    'scipy',
+    'tqdm',
+    'requests',
+    'matplotlib',
+    'strategy_validation',
+]
+
+
+def measure_import(module: str = 'run_backtest') -> dict:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Module to import (resolved from the backtester root)
+
+    Returns:
+        Dict with cumulative import time, wall time, heaviest imports and
+        the set of top-level packages that were loaded
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    module_entry = next((entry for entry in imports if entry[0] == module), None)
+    loaded = {name.split('.')[0] for name, _, _ in imports}
+
+    return {
+        'module': module,
+        'import_ms': module_entry[2] / 1000 if module_entry else None,
+        'wall_ms': wall_ms,
+        'heaviest': [
+            {'module': name, 'cumulative_ms': cum / 1000}
+            for name, _, cum in sorted(imports, key=lambda e: e[2], reverse=True)[:10]
+        ],
+        'loaded_packages': sorted(loaded),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='run_backtest.py cold-start benchmark')
+    parser.add_argument('--budget-ms', type=float, default=800.0,
+                        help='Max median cumulative import time (default: 800)')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to sample')
+    parser.add_argument('--json', dest='json_path', help='Write results as JSON')
+    args = parser.parse_args()
+
+    samples = [measure_import() for _ in range(args.runs)]
+    import_ms = sorted(s['import_ms'] for s in samples)
+    wall_ms = sorted(s['wall_ms'] for s in samples)
+    median_import = import_ms[len(import_ms) // 2]
+    median_wall = wall_ms[len(wall_ms) // 2]
+
+    eager = [m for m in DEFERRED_MODULES if m in samples[-1]['loaded_packages']]
+
+    result = {
+        'benchmark': 'startup',
+        'runs': args.runs,
+        'median_import_ms': median_import,
+        'median_wall_ms': median_wall,
+        'budget_ms': args.budget_ms,
+        'eagerly_imported': eager,
+        'heaviest': samples[-1]['heaviest'],
+        'passed': median_import <= args.budget_ms and not eager,
+    }
+
+    print("=" * 60)
+    print("STARTUP BENCHMARK: import run_backtest")
+    print("=" * 60)
+    print(f"Median import time:  {median_import:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"Median process wall: {median_wall:.1f} ms")
+    print("\nHeaviest imports (cumulative):")
+    for entry in result['heaviest']:
+        print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+    if eager:
+        print(f"\n✗ Deferred modules imported at startup: {', '.join(eager)}")
+    print("=" * 60)
+    print("✓ PASSED" if result['passed'] else "✗ FAILED")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    sys.exit(0 if result['passed'] else 1)
+
+
+if __name__ == "__main__":
+    main()
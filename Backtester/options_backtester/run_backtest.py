@@ -1,306 +1,557 @@
-#!/usr/bin/env python3
-"""
-Backtest Runner Script
-
-Runs a backtest configuration and outputs results in JSON format
-Called by Node.js backtester bridge
-"""
-
-import sys
-import json
-import os
-from pathlib import Path
-
-# Add src directory to path
-sys.path.insert(0, str(Path(__file__).parent / 'src'))
-
-from backtest import Backtest
-from database import get_database
-from strategy import BuyAndHoldStrategy
-from metrics import calculate_advanced_metrics
-from strategy_validation import StrategyValidator
-import pandas as pd
-import requests
-
-
-def load_config(config_path):
-    """Load backtest configuration from JSON file"""
-    with open(config_path, 'r') as f:
-        return json.load(f)
-
-
-def fetch_spy_data(start_date, end_date):
-    """
-    Fetch SPY benchmark data for alpha/beta calculation
-
-    Args:
-        start_date: Start date string (YYYY-MM-DD)
-        end_date: End date string (YYYY-MM-DD)
-
-    Returns:
-        DataFrame with timestamp and price columns, or None if fetch fails
-    """
-    try:
-        # Try to fetch from ThetaData local terminal
-        # Using stock endpoint for SPY
-        print(f"Fetching SPY benchmark data from {start_date} to {end_date}...")
-
-        # Format dates for ThetaData API (YYYYMMDD)
-        start_formatted = start_date.replace('-', '')
-        end_formatted = end_date.replace('-', '')
-
-        url = f"http://127.0.0.1:25510/v2/hist/stock/quote?root=SPY&start_date={start_formatted}&end_date={end_formatted}"
-
-        response = requests.get(url, timeout=30)
-
-        if response.status_code == 200:
-            data = response.json()
-            if 'response' in data and len(data['response']) > 0:
-                # Parse ThetaData response
-                spy_data = []
-                for record in data['response']:
-                    # ThetaData format: [ms_of_day, bid, bid_size, ask, ask_size, date]
-                    # For simplicity, use mid price
-                    if len(record) >= 6:
-                        date = record[5]  # YYYYMMDD format
-                        bid = record[1]
-                        ask = record[3]
-                        mid_price = (bid + ask) / 2 if bid and ask else None
-
-                        if mid_price:
-                            # Convert date to datetime
-                            date_str = str(date)
-                            timestamp = pd.to_datetime(date_str, format='%Y%m%d')
-                            spy_data.append({
-                                'timestamp': timestamp,
-                                'price': mid_price
-                            })
-
-                if spy_data:
-                    df = pd.DataFrame(spy_data)
-                    # Group by date and take last price of each day
-                    df['date'] = df['timestamp'].dt.date
-                    df = df.groupby('date').last().reset_index()
-                    print(f"✅ Fetched {len(df)} SPY data points")
-                    return df
-
-        print("⚠️ Could not fetch SPY data from ThetaData, alpha/beta will not be calculated")
-        return None
-
-    except Exception as e:
-        print(f"⚠️ Error fetching SPY data: {e}")
-        print("Alpha/beta calculation will be skipped")
-        return None
-
-
-def run_backtest_from_config(config):
-    """
-    Run backtest from configuration dictionary
-
-    Args:
-        config: Configuration dictionary with:
-            - config_id: Unique ID for this backtest
-            - symbols: List of symbols to trade
-            - start_date: Start date (YYYY-MM-DD)
-            - end_date: End date (YYYY-MM-DD)
-            - initial_capital: Starting capital
-            - strategy_name: Strategy class name
-            - strategy_params: Strategy parameters
-            - commission: Commission per contract
-
-    Returns:
-        Dictionary with backtest results
-    """
-
-    print(f"\n{'='*60}")
-    print(f"STARTING BACKTEST: {config['config_id']}")
-    print(f"{'='*60}\n")
-
-    # Get database connection
-    db = get_database(db_type='sqlite')
-
-    # Map strategy name to strategy class
-    # For now, only BuyAndHoldStrategy is available
-    # TODO: Add more strategies
-    strategy_map = {
-        'BuyAndHold': BuyAndHoldStrategy,
-        'BuyAndHoldStrategy': BuyAndHoldStrategy
-    }
-
-    strategy_name = config.get('strategy_name', 'BuyAndHold')
-    strategy_class = strategy_map.get(strategy_name, BuyAndHoldStrategy)
-
-    print(f"Strategy: {strategy_name}")
-    print(f"Symbols: {config['symbols']}")
-    print(f"Date Range: {config['start_date']} to {config['end_date']}")
-    print(f"Initial Capital: ${config['initial_capital']:,.2f}\n")
-
-    # Create backtest engine
-    backtest = Backtest(
-        symbols=config['symbols'],
-        start_date=config['start_date'],
-        end_date=config['end_date'],
-        initial_capital=config['initial_capital'],
-        strategy_class=strategy_class,
-        db_connection=db.get_connection(),
-        commission=config.get('commission', 0.05)
-    )
-
-    # Run backtest
-    results = backtest.run(verbose=True)
-
-    # Fetch SPY data for alpha/beta calculation
-    spy_data = fetch_spy_data(config['start_date'], config['end_date'])
-
-    # Calculate advanced metrics (alpha, beta, Sortino, Calmar, etc.)
-    if 'equity_curve' in results and isinstance(results['equity_curve'], pd.DataFrame):
-        max_dd = results.get('max_drawdown', 0.0)
-        advanced_metrics = calculate_advanced_metrics(
-            results['equity_curve'],
-            benchmark_data=spy_data,
-            max_drawdown=max_dd
-        )
-
-        # Add advanced metrics to results
-        results.update(advanced_metrics)
-
-        print(f"\n{'='*60}")
-        print("ADVANCED METRICS")
-        print(f"{'='*60}")
-        if advanced_metrics.get('alpha') is not None:
-            print(f"Alpha (vs SPY):        {advanced_metrics['alpha']:.4f}")
-            print(f"Beta (vs SPY):         {advanced_metrics['beta']:.4f}")
-            print(f"R-Squared:             {advanced_metrics['r_squared']:.4f}")
-            print(f"Information Ratio:     {advanced_metrics['information_ratio']:.4f}")
-        print(f"Sortino Ratio:         {advanced_metrics['sortino_ratio']:.4f}")
-        print(f"Calmar Ratio:          {advanced_metrics['calmar_ratio']:.4f}")
-        print(f"{'='*60}\n")
-
-    # Run Strategy Validation (Professional-grade deployment readiness)
-    if 'equity_curve' in results and isinstance(results['equity_curve'], pd.DataFrame):
-        print(f"\n{'='*60}")
-        print("RUNNING STRATEGY VALIDATION")
-        print(f"{'='*60}\n")
-
-        # Prepare validation inputs
-        equity_curve_df = results['equity_curve'].copy()
-        trades_list = []
-
-        # Convert trades DataFrame to list of dicts if available
-        if 'trades' in results and isinstance(results['trades'], pd.DataFrame):
-            trades_df = results['trades']
-            for idx, row in trades_df.iterrows():
-                trade = {}
-                for col in trades_df.columns:
-                    value = row[col]
-                    if pd.notna(value):
-                        trade[col] = float(value) if isinstance(value, (int, float)) else value
-                trades_list.append(trade)
-
-        # Create validator and run validation
-        validator = StrategyValidator(
-            equity_curve=equity_curve_df,
-            trades=trades_list,
-            initial_capital=config['initial_capital'],
-            benchmark_returns=None  # TODO: Convert SPY data to returns if available
-        )
-
-        validation_results = validator.validate_all()
-
-        # Add validation results to backtest results
-        results['validation'] = validation_results
-        results['deployment_ready'] = validation_results.get('deployment_ready', False)
-        results['deployment_readiness_score'] = validation_results.get('deployment_readiness_score', 0.0)
-
-    # Convert equity curve DataFrame to list of dicts for JSON serialization
-    if 'equity_curve' in results and isinstance(results['equity_curve'], pd.DataFrame):
-        equity_df = results['equity_curve']
-        equity_curve = []
-
-        for idx, row in equity_df.iterrows():
-            equity_curve.append({
-                'timestamp': row['timestamp'].isoformat() if hasattr(row['timestamp'], 'isoformat') else str(row['timestamp']),
-                'total_value': float(row['total_value']),
-                'settled_cash': float(row.get('settled_cash', 0)),
-                'unsettled_cash': float(row.get('unsettled_cash', 0)),
-                'num_positions': int(row.get('num_positions', 0))
-            })
-
-        results['equity_curve'] = equity_curve
-
-    # Convert trades DataFrame to list of dicts
-    if 'trades' in results and isinstance(results['trades'], pd.DataFrame):
-        trades_df = results['trades']
-        trades_data = []
-
-        for idx, row in trades_df.iterrows():
-            trade = {}
-            for col in trades_df.columns:
-                value = row[col]
-                if pd.isna(value):
-                    trade[col] = None
-                elif hasattr(value, 'isoformat'):
-                    trade[col] = value.isoformat()
-                elif isinstance(value, (int, float)):
-                    trade[col] = float(value)
-                else:
-                    trade[col] = str(value)
-            trades_data.append(trade)
-
-        results['trades_data'] = trades_data
-        del results['trades']
-
-    # Remove positions DataFrame (not needed in JSON output)
-    if 'positions' in results:
-        del results['positions']
-
-    # Convert numpy types to Python native types
-    for key, value in results.items():
-        if hasattr(value, 'item'):  # numpy scalar
-            results[key] = value.item()
-
-    # Output results as JSON
-    print(f"\n{'='*60}")
-    print("BACKTEST RESULTS (JSON)")
-    print(f"{'='*60}\n")
-
-    # Print JSON for parsing by Node.js
-    print(json.dumps(results, indent=2))
-
-    return results
-
-
-def main():
-    """Main entry point"""
-    if len(sys.argv) < 2:
-        print("Usage: python run_backtest.py <config_file.json>")
-        sys.exit(1)
-
-    config_path = sys.argv[1]
-
-    if not os.path.exists(config_path):
-        print(f"Error: Config file not found: {config_path}")
-        sys.exit(1)
-
-    try:
-        # Load configuration
-        config = load_config(config_path)
-
-        # Run backtest
-        results = run_backtest_from_config(config)
-
-        # Success
-        sys.exit(0)
-
-    except Exception as e:
-        print(f"\n{'='*60}")
-        print(f"ERROR: Backtest failed")
-        print(f"{'='*60}")
-        print(f"{type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+"""
+Backtest Runner Script
+
+Runs a backtest configuration and outputs results in JSON format
+Called by Node.js backtester bridge
+
+Use --worker to keep one long-lived process serving many configs
+(from stdin, or from a Unix socket with --socket <path>).
+"""
+
+import sys
+import json
+import os
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from backtest import Backtest
+from database import get_database
+from strategy import BuyAndHoldStrategy
+from metrics import calculate_advanced_metrics
+from result_cache import ResultCache
+from results_writer import ResultsWriter, write_results
+from progress import ProgressReporter
+import pandas as pd
+
+# Deferred until first use to keep cold start fast (every job the web
+# server spawns pays for module-level imports):
+#   requests            - only for the SPY benchmark fetch
+#   strategy_validation - pulls in scipy.stats, only needed after the run
+
+
+def load_config(config_path):
+    """Load backtest configuration from JSON file"""
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+def fetch_spy_data(start_date, end_date):
+    """
+    Fetch SPY benchmark data for alpha/beta calculation
+
+    Args:
+        start_date: Start date string (YYYY-MM-DD)
+        end_date: End date string (YYYY-MM-DD)
+
+    Returns:
+        DataFrame with timestamp and price columns, or None if fetch fails
+    """
+    try:
+        import requests
+
+        # Try to fetch from ThetaData local terminal
+        # Using stock endpoint for SPY
+        print(f"Fetching SPY benchmark data from {start_date} to {end_date}...")
+
+        # Format dates for ThetaData API (YYYYMMDD)
+        start_formatted = start_date.replace('-', '')
+        end_formatted = end_date.replace('-', '')
+
+        url = f"http://127.0.0.1:25510/v2/hist/stock/quote?root=SPY&start_date={start_formatted}&end_date={end_formatted}"
+
+        response = requests.get(url, timeout=30)
+
+        if response.status_code == 200:
+            data = response.json()
+            if 'response' in data and len(data['response']) > 0:
+                # Parse ThetaData response
+                spy_data = []
+                for record in data['response']:
+                    # ThetaData format: [ms_of_day, bid, bid_size, ask, ask_size, date]
+                    # For simplicity, use mid price
+                    if len(record) >= 6:
+                        date = record[5]  # YYYYMMDD format
+                        bid = record[1]
+                        ask = record[3]
+                        mid_price = (bid + ask) / 2 if bid and ask else None
+
+                        if mid_price:
+                            # Convert date to datetime
+                            date_str = str(date)
+                            timestamp = pd.to_datetime(date_str, format='%Y%m%d')
+                            spy_data.append({
+                                'timestamp': timestamp,
+                                'price': mid_price
+                            })
+
+                if spy_data:
+                    df = pd.DataFrame(spy_data)
+                    # Group by date and take last price of each day
+                    df['date'] = df['timestamp'].dt.date
+                    df = df.groupby('date').last().reset_index()
+                    print(f"✅ Fetched {len(df)} SPY data points")
+                    return df
+
+        print("⚠️ Could not fetch SPY data from ThetaData, alpha/beta will not be calculated")
+        return None
+
+    except Exception as e:
+        print(f"⚠️ Error fetching SPY data: {e}")
+        print("Alpha/beta calculation will be skipped")
+        return None
+
+
+def run_backtest_from_config(config, db=None, connection=None):
+    """
+    Run backtest from configuration dictionary
+
+    Args:
+        config: Configuration dictionary with:
+            - config_id: Unique ID for this backtest
+            - symbols: List of symbols to trade
+            - start_date: Start date (YYYY-MM-DD)
+            - end_date: End date (YYYY-MM-DD)
+            - initial_capital: Starting capital
+            - strategy_name: Strategy class name
+            - strategy_params: Strategy parameters
+            - commission: Commission per contract
+            - use_cache: Serve identical configs from the result cache (default: True)
+            - cache_max_mb: Result cache size budget in MB (default: 256)
+            - output_format: 'json' (default), 'ndjson', 'columnar' or 'arrow'
+            - output_path: Write results to this file/pipe instead of stdout;
+              stdout then only carries the summary JSON
+            - progress_channel: Send NDJSON progress to this fd number,
+              'unix:<path>' socket or file instead of PROGRESS: lines on
+              stdout (default: $BACKTEST_PROGRESS_CHANNEL)
+            - progress_interval: Minimum seconds between progress records
+              (default: 0.5)
+            - quiet: Suppress per-order/fill/settlement log lines (default: False)
+            - log_level: Event log level: 'debug', 'info' (default),
+              'warning', 'error' or 'off'
+            - profile: Add per-stage timings and DB query counts to the
+              results under 'profile' (default: False)
+            - mark_pricing: Value open positions at 'mid' (default) or
+              'conservative' (longs at bid, shorts at ask)
+            - greek_limits: Max absolute net Greeks per underlying, e.g.
+              {"delta": 500, "vega": 2000} (default: no limits)
+            - shard_by_day: Simulate sessions in parallel worker processes
+              and stitch them (every session ends flat at 3:55pm; default: False).
+              Not with prefetch_depth, compact_dtypes or profile, nor for
+              strategies that read multi-timeframe bars
+            - workers: Worker processes for shard_by_day (default: CPU count)
+            - prefetch_depth: Session blocks to load ahead on a background
+              thread (default: 0, synchronous queries)
+            - compact_dtypes: Hold chains as float32 prices and Greeks and
+              categorical symbols; adds 'chain_memory' to the results
+              (default: False)
+            - auto_close: Flatten at 3:55pm every session (default: True);
+              False holds positions overnight until exit or expiry
+        db: Optional DatabaseManager to reuse (worker mode)
+        connection: Optional open connection to reuse (worker mode)
+
+    Returns:
+        Dictionary with backtest results
+    """
+
+    print(f"\n{'='*60}")
+    print(f"STARTING BACKTEST: {config['config_id']}")
+    print(f"{'='*60}\n")
+
+    # Get database connection
+    if db is None:
+        db = get_database(db_type='sqlite')
+    if connection is None:
+        connection = db.get_connection()
+
+    # Serve identical configs against unchanged data from the result cache
+    cache = None
+    cache_key = None
+    streams_json_to_stdout = (config.get('output_format', 'json') == 'json'
+                              and config.get('output_path') is None)
+    if config.get('use_cache', True) and streams_json_to_stdout:
+        cache = ResultCache(
+            cache_dir=config.get('cache_dir'),
+            max_bytes=int(config.get('cache_max_mb', 256) * 1024 * 1024)
+        )
+        cache_key = cache.make_key(config, db.get_data_version())
+        cached_json = cache.get_text(cache_key)
+
+        if cached_json is not None:
+            print(f"⚡ Result cache hit ({cache_key[:12]})")
+            print(f"\n{'='*60}")
+            print("BACKTEST RESULTS (JSON)")
+            print(f"{'='*60}\n")
+            print(cached_json)
+            return json.loads(cached_json)
+
+    # Map strategy name to strategy class
+    # For now, only BuyAndHoldStrategy is available
+    # TODO: Add more strategies
+    strategy_map = {
+        'BuyAndHold': BuyAndHoldStrategy,
+        'BuyAndHoldStrategy': BuyAndHoldStrategy
+    }
+
+    strategy_name = config.get('strategy_name', 'BuyAndHold')
+    strategy_class = strategy_map.get(strategy_name, BuyAndHoldStrategy)
+
+    print(f"Strategy: {strategy_name}")
+    print(f"Symbols: {config['symbols']}")
+    print(f"Date Range: {config['start_date']} to {config['end_date']}")
+    print(f"Initial Capital: ${config['initial_capital']:,.2f}\n")
+
+    # Structured progress channel (keeps stdout for results only)
+    progress = None
+    progress_channel = config.get('progress_channel', os.environ.get('BACKTEST_PROGRESS_CHANNEL'))
+    if progress_channel is not None:
+        progress = ProgressReporter.open(progress_channel, config.get('progress_interval', 0.5))
+
+    # Create backtest engine
+    if config.get('shard_by_day', False):
+        if not config.get('auto_close', True):
+            raise ValueError("shard_by_day needs auto_close (every session must end flat)")
+        # Per-session runs neither prefetch across sessions nor merge profiles or chain memory stats
+        unsupported = [key for key in ('prefetch_depth', 'compact_dtypes', 'profile') if config.get(key)]
+        if unsupported:
+            raise ValueError(f"shard_by_day does not support {', '.join(unsupported)}")
+        from sharding import ShardedBacktest
+
+        backtest = ShardedBacktest(
+            symbols=config['symbols'],
+            start_date=config['start_date'],
+            end_date=config['end_date'],
+            initial_capital=config['initial_capital'],
+            strategy_class=strategy_class,
+            db=db,
+            connection=connection,
+            commission=config.get('commission', 0.05),
+            workers=config.get('workers'),
+            progress=progress,
+            quiet=config.get('quiet', False),
+            log_level=config.get('log_level', 'info'),
+            mark_pricing=config.get('mark_pricing', 'mid'),
+            greek_limits=config.get('greek_limits')
+        )
+    else:
+        backtest = Backtest(
+            symbols=config['symbols'],
+            start_date=config['start_date'],
+            end_date=config['end_date'],
+            initial_capital=config['initial_capital'],
+            strategy_class=strategy_class,
+            db_connection=connection,
+            commission=config.get('commission', 0.05),
+            progress=progress,
+            quiet=config.get('quiet', False),
+            log_level=config.get('log_level', 'info'),
+            profile=config.get('profile', False),
+            mark_pricing=config.get('mark_pricing', 'mid'),
+            greek_limits=config.get('greek_limits'),
+            prefetch_depth=config.get('prefetch_depth', 0),
+            compact_dtypes=config.get('compact_dtypes', False),
+            auto_close=config.get('auto_close', True)
+        )
+
+    # Run backtest
+    try:
+        results = backtest.run()
+    finally:
+        if progress is not None:
+            progress.close()
+
+    # Fetch SPY data for alpha/beta calculation
+    spy_data = fetch_spy_data(config['start_date'], config['end_date'])
+
+    # Calculate advanced metrics (alpha, beta, Sortino, Calmar, etc.)
+    if 'equity_curve' in results and isinstance(results['equity_curve'], pd.DataFrame):
+        max_dd = results.get('max_drawdown', 0.0)
+        advanced_metrics = calculate_advanced_metrics(
+            results['equity_curve'],
+            benchmark_data=spy_data,
+            max_drawdown=max_dd
+        )
+
+        # Add advanced metrics to results
+        results.update(advanced_metrics)
+
+        print(f"\n{'='*60}")
+        print("ADVANCED METRICS")
+        print(f"{'='*60}")
+        if advanced_metrics.get('alpha') is not None:
+            print(f"Alpha (vs SPY):        {advanced_metrics['alpha']:.4f}")
+            print(f"Beta (vs SPY):         {advanced_metrics['beta']:.4f}")
+            print(f"R-Squared:             {advanced_metrics['r_squared']:.4f}")
+            print(f"Information Ratio:     {advanced_metrics['information_ratio']:.4f}")
+        print(f"Sortino Ratio:         {advanced_metrics['sortino_ratio']:.4f}")
+        print(f"Calmar Ratio:          {advanced_metrics['calmar_ratio']:.4f}")
+        print(f"{'='*60}\n")
+
+    # Run Strategy Validation (Professional-grade deployment readiness)
+    if 'equity_curve' in results and isinstance(results['equity_curve'], pd.DataFrame):
+        print(f"\n{'='*60}")
+        print("RUNNING STRATEGY VALIDATION")
+        print(f"{'='*60}\n")
+
+        from strategy_validation import StrategyValidator
+
+        # Prepare validation inputs (validator expects a 'value' column)
+        equity_curve_df = results['equity_curve'].rename(columns={'total_value': 'value'})
+        trades_list = []
+
+        # Convert trades DataFrame to list of dicts if available
+        if 'trades' in results and isinstance(results['trades'], pd.DataFrame):
+            trades_list = [
+                {col: value for col, value in trade.items() if pd.notna(value)}
+                for trade in results['trades'].to_dict('records')
+            ]
+
+        # Create validator and run validation
+        validator = StrategyValidator(
+            equity_curve=equity_curve_df,
+            trades=trades_list,
+            initial_capital=config['initial_capital'],
+            benchmark_returns=None  # TODO: Convert SPY data to returns if available
+        )
+
+        validation_results = validator.validate_all()
+
+        # Add validation results to backtest results
+        results['validation'] = validation_results
+        results['deployment_ready'] = validation_results.get('deployment_ready', False)
+        results['deployment_readiness_score'] = validation_results.get('deployment_readiness_score', 0.0)
+
+    # Serialize equity curve and trades straight from the DataFrames,
+    # streamed in chunks (positions are not needed in the output)
+    output_format = config.get('output_format', 'json')
+    output_path = config.get('output_path')
+
+    if output_path is not None:
+        summary = write_results(results, fmt=output_format, path=output_path)
+        summary['results_path'] = output_path
+        summary['results_format'] = output_format
+
+        print(f"\n{'='*60}")
+        print("BACKTEST RESULTS (JSON)")
+        print(f"{'='*60}\n")
+        print(json.dumps(summary, indent=2, default=str))
+        return results
+
+    print(f"\n{'='*60}")
+    print("BACKTEST RESULTS (JSON)")
+    print(f"{'='*60}\n")
+    sys.stdout.flush()
+
+    # Print JSON for parsing by Node.js, teeing it into the result cache
+    if cache is not None:
+        with cache.writer(cache_key) as cache_file:
+            ResultsWriter(TeeStream(sys.stdout, cache_file), output_format).write(results)
+    else:
+        ResultsWriter(sys.stdout, output_format).write(results)
+
+    return results
+
+
+class TeeStream:
+    """Text stream that duplicates writes to several streams"""
+
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
+
+def print_backtest_error(e):
+    """Print a failed backtest in the format the Node.js bridge expects"""
+    print(f"\n{'='*60}")
+    print(f"ERROR: Backtest failed")
+    print(f"{'='*60}")
+    print(f"{type(e).__name__}: {str(e)}")
+    import traceback
+    traceback.print_exc()
+
+
+class BacktestWorker:
+    """
+    Long-lived worker that runs many backtests in one process.
+
+    Spawning a fresh interpreter per config pays for startup, heavy imports,
+    engine creation and a cold SQLite page cache on every job. The worker
+    pays them once and keeps them warm between jobs.
+
+    Protocol: one job per line, either a JSON config object or a path to a
+    config file. Each job's output is the same as a one-shot run (PROGRESS
+    lines, results JSON) framed by:
+
+        JOB_START: <config_id>
+        JOB_END: <config_id> OK|ERROR
+    """
+
+    def __init__(self, sqlite_cache_mb: int = 256):
+        """
+        Initialize worker with a persistent database connection.
+
+        Args:
+            sqlite_cache_mb: SQLite page cache size kept warm between jobs
+        """
+        # Pay for the imports one-shot runs defer, once per worker
+        import requests  # noqa: F401
+        import strategy_validation  # noqa: F401
+
+        self.db = get_database(db_type='sqlite')
+        self.connection = self.db.get_connection()
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+
+        # Larger page cache and memory-mapped reads so repeated jobs over
+        # the same date range are served from memory
+        if self.db.db_type == 'sqlite':
+            self.connection.exec_driver_sql(f"PRAGMA cache_size = -{sqlite_cache_mb * 1024}")
+            self.connection.exec_driver_sql(f"PRAGMA mmap_size = {sqlite_cache_mb * 1024 * 1024}")
+
+    def parse_job(self, line: str) -> dict:
+        """
+        Parse a job line into a config dictionary.
+
+        Args:
+            line: JSON config object or path to a config file
+
+        Returns:
+            Config dictionary
+        """
+        line = line.strip()
+        if line.startswith('{'):
+            return json.loads(line)
+        return load_config(line)
+
+    def run_job(self, line: str) -> bool:
+        """
+        Run a single job, writing its framed output to stdout.
+
+        Args:
+            line: Job line (JSON config or config path)
+
+        Returns:
+            True if the backtest succeeded
+        """
+        config_id = 'unknown'
+        success = False
+
+        try:
+            config = self.parse_job(line)
+            config_id = config.get('config_id', config_id)
+            print(f"JOB_START: {config_id}", flush=True)
+
+            run_backtest_from_config(config, db=self.db, connection=self.connection)
+            success = True
+
+        except Exception as e:
+            if config_id == 'unknown':
+                print(f"JOB_START: {config_id}")
+            print_backtest_error(e)
+
+        finally:
+            # End the implicit read transaction so the next job sees newly
+            # loaded data and writers are never blocked by this worker
+            self.connection.rollback()
+
+        if success:
+            self.jobs_completed += 1
+        else:
+            self.jobs_failed += 1
+
+        print(f"JOB_END: {config_id} {'OK' if success else 'ERROR'}", flush=True)
+        return success
+
+    def serve_stdin(self):
+        """Process jobs from stdin until EOF."""
+        print("WORKER_READY", flush=True)
+
+        for line in sys.stdin:
+            if line.strip():
+                self.run_job(line)
+
+    def serve_socket(self, socket_path: str):
+        """
+        Process jobs from a local Unix socket.
+
+        Each connection may send any number of job lines; a job's output is
+        written back on the connection that submitted it. Jobs run one at a
+        time so they share the warm state.
+
+        Args:
+            socket_path: Filesystem path for the socket
+        """
+        import io
+        import socketserver
+        from contextlib import redirect_stdout
+
+        worker = self
+
+        class JobHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                out = io.TextIOWrapper(self.wfile, encoding='utf-8', line_buffering=True)
+                with redirect_stdout(out):
+                    for raw in self.rfile:
+                        line = raw.decode('utf-8')
+                        if line.strip():
+                            worker.run_job(line)
+                out.detach()
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+        with socketserver.UnixStreamServer(socket_path, JobHandler) as server:
+            print(f"WORKER_READY: {socket_path}", flush=True)
+            try:
+                server.serve_forever()
+            finally:
+                os.remove(socket_path)
+
+
+def main():
+    """Main entry point"""
+    if len(sys.argv) < 2:
+        print("Usage: python run_backtest.py <config_file.json>")
+        print("       python run_backtest.py --worker [--socket <path>]")
+        sys.exit(1)
+
+    if sys.argv[1] == '--worker':
+        worker = BacktestWorker()
+        if len(sys.argv) >= 4 and sys.argv[2] == '--socket':
+            worker.serve_socket(sys.argv[3])
+        else:
+            worker.serve_stdin()
+        sys.exit(0)
+
+    config_path = sys.argv[1]
+
+    if not os.path.exists(config_path):
+        print(f"Error: Config file not found: {config_path}")
+        sys.exit(1)
+
+    try:
+        # Load configuration
+        config = load_config(config_path)
+
+        # Run backtest
+        results = run_backtest_from_config(config)
+
+        # Success
+        sys.exit(0)
+
+    except Exception as e:
+        print_backtest_error(e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
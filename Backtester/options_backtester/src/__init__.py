@@ -8,26 +8,36 @@ point-in-time data architecture.
 __version__ = '1.0.0'
 __author__ = 'Options Backtesting Team'
 
-# Core imports for easy access
-from .database import get_database, DatabaseManager
-from .backtest import Backtest
-from .strategy import Strategy
-from .events import (
-    MarketEvent, SignalEvent, OrderEvent, FillEvent,
-    create_market_event, create_signal_event, create_order_event, create_fill_event
-)
-
-__all__ = [
-    'get_database',
-    'DatabaseManager',
-    'Backtest',
-    'Strategy',
-    'MarketEvent',
-    'SignalEvent',
-    'OrderEvent',
-    'FillEvent',
-    'create_market_event',
-    'create_signal_event',
-    'create_order_event',
-    'create_fill_event',
-]
+# Core names for easy access. Resolved lazily on first attribute access
+# (PEP 562) so importing the package does not pull in SQLAlchemy, pandas
+# and friends until they are actually used.
+_LAZY_IMPORTS = {
+    'get_database': 'database',
+    'DatabaseManager': 'database',
+    'Backtest': 'backtest',
+    'Strategy': 'strategy',
+    'MarketEvent': 'events',
+    'SignalEvent': 'events',
+    'OrderEvent': 'events',
+    'FillEvent': 'events',
+    'create_market_event': 'events',
+    'create_signal_event': 'events',
+    'create_order_event': 'events',
+    'create_fill_event': 'events',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(f'.{_LAZY_IMPORTS[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -12,17 +12,21 @@ This ordering ensures we never use future data in past decisions.
 """
 
 from queue import Queue, Empty
-from events import EventType
+from events import EventType, EventBus, MarketEvent
 from data_handler import DataHandler
 from strategy import Strategy
 from portfolio import Portfolio
 from execution import ExecutionHandler
 from checkpoints import CheckpointManager
+from progress import ProgressReporter
+from event_log import EventLogger, make_logger
+from profiling import StageProfiler
+from positions import PRICING
+from clock import from_us, to_us
 import pandas as pd
 import numpy as np
 import time
-from typing import Type, Dict, Optional
-from tqdm import tqdm
+from typing import Type, Dict, Optional, Callable
 
 
 class Backtest:
@@ -42,7 +46,20 @@ class Backtest:
         db_connection,
         commission: float = 0.05,
         enable_checkpoints: bool = True,
-        checkpoint_interval: int = 1000
+        checkpoint_interval: int = 1000,
+        progress: Optional[ProgressReporter] = None,
+        quiet: bool = False,
+        log_level: str = 'info',
+        logger: Optional[EventLogger] = None,
+        profile: bool = False,
+        mark_pricing: str = 'mid',
+        greek_limits: Optional[Dict[str, float]] = None,
+        lock_free_events: bool = True,
+        strategy_params: Optional[dict] = None,
+        data_handler: Optional[DataHandler] = None,
+        prefetch_depth: int = 0,
+        compact_dtypes: bool = False,
+        auto_close: bool = True
     ):
         """
         Initialize backtest engine.
@@ -57,26 +74,69 @@ class Backtest:
             commission: Commission per contract
             enable_checkpoints: Enable checkpoint/resume functionality
             checkpoint_interval: Save checkpoint every N iterations
+            progress: Structured progress channel. When set, replaces the
+                PROGRESS: stdout lines and the tqdm bar
+            quiet: Disable per-event logging (orders, fills, settlements)
+            log_level: Minimum event log level ('debug', 'info', 'warning',
+                'error', 'off')
+            logger: Event logger to use instead of one built from
+                quiet/log_level (e.g. a ring buffer or file sink)
+            profile: Record per-stage timings and query counts
+                (adds a 'profile' table to the results)
+            mark_pricing: How open positions are valued each tick: 'mid',
+                or 'conservative' (longs at bid, shorts at ask)
+            greek_limits: Max absolute net position Greeks per underlying,
+                e.g. {'delta': 500, 'vega': 2000}; breaching signals are skipped
+            lock_free_events: Use a deque-backed EventBus instead of a
+                thread-safe queue.Queue (the event loop is single-threaded)
+            strategy_params: Keyword arguments for strategy_class
+            data_handler: DataHandler to share with other backtests
+                (MultiStrategyBacktest) instead of opening one
+            prefetch_depth: Session blocks a background thread loads ahead
+                of the event loop (0 = synchronous queries per tick)
+            compact_dtypes: Hold chains in compact dtypes (float32 prices
+                and Greeks, categorical symbols; see compact.py)
+            auto_close: Flatten everything 5 minutes before each session's
+                close. With False positions are held overnight and settle
+                at intrinsic value when they expire
         """
+        if mark_pricing not in PRICING:
+            raise ValueError(f"mark_pricing must be one of {PRICING}, got {mark_pricing!r}")
+
         self.symbols = symbols
         self.start_date = start_date
         self.end_date = end_date
         self.initial_capital = initial_capital
-        self.events = Queue()
+        self.progress = progress
+        self.mark_pricing = mark_pricing
+        self.auto_close = auto_close
+        self.market_data = {}  # Chains of the current tick, reused for marking
+        self.log = logger or make_logger(quiet, log_level)
+        self.events = EventBus() if lock_free_events else Queue()
 
         # Initialize components
         print("Initializing backtesting components...")
 
-        self.data = DataHandler(db_connection, start_date, end_date, symbols)
-        print(f"  ✓ DataHandler: {start_date} to {end_date}, {len(symbols)} symbols")
-
-        self.strategy = strategy_class(self.events, self.data)
+        owns_data = data_handler is None  # Shared handlers are subscribed by their owner
+        if owns_data:
+            data_handler = DataHandler(db_connection, start_date, end_date, symbols,
+                                       prefetch_depth=prefetch_depth, compact_dtypes=compact_dtypes)
+            print(f"  ✓ DataHandler: {start_date} to {end_date}, {len(symbols)} symbols"
+                  + (f", prefetching {prefetch_depth} session(s) ahead" if prefetch_depth else "")
+                  + (", compact dtypes" if compact_dtypes else ""))
+        self.data = data_handler
+
+        self.strategy = strategy_class(self.events, self.data, **(strategy_params or {}))
+        self.strategy.log = self.log
+        if owns_data:
+            self.data.subscribe(self.strategy.subscription)
         print(f"  ✓ Strategy: {strategy_class.__name__}")
 
-        self.portfolio = Portfolio(self.events, initial_capital)
+        self.portfolio = Portfolio(self.events, initial_capital, logger=self.log,
+                                   greek_limits=greek_limits, calendar=self.data.calendar)
         print(f"  ✓ Portfolio: ${initial_capital:,.2f}")
 
-        self.execution = ExecutionHandler(self.events, self.data, commission)
+        self.execution = ExecutionHandler(self.events, self.data, commission, logger=self.log)
         print(f"  ✓ ExecutionHandler: ${commission} commission")
 
         # Checkpoint manager for crash recovery
@@ -92,6 +152,14 @@ class Backtest:
         self.results = []
         self.equity_curve = []
 
+        # Per-stage instrumentation (opt-in)
+        self.profiler = StageProfiler() if profile else None
+        if self.profiler:
+            self.install_profiler(self.profiler)
+            print("  ✓ StageProfiler: per-stage timings enabled")
+
+        self.handlers = self.event_handlers()  # Rebuilt by run()
+
         print("\nBacktest engine ready!")
 
     def should_auto_close_positions(self, timestamp) -> bool:
@@ -104,16 +172,8 @@ class Backtest:
         Returns:
             bool: True if should close all positions
         """
-        from datetime import time
-
-        # Convert to time object (already in ET based on data)
-        current_time = timestamp.time()
-
-        # Define auto-close window: 3:55pm to 4:00pm
-        close_start = time(15, 55, 0)  # 3:55pm
-        market_close = time(16, 0, 0)   # 4:00pm
-
-        return close_start <= current_time < market_close
+        # 5 minutes before the session's close (3:55pm, 12:55pm on early closes)
+        return self.data.calendar.in_auto_close(to_us(timestamp))
 
     def close_all_positions(self, timestamp, reason="Auto-close before market close"):
         """
@@ -123,40 +183,70 @@ class Backtest:
             timestamp: Current timestamp
             reason: Reason for closing (for logging)
         """
-        from events import OrderEvent, OrderType
+        from events import create_order_event, create_spread_order
+        from math import gcd
+        import uuid
 
-        open_positions = self.portfolio.get_open_positions()
+        open_positions = self.portfolio.positions.open_positions()
 
         if len(open_positions) == 0:
             return
 
-        print(f"\n⏰ {reason} at {timestamp.strftime('%H:%M:%S')}")
-        print(f"   Closing {len(open_positions)} positions...")
-
-        # Generate close orders for all positions
-        for symbol, position in open_positions.items():
-            quantity = abs(position['quantity'])
+        self.log.info("\n⏰ {} at {:%H:%M:%S}\n   Closing {} positions...",
+                      reason, timestamp, len(open_positions))
 
-            if quantity > 0:
-                # Create close order (opposite direction)
-                order_type = OrderType.SELL if position['quantity'] > 0 else OrderType.BUY
+        # Close orders (opposite direction) for the contracts held: one order
+        # per underlying and expiration, multi-leg when several contracts
+        orders = []
+        for (symbol, expiration_ts), group in open_positions.groupby(['symbol', 'expiration_ts'], sort=False):
+            expiration_ts = int(expiration_ts) or None
+            quantities = group['quantity'].to_numpy()
 
-                order = OrderEvent(
-                    timestamp=timestamp,
+            if len(group) == 1:
+                orders.append(create_order_event(
                     symbol=symbol,
-                    order_type=order_type,
-                    quantity=quantity,
-                    reason=reason
-                )
+                    order_type='MARKET',
+                    quantity=abs(int(quantities[0])),
+                    direction='SELL' if quantities[0] > 0 else 'BUY',
+                    strikes=[float(group['strike'].iloc[0])],
+                    option_types=[group['option_type'].iloc[0]],
+                    order_id=str(uuid.uuid4()),
+                    expirations=[expiration_ts]
+                ))
+                continue
+
+            spreads = 0
+            for quantity in quantities:
+                spreads = gcd(spreads, abs(int(quantity)))
+
+            orders.append(create_spread_order(
+                symbol=symbol,
+                legs=[
+                    {
+                        'strike': float(strike),
+                        'option_type': option_type,
+                        'expiration_ts': expiration_ts,
+                        'direction': 'SELL' if quantity > 0 else 'BUY',
+                        'ratio': abs(int(quantity)) // spreads,
+                    }
+                    for strike, option_type, quantity in zip(group['strike'], group['option_type'], quantities)
+                ],
+                quantity=spreads,
+                direction='SELL',
+                order_id=str(uuid.uuid4())
+            ))
 
-                self.events.put(order)
+        # Fill them all in one pass; fills are queued for the portfolio
+        self.execution.execute_orders(orders)
 
-    def run(self, verbose: bool = True) -> dict:
+    def run(self, verbose: bool = True, flatten_at_end: bool = False) -> dict:
         """
         Main event loop - PROPER SEQUENCING CRITICAL.
 
         Args:
             verbose: Print progress updates
+            flatten_at_end: Close anything still open at the last bar
+                (day-sharded runs require every session to end flat)
 
         Returns:
             Dictionary with backtest results
@@ -189,8 +279,20 @@ class Backtest:
         total_iterations = len(all_timestamps)
         start_time = time.time()
 
+        if self.profiler:
+            self.profiler.start()
+
+        self.handlers = self.event_handlers()
+
         # Main event loop
+        progress = self.progress
+        if progress is not None:
+            # Progress goes to its own channel; keep stdout for results
+            verbose = False
+            progress.start(total_iterations, start_iteration)
+
         if verbose:
+            from tqdm import tqdm
             pbar = tqdm(total=len(all_timestamps), desc="Backtesting", initial=start_iteration)
 
         iteration = start_iteration
@@ -199,7 +301,7 @@ class Backtest:
             iteration += 1
 
             # Print progress every 100 iterations for external tracking
-            if iteration % 100 == 0:
+            if progress is None and iteration % 100 == 0:
                 elapsed = time.time() - start_time
                 iterations_done = iteration - start_iteration
                 if iterations_done > 0:
@@ -217,65 +319,18 @@ class Backtest:
             if market_event is None:
                 break
 
-            self.events.put(market_event)
-
-            # 2. Auto-close positions if 3:55pm or later (avoid assignment)
-            if self.should_auto_close_positions(self.data.current_timestamp):
-                self.close_all_positions(self.data.current_timestamp)
-
-            # 3. Process settlements (T+1)
-            self.portfolio.process_settlements(self.data.current_timestamp)
-
-            # 4. Process all events in FIFO order
-            event_count = 0
-            max_events = 1000  # Safety limit to prevent infinite loops
-
-            while event_count < max_events:
-                try:
-                    event = self.events.get(block=False)
-                    event_count += 1
-                except Empty:
-                    break
+            # 2-7. Expire, close, match limits, settle, dispatch events, record holdings
+            self.process_tick(market_event)
 
-                if event.type == EventType.MARKET:
-                    # Strategy generates signals
-                    self.strategy.calculate_signals(event)
-
-                elif event.type == EventType.SIGNAL:
-                    # Portfolio converts to orders
-                    self.portfolio.update_signal(event)
-
-                elif event.type == EventType.ORDER:
-                    # Execution simulates fills
-                    self.execution.execute_order(event)
-
-                elif event.type == EventType.FILL:
-                    # Portfolio updates positions
-                    self.portfolio.update_fill(event)
-
-            # 4. Record current state
-            self.record_holdings()
+            if progress is not None:
+                progress.update(iteration, len(self.portfolio.trades),
+                                self.equity_curve[-1]['total_value'],
+                                self.data.current_timestamp)
 
-            # 5. Save checkpoint periodically
+            # 8. Save checkpoint periodically
             if self.enable_checkpoints and self.checkpoint_mgr:
                 if self.checkpoint_mgr.should_save_checkpoint(iteration):
-                    # Get current prices for total value
-                    current_prices = {}
-                    for symbol in self.portfolio.positions.keys():
-                        price = self.data.get_underlying_price(symbol)
-                        if price:
-                            current_prices[symbol] = price
-
-                    total_value = self.portfolio.get_total_value(current_prices)
-
-                    checkpoint_state = {
-                        'iteration': iteration,
-                        'current_timestamp': str(self.data.current_timestamp),
-                        'equity_curve': self.equity_curve,
-                        'portfolio_value': total_value,
-                        'trades': len(self.portfolio.trade_history) if hasattr(self.portfolio, 'trade_history') else 0
-                    }
-                    self.checkpoint_mgr.save_checkpoint(checkpoint_state)
+                    self.save_checkpoint(iteration)
 
             if verbose:
                 pbar.update(1)
@@ -283,6 +338,23 @@ class Backtest:
         if verbose:
             pbar.close()
 
+        # Sessions that end before 3:55pm (half days) are flattened at their last bar
+        if flatten_at_end and len(self.portfolio.positions) and self.equity_curve:
+            self.close_all_positions(self.data.current_timestamp, reason="Session end")
+            self.process_events()
+
+            self.equity_curve.pop()
+            self.record_holdings()
+
+        if self.profiler:
+            self.profiler.stop()
+
+        self.data.close()
+
+        if progress is not None:
+            progress.finish(min(iteration, total_iterations), len(self.portfolio.trades),
+                            self.equity_curve[-1]['total_value'] if self.equity_curve else None)
+
         print("\n" + "="*60)
         print("BACKTEST COMPLETE")
         print("="*60)
@@ -294,46 +366,227 @@ class Backtest:
         # Generate final results
         results = self.generate_results()
 
+        if self.data.prefetch_depth:
+            results['prefetch'] = self.data.prefetch_stats()
+            print(f"\nPrefetch: {results['prefetch']['blocks']} session blocks, "
+                  f"{results['prefetch']['load_seconds']:.2f}s loading, "
+                  f"{results['prefetch']['stall_seconds']:.2f}s stalled")
+
+        if self.data.compact_dtypes:
+            results['chain_memory'] = self.data.memory_stats()
+            print(f"\nCompact chains: {results['chain_memory']['chains']} chains, "
+                  f"{results['chain_memory']['full_bytes'] / 2**20:.1f} MB -> "
+                  f"{results['chain_memory']['compact_bytes'] / 2**20:.1f} MB "
+                  f"({results['chain_memory']['saved_pct']:.1f}% saved)")
+
+        if self.profiler:
+            results['profile'] = self.profiler.summary()
+            print("\nSTAGE PROFILE")
+            print(self.profiler.format_table(results['profile']))
+
         return results
 
+    def process_tick(self, market_event: MarketEvent):
+        """
+        Run one tick of the event loop after the data has advanced.
+
+        Args:
+            market_event: MarketEvent for the current timestamp
+        """
+        self.market_data = market_event.data
+        self.events.put(market_event)
+
+        # 2. Settle contracts whose expiration has passed (one heap peek otherwise)
+        if self.portfolio.expiries.due(self.data.clock.now):
+            self.process_expirations()
+
+        # 3. Auto-close positions if 3:55pm or later (avoid assignment)
+        if self.auto_close and self.data.clock.in_auto_close():
+            self.execution.cancel_all()
+            self.close_all_positions(self.data.current_timestamp)
+
+        # 4. Match resting limit orders against the new snapshot
+        if len(self.execution.book):
+            self.execution.match_resting_orders()
+
+        # 5. Process settlements (T+1)
+        self.portfolio.process_settlements(self.data.clock.now)
+
+        # 6. Process all events in FIFO order
+        self.process_events()
+
+        # 7. Record current state
+        self.record_holdings()
+
+    def process_expirations(self):
+        """
+        Settle every open contract that has expired at intrinsic value.
+
+        The underlying price is the last one available at each
+        expiration, looked up once per underlying and expiration. If
+        there is none, the latest price available now is used; with no
+        price at all yet the contract is re-queued and retried next tick.
+        """
+        prices = {}  # (symbol code, expiration_us) -> underlying price
+        positions = self.portfolio.positions
+        now = self.data.clock.now
+
+        for expiration_us, contract_id in self.portfolio.expiries.pop_due(now):
+            row = positions.row(contract_id)
+            if row is None or positions.quantity[row] == 0:
+                continue  # Closed before expiry
+
+            code = int(positions.underlying[row])
+            if (code, expiration_us) not in prices:
+                symbol = positions.symbols.symbol(code)
+                price = self.data.get_underlying_price_at(symbol, expiration_us)
+                if price is None and now > expiration_us:
+                    price = self.data.get_underlying_price_at(symbol, now)
+                prices[code, expiration_us] = price
+
+            price = prices[code, expiration_us]
+            if price is None:
+                self.log.warning("No underlying price for expiring contract {}, retrying next tick", contract_id)
+                self.portfolio.expiries.schedule(contract_id, expiration_us)
+                continue
+
+            fill = self.portfolio.expire(contract_id, price, from_us(expiration_us))
+            if fill is not None:
+                self.strategy.on_expiry(fill)
+
+    def process_events(self, max_events: int = 1000):
+        """
+        Dispatch queued events in FIFO order.
+
+        Args:
+            max_events: Safety limit to prevent infinite loops
+        """
+        handlers = self.handlers
+        next_event = self.events.get
+
+        for _ in range(max_events):
+            try:
+                event = next_event(block=False)
+            except Empty:
+                return
+
+            handlers[event.type](event)
+
+    def event_handlers(self) -> Dict[EventType, Callable]:
+        """
+        Dispatch table from event type to the component that handles it.
+
+        Built once per run (as self.handlers), after install_profiler has
+        wrapped the handlers, so dispatch is a single dict lookup per event.
+
+        Returns:
+            {EventType: handler(event)}
+        """
+        return {
+            EventType.MARKET: self.strategy.calculate_signals,  # Strategy generates signals
+            EventType.SIGNAL: self.portfolio.update_signal,  # Portfolio converts to orders
+            EventType.ORDER: self.execution.execute_order,  # Execution simulates fills
+            EventType.FILL: self.portfolio.update_fill,  # Portfolio updates positions
+        }
+
+    def install_profiler(self, profiler: StageProfiler):
+        """
+        Wrap each event loop stage with the profiler's timers.
+
+        Args:
+            profiler: StageProfiler to record into
+        """
+        profiler.wrap(self.data, 'update_bars')
+        profiler.wrap(self.strategy, 'calculate_signals')
+        profiler.wrap(self.portfolio, 'update_signal')
+        profiler.wrap(self.execution, 'execute_order')
+        profiler.wrap(self.portfolio, 'update_fill')
+        profiler.wrap(self.portfolio, 'process_settlements')
+        profiler.wrap(self, 'close_all_positions')
+        profiler.wrap(self, 'record_holdings')
+        profiler.wrap(self, 'save_checkpoint', 'checkpoint')
+
+        self.data.profiler = profiler
+
+    def save_checkpoint(self, iteration: int):
+        """
+        Save current backtest state for crash recovery.
+
+        Args:
+            iteration: Current iteration
+        """
+        total_value = self.portfolio.get_total_value(self.market_data, self.mark_pricing)
+
+        checkpoint_state = {
+            'iteration': iteration,
+            'current_timestamp': str(self.data.current_timestamp),
+            'equity_curve': self.equity_curve,
+            'portfolio_value': total_value,
+            'trades': len(self.portfolio.trade_history) if hasattr(self.portfolio, 'trade_history') else 0
+        }
+        self.checkpoint_mgr.save_checkpoint(checkpoint_state)
+
     def record_holdings(self):
         """
         Track portfolio value over time.
 
+        Marks every open contract against this tick's chains in one
+        vectorized pass (no extra queries).
+
         Records:
         - Timestamp
         - Total portfolio value
         - Cash (settled + unsettled)
         - Number of positions
+        - Unrealized P&L and aggregate Greeks
         """
-        # Get current prices for open positions
-        current_prices = {}
-        for symbol in self.portfolio.positions.keys():
-            price = self.data.get_underlying_price(symbol)
-            if price:
-                current_prices[symbol] = price
-
-        total_value = self.portfolio.get_total_value(current_prices)
+        mtm = self.portfolio.mark_to_market(self.market_data, self.mark_pricing)
 
         self.equity_curve.append({
             'timestamp': self.data.current_timestamp,
-            'total_value': total_value,
+            'total_value': mtm['total_value'],
             'settled_cash': self.portfolio.settled_cash,
             'unsettled_cash': self.portfolio.unsettled_cash,
-            'num_positions': len([p for p in self.portfolio.positions.values()
-                                if p['quantity'] != 0])
+            'num_positions': mtm['num_positions'],
+            'unrealized_pnl': mtm['unrealized_pnl'],
+            'delta': mtm['delta'],
+            'gamma': mtm['gamma'],
+            'theta': mtm['theta'],
+            'vega': mtm['vega']
         })
 
     def generate_results(self) -> dict:
         """
         Calculate performance metrics.
 
+        Returns:
+            Dictionary with comprehensive results
+        """
+        return self.summarize_results(self.initial_capital, self.equity_curve,
+                                      self.portfolio.get_trades_summary(),
+                                      self.portfolio.get_positions_summary())
+
+    @staticmethod
+    def summarize_results(initial_capital: float, equity_curve: list,
+                          trades_df: pd.DataFrame, positions_df: pd.DataFrame) -> dict:
+        """
+        Calculate performance metrics from an equity curve and trade log.
+
+        Shared by Backtest.generate_results and runs stitched together
+        from several sessions.
+
+        Args:
+            initial_capital: Starting capital
+            equity_curve: List of record_holdings() rows
+            trades_df: Trades summary
+            positions_df: Positions summary
+
         Returns:
             Dictionary with comprehensive results
         """
         print("\nGenerating performance metrics...")
 
-        if len(self.equity_curve) == 0:
+        if len(equity_curve) == 0:
             print("WARNING: No equity curve data available")
             return {
                 'total_return': 0,
@@ -342,12 +595,12 @@ class Backtest:
                 'total_trades': 0
             }
 
-        df = pd.DataFrame(self.equity_curve)
+        df = pd.DataFrame(equity_curve)
         df['returns'] = df['total_value'].pct_change()
 
         # Calculate metrics
         final_value = df['total_value'].iloc[-1]
-        total_return = (final_value / self.initial_capital - 1) * 100
+        total_return = (final_value / initial_capital - 1) * 100
 
         # Sharpe ratio (annualized)
         returns_mean = df['returns'].mean()
@@ -360,10 +613,9 @@ class Backtest:
             sharpe_ratio = 0
 
         # Maximum drawdown
-        max_drawdown = self.calculate_max_drawdown(df['total_value'])
+        max_drawdown = Backtest.calculate_max_drawdown(df['total_value'])
 
         # Trade statistics
-        trades_df = self.portfolio.get_trades_summary()
         total_trades = len(trades_df) if not trades_df.empty else 0
 
         # Win rate (if we have closed trades)
@@ -373,7 +625,7 @@ class Backtest:
             win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
 
         results = {
-            'initial_capital': self.initial_capital,
+            'initial_capital': initial_capital,
             'final_value': final_value,
             'total_return': total_return,
             'sharpe_ratio': sharpe_ratio,
@@ -382,14 +634,14 @@ class Backtest:
             'win_rate': win_rate,
             'equity_curve': df,
             'trades': trades_df,
-            'positions': self.portfolio.get_positions_summary()
+            'positions': positions_df
         }
 
         # Print summary
         print("\n" + "="*60)
         print("BACKTEST RESULTS")
         print("="*60)
-        print(f"Initial Capital:    ${self.initial_capital:,.2f}")
+        print(f"Initial Capital:    ${initial_capital:,.2f}")
         print(f"Final Value:        ${final_value:,.2f}")
         print(f"Total Return:       {total_return:+.2f}%")
         print(f"Sharpe Ratio:       {sharpe_ratio:.2f}")
@@ -401,7 +653,8 @@ class Backtest:
 
         return results
 
-    def calculate_max_drawdown(self, equity_curve: pd.Series) -> float:
+    @staticmethod
+    def calculate_max_drawdown(equity_curve: pd.Series) -> float:
         """
         Calculate maximum peak-to-trough drawdown.
 
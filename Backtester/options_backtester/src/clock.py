@@ -0,0 +1,100 @@
+"""
+Integer microsecond clock for the event loop.
+
+The database stores every time as int64 microseconds since the epoch
+(exchange-local wall time, as timestamp_available). The event loop keeps
+time the same way: DataHandler advances a SessionClock with the raw
+integer, queries and expiry maths use it directly, and pd.Timestamp
+objects are built only at API edges (MarketEvent.timestamp, logs,
+results).
+
+Session boundaries (open, 3:55pm auto-close cutoff, close) are looked
+up once per trading day when the clock crosses into it, not per tick:
+from a TradingCalendar (early closes included) or, without one, the
+regular 9:30am-4:00pm hours.
+"""
+
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+
+US_PER_SECOND = 10**6
+US_PER_MINUTE = 60 * US_PER_SECOND
+US_PER_HOUR = 60 * US_PER_MINUTE
+US_PER_DAY = 24 * US_PER_HOUR
+
+# Session times as offsets from midnight
+MARKET_OPEN_US = 9 * US_PER_HOUR + 30 * US_PER_MINUTE
+AUTO_CLOSE_US = 15 * US_PER_HOUR + 55 * US_PER_MINUTE  # Flatten to avoid assignment
+MARKET_CLOSE_US = 16 * US_PER_HOUR
+
+
+def to_us(timestamp: Union[int, np.integer, pd.Timestamp, str]) -> int:
+    """Microseconds since the epoch (ints pass through unchanged)."""
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    if not isinstance(timestamp, pd.Timestamp):
+        timestamp = pd.Timestamp(timestamp)
+    return timestamp.value // 1000
+
+
+def from_us(us: int) -> pd.Timestamp:
+    """pd.Timestamp for microseconds since the epoch (API edges only)."""
+    return pd.Timestamp(us, unit='us')
+
+
+def day_start(us: int) -> int:
+    """Midnight of the day containing us."""
+    return us - us % US_PER_DAY
+
+
+class SessionClock:
+    """
+    Current time of the event loop and its session boundaries.
+
+    Attributes:
+        now: Current time (µs), None before the first tick
+        day: Midnight of the current session (µs)
+        open: Market open (µs)
+        cutoff: Auto-close cutoff, 3:55pm or 5 minutes before an early close (µs)
+        close: Market close (µs)
+    """
+
+    __slots__ = ('now', 'day', 'open', 'cutoff', 'close', 'calendar')
+
+    def __init__(self, calendar=None):
+        """
+        Args:
+            calendar: TradingCalendar for session times (default: regular hours)
+        """
+        self.calendar = calendar
+        self.now = None
+        self.day = None
+        self.open = self.cutoff = self.close = None
+
+    def advance(self, us: int):
+        """Move to a new time, recomputing boundaries on a new day."""
+        self.now = us
+        day = us - us % US_PER_DAY
+        if day != self.day:
+            self.day = day
+            if self.calendar is not None:
+                self.open, self.cutoff, self.close = self.calendar.session_bounds(day)
+            else:
+                self.open = day + MARKET_OPEN_US
+                self.cutoff = day + AUTO_CLOSE_US
+                self.close = day + MARKET_CLOSE_US
+
+    def in_auto_close(self) -> bool:
+        """True from the 3:55pm cutoff until the close."""
+        return self.cutoff <= self.now < self.close
+
+    def days_to(self, us: int) -> float:
+        """Days from now until us."""
+        return (us - self.now) / US_PER_DAY
+
+    def hours_to(self, us: int) -> float:
+        """Hours from now until us."""
+        return (us - self.now) / US_PER_HOUR
@@ -0,0 +1,65 @@
+"""
+Compact in-memory dtypes for options chains.
+
+A chain read from the database holds float64 prices and Greeks, Python
+string objects for symbols and option type, and int64 flags. Compacting
+stores prices and Greeks as float32, option type and symbols as
+categoricals (one small integer code per row, each distinct string held
+once) and flags and counts as small ints: roughly a third of the
+original footprint, so far more sessions fit in memory for replay.
+
+Keys stay exact: strike, expiration and timestamps keep their original
+dtypes, so contract lookups and IDs are unchanged. float32 keeps ~7
+significant digits, enough for quotes to the cent; execution widens
+prices back to float64 before any cash is computed.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Prices, Greeks and vol stored as float32
+FLOAT32_COLUMNS = ('underlying_price', 'bid_price', 'ask_price', 'mid_price', 'last_price',
+                   'bid_ask_spread', 'delta', 'gamma', 'theta', 'vega', 'rho', 'implied_vol')
+
+# Flags and counts stored as small ints (only when the column has no nulls)
+INT_COLUMNS = {'is_stale': np.uint8, 'volume': np.int32, 'open_interest': np.int32,
+               'quote_age_seconds': np.int32}
+
+OPTION_TYPES = pd.CategoricalDtype(['C', 'P'])
+
+
+def frame_nbytes(frame: pd.DataFrame) -> int:
+    """Memory held by a DataFrame, including string objects."""
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def compact_chain(chain: pd.DataFrame, symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Convert a chain to compact dtypes.
+
+    Args:
+        chain: Options chain as read from the database
+        symbols: Underlying symbols of the run. Fixes the categories of
+            underlying_symbol so its codes are the same in every frame
+
+    Returns:
+        New DataFrame with the same columns, rows and index
+    """
+    dtypes = {}
+    for column in chain.columns:
+        if column in FLOAT32_COLUMNS:
+            dtypes[column] = np.float32
+        elif column in INT_COLUMNS:
+            if not chain[column].isna().any():
+                dtypes[column] = INT_COLUMNS[column]
+        elif column == 'option_type':
+            dtypes[column] = OPTION_TYPES
+        elif column == 'underlying_symbol':
+            dtypes[column] = pd.CategoricalDtype(list(symbols)) if symbols is not None else 'category'
+        elif column == 'symbol':
+            dtypes[column] = 'category'
+
+    return chain.astype(dtypes)
@@ -3,13 +3,41 @@ DataHandler provides point-in-time market data to the backtester.
 
 CRITICAL: All data queries must respect point-in-time constraints.
 Never allow future data to leak into past decisions.
+
+With prefetch_depth > 0, a background thread loads each session's chain
+block (every row the session's ticks can see) on its own connection
+while the event loop works through the current one; get_options_chain
+then filters the in-memory block instead of querying. The database
+driver releases the GIL while it reads, so I/O and strategy logic
+overlap.
+
+Time is kept as int64 microseconds (clock.SessionClock), the unit of
+timestamp_available; current_timestamp is the pd.Timestamp view of it,
+built once per tick for MarketEvent and other API edges.
+
+With compact_dtypes=True, chains (and prefetched blocks) are held in the
+compact dtypes of compact.compact_chain; memory_stats() reports the
+saving.
 """
 
+import queue
+import threading
+import time
+
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 from typing import List, Optional
 from events import MarketEvent, EventType
 from timeframe_aggregator import MultiTimeframeAggregator
+from subscription import DataSubscription
+from compact import compact_chain, frame_nbytes
+from clock import SessionClock, US_PER_DAY, from_us, to_us
+from trading_calendar import TradingCalendar
+
+
+# Longest DTE a prefetched block can answer get_options_chain() for
+PREFETCH_MAX_DTE = 7
 
 
 class DataHandler:
@@ -21,7 +49,8 @@ class DataHandler:
     """
 
     def __init__(self, db_connection, start_date: str, end_date: str,
-                 symbols: List[str], enable_multi_timeframe: bool = True):
+                 symbols: List[str], enable_multi_timeframe: bool = True,
+                 prefetch_depth: int = 0, compact_dtypes: bool = False):
         """
         Initialize data handler.
 
@@ -31,24 +60,109 @@ class DataHandler:
             end_date: End date for backtest (YYYY-MM-DD)
             symbols: List of underlying symbols to trade
             enable_multi_timeframe: Enable multi-timeframe bar aggregation
+            prefetch_depth: Session blocks to load ahead on a background
+                thread (0 = query synchronously on every tick)
+            compact_dtypes: Hold chains as float32 prices and Greeks,
+                categorical symbols and option type, and small-int flags
         """
         self.conn = db_connection
         self.start_date = pd.Timestamp(start_date)
         self.end_date = pd.Timestamp(end_date)
+        self.start_us = to_us(self.start_date)
+        self.end_us = to_us(self.end_date)
         self.symbols = symbols
-        self.current_timestamp = None
+        self.calendar = TradingCalendar(self.start_date, self.end_date)
+        self.clock = SessionClock(self.calendar)  # Current time in µs and session boundaries
+        self._current_timestamp = None
         self.continue_backtest = True
 
         # Cache for performance
         self._timestamp_cache = None
+        self._timestamp_us_cache = None
+
+        # Set by Backtest(profile=True) to count queries per stage
+        self.profiler = None
+
+        # Chain slice MarketEvent.data carries (None = full 0-7 DTE chain)
+        self.subscription = None
+
+        # Background session prefetch (see prefetch_stats())
+        self.prefetch_depth = prefetch_depth
+        self._blocks = None  # Queue of loaded blocks, created on first update_bars
+        self._block = None  # Block being replayed
+        self._tick = 0  # Next tick in _block
+        self._stop = threading.Event()
+        self._loader = None
+        self.stall_seconds = 0.0  # Event loop time spent waiting for a block
+        self.load_seconds = 0.0  # Loader time spent reading blocks
+        self.blocks_loaded = 0
+
+        # Compact chain dtypes (see memory_stats())
+        self.compact_dtypes = compact_dtypes
+        self.chains_compacted = 0
+        self.full_bytes = 0  # Footprint of those chains as read
+        self.compact_bytes = 0  # Footprint after compacting
 
         # Multi-timeframe aggregator (for underlying price bars)
         self.multi_timeframe_enabled = enable_multi_timeframe
+        self.timeframe_reads = 0  # Strategy reads of timeframe bars (see sharding.py)
         if enable_multi_timeframe:
-            self.timeframe_aggregators = {symbol: MultiTimeframeAggregator() for symbol in symbols}
+            self.timeframe_aggregators = {symbol: MultiTimeframeAggregator(calendar=self.calendar)
+                                          for symbol in symbols}
         else:
             self.timeframe_aggregators = {}
 
+    def _query(self, query, params: dict) -> pd.DataFrame:
+        """
+        Run a query against the point-in-time database.
+
+        Args:
+            query: SQLAlchemy text query
+            params: Bound parameters
+
+        Returns:
+            DataFrame with query results
+        """
+        result = pd.read_sql(query, self.conn, params=params)
+
+        if self.profiler is not None:
+            self.profiler.record_query(len(result))
+
+        return result
+
+    @property
+    def current_timestamp(self) -> Optional[pd.Timestamp]:
+        """Current time as a pd.Timestamp (None before the first tick)."""
+        return self._current_timestamp
+
+    @current_timestamp.setter
+    def current_timestamp(self, timestamp):
+        if timestamp is None:
+            self.clock = SessionClock(self.calendar)
+            self._current_timestamp = None
+        else:
+            self._advance(to_us(timestamp))
+
+    def _advance(self, us: int):
+        """Move the clock to us (µs)."""
+        self.clock.advance(us)
+        self._current_timestamp = from_us(us)
+
+    def _compact(self, chain: pd.DataFrame) -> pd.DataFrame:
+        """Chain in compact dtypes (if enabled), counting the saving."""
+        if not self.compact_dtypes:
+            return chain
+
+        compact = compact_chain(chain, self.symbols)
+        self._count_compacted(frame_nbytes(chain), frame_nbytes(compact))
+        return compact
+
+    def _count_compacted(self, full_bytes: int, compact_bytes: int):
+        """Add one compacted chain to the memory_stats() counters."""
+        self.chains_compacted += 1
+        self.full_bytes += full_bytes
+        self.compact_bytes += compact_bytes
+
     def get_latest_bars(self, symbol: str, N: int = 1) -> pd.DataFrame:
         """
         Returns last N bars of data available at current_timestamp.
@@ -62,7 +176,7 @@ class DataHandler:
         Returns:
             DataFrame with options data
         """
-        if self.current_timestamp is None:
+        if self.clock.now is None:
             return pd.DataFrame()
 
         query = text("""
@@ -75,12 +189,11 @@ class DataHandler:
             LIMIT :limit
         """)
 
-        result = pd.read_sql(
+        result = self._query(
             query,
-            self.conn,
             params={
                 'symbol': symbol,
-                'current_ts': self.current_timestamp.value // 1000,
+                'current_ts': self.clock.now,
                 'limit': N
             }
         )
@@ -100,12 +213,16 @@ class DataHandler:
         Returns:
             DataFrame with all options in DTE range
         """
-        if self.current_timestamp is None:
+        now = self.clock.now
+        if now is None:
             return pd.DataFrame()
 
         # Calculate timestamp range for expiration
-        min_exp_ts = (self.current_timestamp + pd.Timedelta(days=min_dte)).value // 1000
-        max_exp_ts = (self.current_timestamp + pd.Timedelta(days=max_dte)).value // 1000
+        min_exp_ts = now + min_dte * US_PER_DAY
+        max_exp_ts = now + max_dte * US_PER_DAY
+
+        if self._block is not None and min_dte >= 0 and max_dte <= PREFETCH_MAX_DTE:
+            return self._block_chain(symbol, min_exp_ts, max_exp_ts)
 
         query = text("""
             SELECT * FROM options_data_pit
@@ -116,18 +233,69 @@ class DataHandler:
             ORDER BY strike, option_type
         """)
 
-        result = pd.read_sql(
+        result = self._query(
             query,
-            self.conn,
             params={
                 'symbol': symbol,
-                'current_ts': self.current_timestamp.value // 1000,
+                'current_ts': now,
                 'min_exp': min_exp_ts,
                 'max_exp': max_exp_ts
             }
         )
 
-        return result
+        return self._compact(result)
+
+    def subscribe(self, subscription: Optional[DataSubscription]):
+        """
+        Restrict MarketEvent.data to a strategy's subscription.
+
+        Args:
+            subscription: Chain slice to load (None = full chain)
+        """
+        self.subscription = subscription
+
+    def get_subscribed_chain(self, symbol: str) -> pd.DataFrame:
+        """
+        Chain slice for MarketEvent.data at current timestamp.
+
+        The subscription's filters and columns are pushed into the query
+        (or applied to the prefetched block).
+
+        Args:
+            symbol: Underlying symbol
+
+        Returns:
+            DataFrame with the subscribed rows and columns
+        """
+        subscription = self.subscription
+        if subscription is None:
+            return self.get_options_chain(symbol)
+
+        now = self.clock.now
+        if now is None:
+            return pd.DataFrame()
+
+        if self._block is not None and subscription.min_dte >= 0 and subscription.max_dte <= PREFETCH_MAX_DTE:
+            return subscription.apply(self.get_options_chain(symbol, subscription.min_dte, subscription.max_dte))
+
+        select, where, params = subscription.sql()
+        query = text(f"""
+            SELECT {select} FROM options_data_pit
+            WHERE underlying_symbol = :symbol
+              AND timestamp_available <= :current_ts
+              AND expiration_timestamp BETWEEN :min_exp AND :max_exp
+              AND is_stale = 0{where}
+            ORDER BY strike, option_type
+        """)
+
+        params.update(
+            symbol=symbol,
+            current_ts=now,
+            min_exp=now + subscription.min_dte * US_PER_DAY,
+            max_exp=now + subscription.max_dte * US_PER_DAY
+        )
+
+        return self._compact(self._query(query, params=params))
 
     def get_specific_option(self, symbol: str, strike: float,
                            option_type: str, expiration_ts: int) -> Optional[pd.Series]:
@@ -143,7 +311,7 @@ class DataHandler:
         Returns:
             Series with option data or None
         """
-        if self.current_timestamp is None:
+        if self.clock.now is None:
             return None
 
         query = text("""
@@ -158,15 +326,14 @@ class DataHandler:
             LIMIT 1
         """)
 
-        result = pd.read_sql(
+        result = self._query(
             query,
-            self.conn,
             params={
                 'symbol': symbol,
                 'strike': strike,
                 'opt_type': option_type,
                 'exp_ts': expiration_ts,
-                'current_ts': self.current_timestamp.value // 1000
+                'current_ts': self.clock.now
             }
         )
 
@@ -184,6 +351,9 @@ class DataHandler:
         Returns:
             MarketEvent with new data, or None if backtest is complete
         """
+        if self.prefetch_depth > 0:
+            return self._update_bars_prefetched()
+
         # Get next timestamp from database
         query = text("""
             SELECT DISTINCT timestamp_available
@@ -194,15 +364,14 @@ class DataHandler:
             LIMIT 1
         """)
 
-        current_ts = self.current_timestamp.value // 1000 if self.current_timestamp else 0
-        end_ts = self.end_date.value // 1000
+        # Before the first bar, start just before start_date
+        current_ts = self.clock.now if self.clock.now is not None else self.start_us - 1
 
-        result = pd.read_sql(
+        result = self._query(
             query,
-            self.conn,
             params={
                 'current_ts': current_ts,
-                'end_ts': end_ts
+                'end_ts': self.end_us
             }
         )
 
@@ -211,12 +380,12 @@ class DataHandler:
             return None
 
         # Update current timestamp
-        self.current_timestamp = pd.Timestamp(result.iloc[0]['timestamp_available'], unit='us')
+        self._advance(int(result['timestamp_available'].iat[0]))
 
         # Get all options data at this timestamp for all symbols
         data = {}
         for symbol in self.symbols:
-            data[symbol] = self.get_options_chain(symbol)
+            data[symbol] = self.get_subscribed_chain(symbol)
 
         # Update multi-timeframe aggregators
         self._update_timeframe_aggregators()
@@ -227,6 +396,196 @@ class DataHandler:
             data=data
         )
 
+    def _update_bars_prefetched(self) -> Optional[MarketEvent]:
+        """update_bars() replaying prefetched session blocks."""
+        if self._blocks is None:
+            self._start_loader()
+
+        while self._block is None or self._tick >= len(self._block['timestamps']):
+            waited = time.perf_counter()
+            block = self._blocks.get()
+            self.stall_seconds += time.perf_counter() - waited
+
+            if isinstance(block, BaseException):
+                raise block
+            if block is None:
+                self._block = None
+                self.continue_backtest = False
+                return None
+
+            self._take_block(block)
+
+        self._advance(self._block['timestamps'][self._tick])
+        self._tick += 1
+
+        data = {}
+        for symbol in self.symbols:
+            data[symbol] = self.get_subscribed_chain(symbol)
+
+        self._update_timeframe_aggregators()
+
+        return MarketEvent(
+            type=EventType.MARKET,
+            timestamp=self.current_timestamp,
+            data=data
+        )
+
+    def _start_loader(self):
+        """Start the background thread that loads session blocks in order."""
+        timestamps = self.get_all_timestamps_us()
+        days = timestamps // US_PER_DAY
+        breaks = np.flatnonzero(days[1:] != days[:-1]) + 1
+        sessions = [session.tolist() for session in np.split(timestamps, breaks) if len(session)]
+
+        self._blocks = queue.Queue(maxsize=self.prefetch_depth)
+        self._loader = threading.Thread(target=self._load_blocks, args=(sessions,),
+                                        name='DataHandler-prefetch', daemon=True)
+        self._loader.start()
+
+    def _put_block(self, block) -> bool:
+        """Queue a block, giving up if close() was called."""
+        while not self._stop.is_set():
+            try:
+                self._blocks.put(block, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _take_block(self, block: dict):
+        """
+        Make a loaded block current and count its reads.
+
+        The loader thread only records what it did in the block; every
+        counter (and the profiler) is updated here, on the event loop
+        thread, so nothing is shared between threads.
+        """
+        self._block = block
+        self._tick = 0
+
+        self.blocks_loaded += 1
+        self.load_seconds += block['load_seconds']
+        for full_bytes, compact_bytes in block['compacted']:
+            self._count_compacted(full_bytes, compact_bytes)
+        if self.profiler is not None:
+            for rows in block['query_rows']:
+                self.profiler.record_query(rows, stage='prefetch')
+
+    def _load_blocks(self, sessions: List[List[int]]):
+        """
+        Loader thread: read each session's block on a dedicated connection.
+
+        Touches no DataHandler state: chains are compacted here, but the
+        reads and savings are counted by _take_block() when the block is
+        used.
+        """
+        query = text("""
+            SELECT * FROM options_data_pit
+            WHERE underlying_symbol = :symbol
+              AND timestamp_available <= :last_ts
+              AND expiration_timestamp BETWEEN :min_exp AND :max_exp
+              AND is_stale = 0
+            ORDER BY strike, option_type
+        """)
+
+        try:
+            with self.conn.engine.connect() as conn:
+                for timestamps in sessions:
+                    started = time.perf_counter()
+                    first_ts = timestamps[0]
+                    last_ts = timestamps[-1]
+
+                    chains = {}
+                    query_rows = []
+                    compacted = []
+                    for symbol in self.symbols:
+                        chain = pd.read_sql(query, conn, params={
+                            'symbol': symbol,
+                            'last_ts': last_ts,
+                            'min_exp': first_ts,
+                            'max_exp': last_ts + PREFETCH_MAX_DTE * US_PER_DAY
+                        })
+                        query_rows.append(len(chain))
+
+                        if self.compact_dtypes:
+                            compact = compact_chain(chain, self.symbols)
+                            compacted.append((frame_nbytes(chain), frame_nbytes(compact)))
+                            chain = compact
+
+                        chains[symbol] = (chain,
+                                          chain['timestamp_available'].to_numpy(),
+                                          chain['expiration_timestamp'].to_numpy())
+
+                    block = {'timestamps': timestamps, 'chains': chains, 'query_rows': query_rows,
+                             'compacted': compacted, 'load_seconds': time.perf_counter() - started}
+                    if not self._put_block(block):
+                        return
+        except Exception as e:
+            self._put_block(e)
+            return
+
+        self._put_block(None)
+
+    def _block_chain(self, symbol: str, min_exp_ts: int, max_exp_ts: int) -> pd.DataFrame:
+        """get_options_chain() answered from the current block."""
+        if symbol not in self._block['chains']:
+            return pd.DataFrame()
+
+        chain, available, expiration = self._block['chains'][symbol]
+        mask = ((available <= self.clock.now)
+                & (expiration >= min_exp_ts) & (expiration <= max_exp_ts))
+
+        return chain[mask].reset_index(drop=True)
+
+    def _block_underlying_price(self, symbol: str) -> Optional[float]:
+        """get_underlying_price() answered from the current block (no query)."""
+        if symbol not in self._block['chains']:
+            return None
+
+        chain, available, expiration = self._block['chains'][symbol]
+        rows = np.flatnonzero((available <= self.clock.now) & (expiration > self.clock.now))
+        if len(rows) == 0:
+            return None
+
+        latest = rows[np.argmax(available[rows])]
+        return float(chain['underlying_price'].iat[latest])
+
+    def prefetch_stats(self) -> dict:
+        """
+        Prefetch counters.
+
+        Returns:
+            Dict with depth, blocks loaded, loader read time and event
+            loop stall time (seconds spent waiting for the next block)
+        """
+        return {
+            'depth': self.prefetch_depth,
+            'blocks': self.blocks_loaded,
+            'load_seconds': round(self.load_seconds, 4),
+            'stall_seconds': round(self.stall_seconds, 4),
+        }
+
+    def memory_stats(self) -> dict:
+        """
+        Compact dtype counters.
+
+        Returns:
+            Dict with chains compacted, their footprint as read and after
+            compacting (bytes, strings included) and the share saved
+        """
+        return {
+            'chains': self.chains_compacted,
+            'full_bytes': self.full_bytes,
+            'compact_bytes': self.compact_bytes,
+            'saved_pct': round(100 * (1 - self.compact_bytes / self.full_bytes), 1) if self.full_bytes else 0.0,
+        }
+
+    def close(self):
+        """Stop the prefetch thread (if any)."""
+        self._stop.set()
+        if self._loader is not None:
+            self._loader.join(timeout=5)
+
     def get_all_timestamps(self) -> List[pd.Timestamp]:
         """
         Get all unique timestamps in the backtest period.
@@ -236,8 +595,20 @@ class DataHandler:
         Returns:
             List of timestamps
         """
-        if self._timestamp_cache is not None:
-            return self._timestamp_cache
+        if self._timestamp_cache is None:
+            self._timestamp_cache = [from_us(ts) for ts in self.get_all_timestamps_us().tolist()]
+
+        return self._timestamp_cache
+
+    def get_all_timestamps_us(self) -> np.ndarray:
+        """
+        get_all_timestamps() as int64 microseconds.
+
+        Returns:
+            Sorted int64 array
+        """
+        if self._timestamp_us_cache is not None:
+            return self._timestamp_us_cache
 
         query = text("""
             SELECT DISTINCT timestamp_available
@@ -246,20 +617,17 @@ class DataHandler:
             ORDER BY timestamp_available
         """)
 
-        result = pd.read_sql(
+        result = self._query(
             query,
-            self.conn,
             params={
-                'start_ts': self.start_date.value // 1000,
-                'end_ts': self.end_date.value // 1000
+                'start_ts': self.start_us,
+                'end_ts': self.end_us
             }
         )
 
-        self._timestamp_cache = [
-            pd.Timestamp(ts, unit='us') for ts in result['timestamp_available']
-        ]
+        self._timestamp_us_cache = result['timestamp_available'].to_numpy(dtype=np.int64)
 
-        return self._timestamp_cache
+        return self._timestamp_us_cache
 
     def get_market_regime(self, date: str) -> Optional[pd.Series]:
         """
@@ -276,9 +644,8 @@ class DataHandler:
             WHERE date = :date
         """)
 
-        result = pd.read_sql(
+        result = self._query(
             query,
-            self.conn,
             params={'date': date}
         )
 
@@ -307,9 +674,8 @@ class DataHandler:
             ORDER BY ex_date
         """)
 
-        result = pd.read_sql(
+        result = self._query(
             query,
-            self.conn,
             params={
                 'symbol': symbol,
                 'start_date': start_date,
@@ -336,9 +702,8 @@ class DataHandler:
               AND delisting_date <= :date
         """)
 
-        result = pd.read_sql(
+        result = self._query(
             query,
-            self.conn,
             params={
                 'symbol': symbol,
                 'date': date
@@ -357,6 +722,9 @@ class DataHandler:
         Returns:
             Current price or None
         """
+        if self._block is not None:
+            return self._block_underlying_price(symbol)
+
         latest = self.get_latest_bars(symbol, N=1)
 
         if len(latest) == 0:
@@ -364,6 +732,39 @@ class DataHandler:
 
         return latest.iloc[0]['underlying_price']
 
+    def get_underlying_price_at(self, symbol: str, timestamp_us: int) -> Optional[float]:
+        """
+        Underlying price as of a past time (e.g. an option's expiration).
+
+        Args:
+            symbol: Underlying symbol
+            timestamp_us: Time in microseconds, not after the current time
+
+        Returns:
+            Last price available at timestamp_us, or None
+        """
+        query = text("""
+            SELECT underlying_price FROM options_data_pit
+            WHERE underlying_symbol = :symbol
+              AND timestamp_available <= :as_of
+              AND is_stale = 0
+            ORDER BY timestamp_available DESC
+            LIMIT 1
+        """)
+
+        result = self._query(
+            query,
+            params={
+                'symbol': symbol,
+                'as_of': min(timestamp_us, self.clock.now) if self.clock.now is not None else timestamp_us
+            }
+        )
+
+        if len(result) == 0:
+            return None
+
+        return float(result.iloc[0]['underlying_price'])
+
     def get_timeframe_bar(self, symbol: str, timeframe: int) -> Optional[dict]:
         """
         Get the most recent complete bar for a specific timeframe.
@@ -375,6 +776,7 @@ class DataHandler:
         Returns:
             Bar dict with OHLCV data or None
         """
+        self.timeframe_reads += 1
         if not self.multi_timeframe_enabled or symbol not in self.timeframe_aggregators:
             return None
 
@@ -392,6 +794,7 @@ class DataHandler:
         Returns:
             List of bar dicts
         """
+        self.timeframe_reads += 1
         if not self.multi_timeframe_enabled or symbol not in self.timeframe_aggregators:
             return []
 
@@ -408,6 +811,7 @@ class DataHandler:
         Returns:
             DataFrame with OHLCV data
         """
+        self.timeframe_reads += 1
         if not self.multi_timeframe_enabled or symbol not in self.timeframe_aggregators:
             return pd.DataFrame()
 
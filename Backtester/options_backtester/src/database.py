@@ -46,6 +46,7 @@ class DatabaseManager:
         elif db_type == 'postgresql':
             if postgres_url is None:
                 raise ValueError("PostgreSQL URL required for PostgreSQL database")
+            self.postgres_url = postgres_url
             self.engine = create_engine(postgres_url)
         else:
             raise ValueError(f"Unsupported database type: {db_type}")
@@ -54,6 +55,12 @@ class DatabaseManager:
         """Get database connection."""
         return self.engine.connect()
 
+    def connection_args(self) -> dict:
+        """Arguments that recreate this manager (e.g. in a worker process)."""
+        if self.db_type == 'sqlite':
+            return {'db_type': 'sqlite', 'db_path': self.db_path}
+        return {'db_type': self.db_type, 'postgres_url': self.postgres_url}
+
     def create_schema(self):
         """
         Create all database tables with proper indexes.
@@ -330,6 +337,27 @@ class DatabaseManager:
 
         print("All tables dropped")
 
+    def get_data_version(self) -> dict:
+        """
+        Get a cheap version stamp for options_data_pit.
+
+        Point-in-time data is append-only, so the max row id changes on
+        every load. MAX(id) is answered from the primary key without a
+        table scan, which keeps this fast on large databases.
+
+        Returns:
+            Dict with database URL and max_id (None if the table is empty)
+        """
+        with self.engine.connect() as conn:
+            max_id = conn.execute(
+                text("SELECT MAX(id) FROM options_data_pit")
+            ).scalar()
+
+        return {
+            'database': self.engine.url.render_as_string(hide_password=True),
+            'max_id': max_id
+        }
+
 
 def get_database(db_type='sqlite', **kwargs):
     """
@@ -0,0 +1,135 @@
+"""
+Sorted delta index over one chain snapshot.
+
+Strategies pick strikes by delta several times per tick (one call per
+leg for spreads). Instead of filtering, copying and sorting the chain on
+every call, the snapshot is indexed once: row positions are sorted by
+delta within each (expiration, option type), and within each option type
+across expirations. Nearest-delta and delta-range queries are then a
+binary search (np.searchsorted) over one group, O(log n), and return row
+positions into the original chain without copying it.
+
+Deltas are compared as in Strategy.find_delta_strike: puts by absolute
+delta, calls by delta. Rows without a delta are not indexed.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class DeltaIndex:
+    """
+    Per-expiration, per-type sorted deltas of a chain snapshot.
+
+    The chain must not be modified in place after it is indexed.
+    """
+
+    def __init__(self, chain: pd.DataFrame):
+        """
+        Build the index (one stable sort per grouping).
+
+        Args:
+            chain: Options chain (delta, option_type, expiration_timestamp)
+        """
+        self.chain = chain
+        # (expiration_ts or None for all, option_type) -> (sorted deltas, row positions)
+        self._groups: Dict[Tuple[Optional[int], str], Tuple[np.ndarray, np.ndarray]] = {}
+
+        if len(chain) == 0:
+            return
+
+        option_types = np.asarray(chain['option_type'].to_numpy(), dtype=object)
+        delta = chain['delta'].to_numpy(dtype=np.float64)
+        delta = np.where(option_types == 'P', np.abs(delta), delta)
+
+        positions = np.flatnonzero(~np.isnan(delta))
+        delta = delta[positions]
+        option_types = option_types[positions]
+        type_codes, type_names = pd.factorize(option_types)
+        expirations = chain['expiration_timestamp'].to_numpy(dtype=np.int64)[positions]
+
+        # Stable sorts: equal deltas keep chain order
+        for keys, dated in (((delta, type_codes), False), ((delta, expirations, type_codes), True)):
+            order = np.lexsort(keys)
+            sorted_types = type_codes[order]
+            sorted_expirations = expirations[order]
+
+            changed = sorted_types[1:] != sorted_types[:-1]
+            if dated:
+                changed |= sorted_expirations[1:] != sorted_expirations[:-1]
+            bounds = np.concatenate(([0], np.flatnonzero(changed) + 1, [len(order)]))
+
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                if start == end:
+                    continue
+                expiration_ts = int(sorted_expirations[start]) if dated else None
+                group = order[start:end]
+                self._groups[expiration_ts, type_names[sorted_types[start]]] = (delta[group], positions[group])
+
+    def group(self, option_type: str = 'P',
+              expiration_ts: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorted deltas and their row positions for one type (and expiration).
+
+        Args:
+            option_type: 'C' or 'P'
+            expiration_ts: Expiration (µs); None for every expiration
+
+        Returns:
+            (deltas, positions) arrays, empty if there are no such rows
+        """
+        key = (None if expiration_ts is None else int(expiration_ts), option_type)
+        return self._groups.get(key, (np.empty(0), np.empty(0, dtype=np.int64)))
+
+    def nearest(self, target_delta: float, option_type: str = 'P', tolerance: float = 0.02,
+                expiration_ts: Optional[int] = None) -> Optional[int]:
+        """
+        Row position of the option closest to a target delta.
+
+        Args:
+            target_delta: Target delta (e.g., 0.30 for 30 delta)
+            option_type: 'C' or 'P'
+            tolerance: Acceptable delta range (e.g., 0.02 for ±2 delta)
+            expiration_ts: Restrict to one expiration (µs)
+
+        Returns:
+            Position in the chain (for iloc), or None if none is within tolerance
+        """
+        deltas, positions = self.group(option_type, expiration_ts)
+        if len(deltas) == 0:
+            return None
+
+        target = abs(target_delta) if option_type == 'P' else target_delta
+        i = int(np.searchsorted(deltas, target))
+
+        # Closest of the neighbours either side (the lower one on a tie)
+        best = None
+        if i > 0:
+            best = int(np.searchsorted(deltas, deltas[i - 1]))  # First row with that delta
+        if i < len(deltas) and (best is None or deltas[i] - target < target - deltas[best]):
+            best = i
+
+        if abs(deltas[best] - target) > tolerance:
+            return None
+        return int(positions[best])
+
+    def between(self, low: float, high: float, option_type: str = 'P',
+                expiration_ts: Optional[int] = None) -> np.ndarray:
+        """
+        Row positions of options with low <= delta <= high.
+
+        Args:
+            low: Lowest delta (absolute for puts)
+            high: Highest delta (absolute for puts)
+            option_type: 'C' or 'P'
+            expiration_ts: Restrict to one expiration (µs)
+
+        Returns:
+            Positions in the chain, in ascending delta order
+        """
+        deltas, positions = self.group(option_type, expiration_ts)
+        start = np.searchsorted(deltas, low, side='left')
+        end = np.searchsorted(deltas, high, side='right')
+        return positions[start:end]
@@ -0,0 +1,185 @@
+"""
+Level-gated event logger for the backtest hot paths.
+
+Fills, orders and settlements happen tens of thousands of times in a
+scalping run. Printing an f-string for each one costs string formatting
+and terminal I/O even when nobody reads it. EventLogger defers formatting
+(str.format-style, so existing format specs like {:,.2f} carry over) until
+a record is actually emitted and drops records below the configured level
+with a single comparison.
+
+Sinks:
+- stdout: print each record (default, same output as before)
+- ring:   keep the last N records in memory, formatted only when read
+- file:   append records to a file
+- off:    discard everything
+"""
+
+import sys
+from collections import deque
+from typing import Any, List, Optional, Union
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVELS = {
+    'debug': DEBUG,
+    'info': INFO,
+    'warning': WARNING,
+    'error': ERROR,
+    'off': OFF,
+}
+
+SINKS = ('stdout', 'ring', 'file', 'off')
+
+
+def parse_level(level: Union[int, str]) -> int:
+    """
+    Convert a level name or number to a numeric level.
+
+    Args:
+        level: Level name ('debug', 'info', 'warning', 'error', 'off') or int
+
+    Returns:
+        Numeric level
+    """
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[level.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level} (expected one of {list(LEVELS)})")
+
+
+class EventLogger:
+    """
+    Lightweight structured logger shared by all backtest components.
+
+    Call sites should pass format arguments separately so that disabled
+    records cost no formatting:
+
+        self.log.info("Executed {} {} @ ${:.2f}", direction, quantity, price)
+    """
+
+    def __init__(self, level: Union[int, str] = INFO, sink: str = 'stdout',
+                 capacity: int = 10000, path: Optional[str] = None):
+        """
+        Initialize event logger.
+
+        Args:
+            level: Minimum level emitted
+            sink: One of SINKS
+            capacity: Records kept by the ring sink
+            path: Output file for the file sink
+        """
+        if sink not in SINKS:
+            raise ValueError(f"Unknown log sink: {sink} (expected one of {SINKS})")
+        if sink == 'file' and path is None:
+            raise ValueError("File sink requires a path")
+
+        self.level = OFF if sink == 'off' else parse_level(level)
+        self.sink = sink
+        self.ring = deque(maxlen=capacity) if sink == 'ring' else None
+        self.file = open(path, 'a', buffering=1) if sink == 'file' else None
+
+    def enabled_for(self, level: int) -> bool:
+        """Check whether records at this level are emitted."""
+        return level >= self.level
+
+    def log(self, level: int, msg: str, *args: Any):
+        """
+        Emit a record if its level is enabled.
+
+        Args:
+            level: Record level
+            msg: str.format-style format string
+            *args: Format arguments (only applied when emitted)
+        """
+        if level < self.level:
+            return
+
+        if self.ring is not None:
+            self.ring.append((level, msg, args))
+        elif self.file is not None:
+            self.file.write((msg.format(*args) if args else msg) + '\n')
+        else:
+            print(msg.format(*args) if args else msg)
+
+    def debug(self, msg: str, *args: Any):
+        if DEBUG >= self.level:
+            self.log(DEBUG, msg, *args)
+
+    def info(self, msg: str, *args: Any):
+        if INFO >= self.level:
+            self.log(INFO, msg, *args)
+
+    def warning(self, msg: str, *args: Any):
+        if WARNING >= self.level:
+            self.log(WARNING, msg, *args)
+
+    def error(self, msg: str, *args: Any):
+        if ERROR >= self.level:
+            self.log(ERROR, msg, *args)
+
+    def records(self) -> List[str]:
+        """
+        Get formatted records held by the ring sink.
+
+        Returns:
+            List of messages, oldest first
+        """
+        if self.ring is None:
+            return []
+        return [msg.format(*args) if args else msg for _, msg, args in self.ring]
+
+    def dump(self, stream=None):
+        """Write ring buffer contents to a stream (default: stdout)."""
+        stream = stream or sys.stdout
+        for line in self.records():
+            stream.write(line + '\n')
+
+    def close(self):
+        """Close the file sink, if any."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def make_logger(quiet: bool = False, log_level: Union[int, str] = INFO,
+                log_sink: str = 'stdout', log_path: Optional[str] = None,
+                log_capacity: int = 10000) -> EventLogger:
+    """
+    Build the logger for a backtest from its options.
+
+    Args:
+        quiet: Disable event logging entirely
+        log_level: Minimum level emitted
+        log_sink: One of SINKS
+        log_path: Output file for the file sink
+        log_capacity: Records kept by the ring sink
+
+    Returns:
+        EventLogger
+    """
+    if quiet:
+        return EventLogger(sink='off')
+    return EventLogger(log_level, log_sink, log_capacity, log_path)
+
+
+if __name__ == "__main__":
+    import io
+    import time
+    from contextlib import redirect_stdout
+
+    n = 50000
+    for sink in ('stdout', 'ring', 'off'):
+        logger = EventLogger(sink=sink)
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for i in range(n):
+                logger.info("Executed {} {} @ ${:.2f}", 'BUY', i, 1.23)
+        print(f"{sink:7} {(time.perf_counter() - start) * 1e6 / n:.2f} us/record")
@@ -8,10 +8,15 @@ Implements proper event sequencing to prevent look-ahead bias:
 4. FillEvent - Execution simulates order fill
 
 This architecture ensures events are processed in chronological order.
+
+Events are slotted and frozen: one is created for every tick, signal,
+order and fill, so they stay small and cannot change while queued.
 """
 
+from collections import deque
 from enum import Enum
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from queue import Empty
 from typing import Optional, List, Dict, Any
 import pandas as pd
 
@@ -24,7 +29,7 @@ class EventType(Enum):
     FILL = 4
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MarketEvent:
     """
     Represents new market data becoming available.
@@ -40,7 +45,7 @@ class MarketEvent:
         return f"MarketEvent(timestamp={self.timestamp})"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SignalEvent:
     """
     Represents a trading signal generated by a strategy.
@@ -59,7 +64,7 @@ class SignalEvent:
         return f"SignalEvent({self.symbol}, {self.signal_type}, strength={self.strength})"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OrderEvent:
     """
     Represents an order to be executed.
@@ -69,7 +74,7 @@ class OrderEvent:
     """
     type: EventType = EventType.ORDER
     symbol: Optional[str] = None
-    order_type: Optional[str] = None  # 'MARKET', 'LIMIT'
+    order_type: Optional[str] = None  # 'MARKET', 'LIMIT', 'CANCEL' (resting order_id)
     quantity: Optional[int] = None
     direction: Optional[str] = None  # 'BUY', 'SELL'
     strikes: Optional[List[float]] = None  # Strike prices
@@ -77,12 +82,45 @@ class OrderEvent:
     limit_price: Optional[float] = None  # For limit orders
     order_id: Optional[str] = None  # Unique order identifier
     timestamp: Optional[pd.Timestamp] = None  # When order was placed
+    leg_directions: Optional[List[str]] = None  # 'BUY' or 'SELL' for each leg (multi-leg orders)
+    leg_ratios: Optional[List[int]] = None  # Contracts per spread for each leg (default 1)
+    expirations: Optional[List[int]] = None  # Expiration timestamp (microseconds) for each leg
+    time_in_force: Optional[str] = None  # 'DAY' (default), 'GTC', 'IOC' for limit orders
 
     def __str__(self):
+        if self.is_multi_leg:
+            return f"OrderEvent({self.symbol}, {len(self.strikes)}-leg x{self.quantity}, {self.order_type})"
         return f"OrderEvent({self.symbol}, {self.direction} {self.quantity}, {self.order_type})"
 
+    @property
+    def is_multi_leg(self) -> bool:
+        """True for spread orders whose legs are filled together."""
+        return bool(self.leg_directions)
+
+    def get_legs(self) -> List[Dict[str, Any]]:
+        """
+        Legs of a multi-leg order.
 
-@dataclass
+        Returns:
+            List of {strike, option_type, direction, ratio, expiration_ts}
+        """
+        n = len(self.strikes or [])
+        ratios = self.leg_ratios or [1] * n
+        expirations = self.expirations or [None] * n
+
+        return [
+            {
+                'strike': self.strikes[i],
+                'option_type': self.option_types[i],
+                'direction': self.leg_directions[i],
+                'ratio': ratios[i],
+                'expiration_ts': expirations[i],
+            }
+            for i in range(n)
+        ]
+
+
+@dataclass(frozen=True, slots=True)
 class FillEvent:
     """
     Represents a completed order execution.
@@ -101,7 +139,10 @@ class FillEvent:
     order_id: Optional[str] = None  # Reference to original order
     strikes: Optional[List[float]] = None  # Strike prices filled
     option_types: Optional[List[str]] = None  # Option types filled
+    expirations: Optional[List[int]] = None  # Expiration timestamps filled (microseconds)
     execution_quality: Optional[str] = None  # 'GOOD', 'FAIR', 'POOR'
+    legs: Optional[List[Dict[str, Any]]] = None  # Per-leg fills of a multi-leg order
+    greeks: Optional[Dict[str, float]] = None  # Per-contract Greeks at fill (single-leg)
 
     def __str__(self):
         return f"FillEvent({self.symbol}, {self.direction} {self.quantity} @ {self.fill_price})"
@@ -110,6 +151,9 @@ class FillEvent:
         """
         Calculate total cost of fill including commission.
 
+        For multi-leg fills, fill_price is the net premium per spread and
+        direction is 'BUY' for a net debit, 'SELL' for a net credit.
+
         Returns:
             Positive for buys (cash outflow)
             Negative for sells (cash inflow)
@@ -123,6 +167,40 @@ class FillEvent:
             return -(price_cost - self.commission)
 
 
+class EventBus:
+    """
+    Lock-free FIFO event queue for the single-threaded event loop.
+
+    Drop-in for the put/get/empty subset of queue.Queue the components
+    use, backed by a deque so puts and gets skip Queue's lock and
+    condition variables. get() raises queue.Empty when drained.
+    """
+
+    __slots__ = ('_events',)
+
+    def __init__(self):
+        self._events = deque()
+
+    def put(self, event, block: bool = True, timeout: Optional[float] = None):
+        """Append an event (never blocks)."""
+        self._events.append(event)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        """Pop the oldest event, raising queue.Empty if there is none."""
+        try:
+            return self._events.popleft()
+        except IndexError:
+            raise Empty from None
+
+    def empty(self) -> bool:
+        """True if no events are queued."""
+        return not self._events
+
+    def qsize(self) -> int:
+        """Number of queued events."""
+        return len(self._events)
+
+
 # Helper functions
 
 def create_market_event(timestamp: pd.Timestamp, data: Dict[str, Any]) -> MarketEvent:
@@ -163,7 +241,11 @@ def create_order_event(
     option_types: Optional[List[str]] = None,
     limit_price: Optional[float] = None,
     order_id: Optional[str] = None,
-    timestamp: Optional[pd.Timestamp] = None
+    timestamp: Optional[pd.Timestamp] = None,
+    leg_directions: Optional[List[str]] = None,
+    leg_ratios: Optional[List[int]] = None,
+    expirations: Optional[List[int]] = None,
+    time_in_force: Optional[str] = None
 ) -> OrderEvent:
     """Factory function to create OrderEvent."""
     return OrderEvent(
@@ -176,7 +258,56 @@ def create_order_event(
         option_types=option_types,
         limit_price=limit_price,
         order_id=order_id,
-        timestamp=timestamp
+        timestamp=timestamp,
+        leg_directions=leg_directions,
+        leg_ratios=leg_ratios,
+        expirations=expirations,
+        time_in_force=time_in_force
+    )
+
+
+def create_spread_order(
+    symbol: str,
+    legs: List[Dict[str, Any]],
+    quantity: int,
+    direction: str,
+    order_type: str = 'MARKET',
+    limit_price: Optional[float] = None,
+    order_id: Optional[str] = None,
+    timestamp: Optional[pd.Timestamp] = None
+) -> OrderEvent:
+    """
+    Factory function to create a multi-leg OrderEvent.
+
+    Args:
+        symbol: Underlying symbol
+        legs: List of {strike, option_type, direction, ratio (optional),
+            expiration_ts (optional)}; direction is the action for that leg
+        quantity: Number of spreads
+        direction: 'BUY' or 'SELL' for the spread as a whole (the legs
+            carry their own directions)
+        order_type: 'MARKET' or 'LIMIT'
+        limit_price: Net price per spread (positive = max debit,
+            negative = min credit)
+        order_id: Unique order identifier
+        timestamp: When order was placed
+
+    Returns:
+        OrderEvent with per-leg fields set
+    """
+    return create_order_event(
+        symbol=symbol,
+        order_type=order_type,
+        quantity=quantity,
+        direction=direction,
+        strikes=[leg['strike'] for leg in legs],
+        option_types=[leg['option_type'] for leg in legs],
+        limit_price=limit_price,
+        order_id=order_id,
+        timestamp=timestamp,
+        leg_directions=[leg['direction'] for leg in legs],
+        leg_ratios=[int(leg.get('ratio', 1)) for leg in legs],
+        expirations=[leg.get('expiration_ts') for leg in legs]
     )
 
 
@@ -191,7 +322,10 @@ def create_fill_event(
     order_id: Optional[str] = None,
     strikes: Optional[List[float]] = None,
     option_types: Optional[List[str]] = None,
-    execution_quality: Optional[str] = None
+    execution_quality: Optional[str] = None,
+    expirations: Optional[List[int]] = None,
+    legs: Optional[List[Dict[str, Any]]] = None,
+    greeks: Optional[Dict[str, float]] = None
 ) -> FillEvent:
     """Factory function to create FillEvent."""
     return FillEvent(
@@ -206,7 +340,10 @@ def create_fill_event(
         order_id=order_id,
         strikes=strikes,
         option_types=option_types,
-        execution_quality=execution_quality
+        execution_quality=execution_quality,
+        expirations=expirations,
+        legs=legs,
+        greeks=greeks
     )
 
 
@@ -11,6 +11,7 @@ from queue import Queue
 from strategy import Strategy
 from data_handler import DataHandler
 from events import MarketEvent
+from subscription import DataSubscription
 import pandas as pd
 import numpy as np
 
@@ -31,6 +32,12 @@ class SimplePremiumSelling(Strategy):
     - Stop loss at 200% of credit
     """
 
+    carried_state = ('positions',)
+
+    # Columns only: IV rank reads every contract, and the held put must be
+    # checked for exits wherever it trades
+    subscription = DataSubscription(columns=('implied_vol',))
+
     def __init__(self, events_queue: Queue, data_handler: DataHandler,
                  iv_rank_threshold: float = 75.0,
                  target_delta: float = 0.30,
@@ -51,7 +58,7 @@ class SimplePremiumSelling(Strategy):
         self.target_delta = target_delta
         self.profit_target_pct = profit_target_pct
 
-        # Track open positions
+        # Track open positions (carried across sessions in day-sharded runs)
         self.positions = {}
 
     def calculate_signals(self, market_event: MarketEvent):
@@ -101,9 +108,10 @@ class SimplePremiumSelling(Strategy):
                 continue
 
             # Generate SELL signal
-            print(f"\n{symbol}: IV Rank {iv_rank:.1f}% > {self.iv_rank_threshold}%")
-            print(f"  Selling {target_option['strike']} put @ ${target_option['mid_price']:.2f}")
-            print(f"  Delta: {target_option['delta']:.3f}, DTE: {dte:.1f}")
+            self.log.info("\n{}: IV Rank {:.1f}% > {}%\n  Selling {} put @ ${:.2f}\n  Delta: {:.3f}, DTE: {:.1f}",
+                          symbol, iv_rank, self.iv_rank_threshold,
+                          target_option['strike'], target_option['mid_price'],
+                          target_option['delta'], dte)
 
             signal = self.create_signal(
                 symbol=symbol,
@@ -147,10 +155,11 @@ class SimplePremiumSelling(Strategy):
 
         position = self.positions[symbol]
 
-        # Find current price for this option
+        # Find current price for this option (the held expiration only)
         current_option = data[
             (data['strike'] == position['strike']) &
-            (data['option_type'] == 'P')
+            (data['option_type'] == 'P') &
+            (data['expiration_timestamp'] == position['expiration_ts'])
         ]
 
         if len(current_option) == 0:
@@ -165,23 +174,20 @@ class SimplePremiumSelling(Strategy):
 
         # Exit condition 1: Profit target (50% of credit)
         if pnl_pct >= self.profit_target_pct:
-            print(f"\n{symbol}: Profit target hit! P&L: {pnl_pct:.1%}")
+            self.log.info("\n{}: Profit target hit! P&L: {:.1%}", symbol, pnl_pct)
             self.exit_position(symbol, current_option, 'PROFIT_TARGET')
             return
 
         # Exit condition 2: Stop loss (200% of credit)
         if pnl_pct <= -2.0:
-            print(f"\n{symbol}: Stop loss hit! P&L: {pnl_pct:.1%}")
+            self.log.info("\n{}: Stop loss hit! P&L: {:.1%}", symbol, pnl_pct)
             self.exit_position(symbol, current_option, 'STOP_LOSS')
             return
 
         # Exit condition 3: 0DTE close at 3:30 PM
-        hours_to_expiry = (
-            pd.Timestamp(current_option['expiration_timestamp'], unit='us') - current_time
-        ).total_seconds() / 3600
-
-        if hours_to_expiry < 0.5:  # 30 minutes before expiration
-            print(f"\n{symbol}: Closing 0DTE position (30 min to expiry)")
+        if self.is_near_expiration(current_option['expiration_timestamp'], current_time,
+                                   hours_threshold=0.5):  # 30 minutes before expiration
+            self.log.info("\n{}: Closing 0DTE position (30 min to expiry)", symbol)
             self.exit_position(symbol, current_option, 'TIME_EXIT')
             return
 
@@ -202,12 +208,17 @@ class SimplePremiumSelling(Strategy):
             metadata={
                 'option_type': 'P',
                 'exit_price': option_data['mid_price'],
-                'reason': reason
+                'reason': reason,
+                'expiration_ts': int(option_data['expiration_timestamp'])
             }
         )
 
         # Clear position
-        self.positions[symbol] = None
+        del self.positions[symbol]
+
+    def on_expiry(self, fill_event):
+        """Forget a short put that expired while held overnight."""
+        self.positions.pop(fill_event.symbol, None)
 
     def estimate_iv_rank(self, data: pd.DataFrame) -> float:
         """
@@ -244,17 +255,220 @@ class IronCondorStrategy(Strategy):
     Buy:
     - 16 delta put (protection)
     - 16 delta call (protection)
+
+    All four legs go out as one multi-leg order on the nearest expiration
+    and are filled together.
+
+    Exit:
+    - 50% profit target
+    - Stop loss at 200% of credit
+    - Close 30 minutes before expiration
     """
 
-    def __init__(self, events_queue: Queue, data_handler: DataHandler):
+    carried_state = ('positions',)
+
+    def __init__(self, events_queue: Queue, data_handler: DataHandler,
+                 short_delta: float = 0.30,
+                 wing_delta: float = 0.16,
+                 profit_target_pct: float = 0.50,
+                 delta_tolerance: float = 0.05):
+        """
+        Initialize strategy.
+
+        Args:
+            events_queue: Event queue
+            data_handler: Data handler
+            short_delta: Target delta for sold options (default: 0.30)
+            wing_delta: Target delta for bought wings (default: 0.16)
+            profit_target_pct: Profit target as % of credit (default: 50%)
+            delta_tolerance: Acceptable delta range per leg (default: ±0.05)
+        """
         super().__init__(events_queue, data_handler)
+
+        self.short_delta = short_delta
+        self.wing_delta = wing_delta
+        self.profit_target_pct = profit_target_pct
+        self.delta_tolerance = delta_tolerance
+
+        # Track open condors (carried across sessions in day-sharded runs)
         self.positions = {}
 
     def calculate_signals(self, market_event: MarketEvent):
-        """Generate iron condor signals."""
-        # Implementation similar to SimplePremiumSelling
-        # but with 4 legs instead of 1
-        pass
+        """
+        Generate iron condor signals.
+
+        Args:
+            market_event: Market event with current data
+        """
+        for symbol, data in market_event.data.items():
+            if len(data) == 0:
+                continue
+
+            if symbol in self.positions and self.positions[symbol] is not None:
+                self.check_exit_conditions(symbol, data, market_event.timestamp)
+                continue
+
+            # Nearest expiration only, so all legs expire together
+            expiration_ts = data['expiration_timestamp'].min()
+
+            legs = self.select_legs(data, expiration_ts)
+            if legs is None:
+                continue
+
+            dte = self.get_days_to_expiration(expiration_ts, market_event.timestamp)
+            if dte > 7:
+                continue
+
+            credit = sum(
+                leg['mid_price'] if leg['direction'] == 'SELL' else -leg['mid_price']
+                for leg in legs
+            )
+            if credit <= 0:
+                continue
+
+            strikes = [leg['strike'] for leg in legs]
+
+            self.log.info("\n{}: Selling iron condor {}/{}P {}/{}C @ ${:.2f} credit, DTE: {:.1f}",
+                          symbol, strikes[0], strikes[1], strikes[2], strikes[3], credit, dte)
+
+            self.create_signal(
+                symbol=symbol,
+                signal_type='SHORT',
+                strength=1.0,
+                strikes=strikes,
+                metadata={
+                    'legs': [
+                        {
+                            'strike': leg['strike'],
+                            'option_type': leg['option_type'],
+                            'direction': leg['direction'],
+                            'expiration_ts': int(expiration_ts)
+                        }
+                        for leg in legs
+                    ],
+                    'entry_credit': credit,
+                    'dte': dte,
+                    'expiration_ts': expiration_ts
+                }
+            )
+
+            self.positions[symbol] = {
+                'legs': legs,
+                'entry_credit': credit,
+                'expiration_ts': expiration_ts
+            }
+
+    def select_legs(self, data: pd.DataFrame, expiration_ts: int):
+        """
+        Pick the four condor legs from one expiration.
+
+        Args:
+            data: Current options chain
+            expiration_ts: Expiration of every leg
+
+        Returns:
+            List of leg dicts (long put, short put, short call, long call)
+            or None if the structure can't be built
+        """
+        picks = [
+            ('P', self.wing_delta, 'BUY'),
+            ('P', self.short_delta, 'SELL'),
+            ('C', self.short_delta, 'SELL'),
+            ('C', self.wing_delta, 'BUY'),
+        ]
+
+        legs = []
+        for option_type, delta, direction in picks:
+            option = self.find_delta_strike(data, target_delta=delta, option_type=option_type,
+                                            tolerance=self.delta_tolerance, expiration_ts=expiration_ts)
+            if option is None:
+                return None
+
+            legs.append({
+                'strike': option['strike'],
+                'option_type': option_type,
+                'direction': direction,
+                'mid_price': option['mid_price']
+            })
+
+        # Wings must be further out of the money than the short strikes
+        long_put, short_put, short_call, long_call = (leg['strike'] for leg in legs)
+        if not (long_put < short_put < short_call < long_call):
+            return None
+
+        return legs
+
+    def check_exit_conditions(self, symbol: str, data: pd.DataFrame,
+                              current_time: pd.Timestamp):
+        """
+        Check if we should close the condor.
+
+        Args:
+            symbol: Symbol
+            data: Current market data
+            current_time: Current timestamp
+        """
+        position = self.positions[symbol]
+        expiry_data = data[data['expiration_timestamp'] == position['expiration_ts']]
+
+        # Cost to buy the condor back at mid
+        debit = 0.0
+        for leg in position['legs']:
+            quote = expiry_data[
+                (expiry_data['strike'] == leg['strike']) &
+                (expiry_data['option_type'] == leg['option_type'])
+            ]
+            if len(quote) == 0:
+                return
+            price = quote.iloc[0]['mid_price']
+            debit += price if leg['direction'] == 'SELL' else -price
+
+        pnl_pct = (position['entry_credit'] - debit) / position['entry_credit']
+
+        if pnl_pct >= self.profit_target_pct:
+            self.log.info("\n{}: Condor profit target hit! P&L: {:.1%}", symbol, pnl_pct)
+            self.exit_position(symbol, 'PROFIT_TARGET')
+        elif pnl_pct <= -2.0:
+            self.log.info("\n{}: Condor stop loss hit! P&L: {:.1%}", symbol, pnl_pct)
+            self.exit_position(symbol, 'STOP_LOSS')
+        elif self.is_near_expiration(position['expiration_ts'], current_time, hours_threshold=0.5):
+            self.log.info("\n{}: Closing condor (30 min to expiry)", symbol)
+            self.exit_position(symbol, 'TIME_EXIT')
+
+    def exit_position(self, symbol: str, reason: str):
+        """
+        Close the condor with one multi-leg EXIT signal (every leg reversed).
+
+        Args:
+            symbol: Symbol
+            reason: Exit reason
+        """
+        position = self.positions[symbol]
+
+        self.create_signal(
+            symbol=symbol,
+            signal_type='EXIT',
+            strength=1.0,
+            strikes=[leg['strike'] for leg in position['legs']],
+            metadata={
+                'legs': [
+                    {
+                        'strike': leg['strike'],
+                        'option_type': leg['option_type'],
+                        'direction': 'BUY' if leg['direction'] == 'SELL' else 'SELL',
+                        'expiration_ts': int(position['expiration_ts'])
+                    }
+                    for leg in position['legs']
+                ],
+                'reason': reason
+            }
+        )
+
+        del self.positions[symbol]
+
+    def on_expiry(self, fill_event):
+        """Forget a condor whose legs expired while held overnight."""
+        self.positions.pop(fill_event.symbol, None)
 
 
 class ZeroDTEScalping(Strategy):
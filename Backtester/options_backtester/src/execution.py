@@ -6,14 +6,37 @@ Models realistic order execution including:
 - Time-to-expiration impact on slippage
 - Volatility-based slippage
 - 0DTE specific challenges
+- Multi-leg spreads filled atomically against one chain snapshot
+- Resting limit orders matched against every new snapshot
 """
 
 from queue import Queue
 from events import OrderEvent, FillEvent, EventType, create_fill_event
 from data_handler import DataHandler
+from event_log import EventLogger
+from positions import GREEKS, latest_quotes
+from order_book import LimitOrderBook, TIME_IN_FORCE
+from clock import US_PER_HOUR, to_us
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import List, Optional
+
+
+def quote_greeks(option_data) -> Optional[dict]:
+    """Per-contract Greeks of a quote row (None if the chain has none)."""
+    if not all(greek in option_data for greek in GREEKS):
+        return None
+    return {greek: float(option_data[greek]) for greek in GREEKS}
+
+
+def live_quotes(chain: pd.DataFrame) -> pd.DataFrame:
+    """
+    Latest quote per contract, nearest expiration first.
+
+    Orders without an expiration trade the nearest one quoted for their
+    strike and type.
+    """
+    return chain.iloc[latest_quotes(chain)].sort_values('expiration_timestamp', kind='stable')
 
 
 class ExecutionHandler:
@@ -27,7 +50,7 @@ class ExecutionHandler:
     """
 
     def __init__(self, events_queue: Queue, data_handler: DataHandler,
-                 commission: float = 0.05):
+                 commission: float = 0.05, logger: Optional[EventLogger] = None):
         """
         Initialize execution handler.
 
@@ -35,16 +58,24 @@ class ExecutionHandler:
             events_queue: Queue for putting fill events
             data_handler: DataHandler for market data
             commission: Commission per contract (default: $0.05 - Alpaca standard)
+            logger: Event logger (default: print to stdout)
         """
         self.events = events_queue
         self.data = data_handler
         self.commission = commission
+        self.log = logger or EventLogger()
 
         # Slippage model parameters
         self.base_slippage_pct = 0.10  # 10% of spread as base slippage
         self.dte_slippage_factor = 2.0  # Multiplier for near-expiration
         self.iv_slippage_threshold = 0.30  # High IV threshold
 
+        # Quote context of every fill (for execution stats and re-pricing)
+        self.fill_log = []
+
+        # Working limit orders, matched each tick by match_resting_orders
+        self.book = LimitOrderBook()
+
     def execute_order(self, order_event: OrderEvent):
         """
         Simulate order execution with realistic fills.
@@ -52,7 +83,13 @@ class ExecutionHandler:
         Args:
             order_event: Order to execute
         """
-        if order_event.order_type == 'MARKET':
+        if order_event.order_type == 'CANCEL':
+            self.cancel_order(order_event.order_id)
+        elif order_event.is_multi_leg:
+            fill = self.execute_spread_order(order_event)
+            if fill:
+                self.events.put(fill)
+        elif order_event.order_type == 'MARKET':
             fill = self.execute_market_order(order_event)
             if fill:
                 self.events.put(fill)
@@ -73,35 +110,16 @@ class ExecutionHandler:
         """
         # Get current market data for the specific option
         if not order.strikes or len(order.strikes) == 0:
-            print(f"No strikes specified in order {order.order_id}")
-            return None
-
-        strike = order.strikes[0]
-        option_type = order.option_types[0] if order.option_types else 'P'
-
-        # Get options chain
-        chain = self.data.get_options_chain(order.symbol, min_dte=0, max_dte=7)
-
-        if len(chain) == 0:
-            print(f"No data available for {order.symbol}")
+            self.log.warning("No strikes specified in order {}", order.order_id)
             return None
 
-        # Find specific option
-        option_data = chain[
-            (chain['strike'] == strike) &
-            (chain['option_type'] == option_type)
-        ]
-
-        if len(option_data) == 0:
-            print(f"Option not found: {order.symbol} {strike} {option_type}")
+        option_data = self.find_option(order)
+        if option_data is None:
             return None
 
-        option_data = option_data.iloc[0]
-
         # Calculate time to expiration
         current_timestamp = self.data.current_timestamp
-        expiration = pd.Timestamp(option_data['expiration_timestamp'], unit='us')
-        hours_to_expiry = (expiration - current_timestamp).total_seconds() / 3600
+        hours_to_expiry = (int(option_data['expiration_timestamp']) - to_us(current_timestamp)) / US_PER_HOUR
 
         # Calculate fill price with slippage
         fill_price, slippage, execution_quality = self.model_slippage(
@@ -123,72 +141,422 @@ class ExecutionHandler:
             order_id=order.order_id,
             strikes=order.strikes,
             option_types=order.option_types,
-            execution_quality=execution_quality
+            execution_quality=execution_quality,
+            expirations=[int(option_data['expiration_timestamp'])],
+            greeks=quote_greeks(option_data)
         )
 
-        print(f"Executed {order.direction} {order.quantity} @ ${fill_price:.2f}")
-        print(f"  Slippage: ${slippage:.4f}, Quality: {execution_quality}")
+        self.log.info("Executed {} {} @ ${:.2f}\n  Slippage: ${:.4f}, Quality: {}",
+                      order.direction, order.quantity, fill_price, slippage, execution_quality)
+
+        self._record_fill(fill, option_data, hours_to_expiry)
 
         return fill
 
-    def execute_limit_order(self, order: OrderEvent) -> Optional[FillEvent]:
+    def find_option(self, order: OrderEvent) -> Optional[pd.Series]:
         """
-        Execute limit order (simplified).
+        Quote of a single-leg order's contract in the current chain.
 
         Args:
-            order: Limit order to execute
+            order: Single-leg order (strike, option type, optional expiration)
 
         Returns:
-            FillEvent or None if not filled
+            Latest quote of the contract (nearest expiration if the order
+            has none), or None if there is no quote
         """
-        # Simplified: assume limit orders fill at limit price if within bid-ask
-        # In reality, would need to model fill probability
-
-        strike = order.strikes[0] if order.strikes else None
+        strike = order.strikes[0]
         option_type = order.option_types[0] if order.option_types else 'P'
 
-        if not strike:
+        # Get options chain
+        chain = self.data.get_options_chain(order.symbol, min_dte=0, max_dte=7)
+
+        if len(chain) == 0:
+            self.log.warning("No data available for {}", order.symbol)
+            return None
+
+        # Find specific option
+        quotes = live_quotes(chain)
+        mask = (quotes['strike'] == strike) & (quotes['option_type'] == option_type)
+        if order.expirations and order.expirations[0] is not None:
+            mask &= quotes['expiration_timestamp'] == order.expirations[0]
+        option_data = quotes[mask]
+
+        if len(option_data) == 0:
+            self.log.warning("Option not found: {} {} {}", order.symbol, strike, option_type)
             return None
 
-        # Get option data
-        option_data = self.data.get_specific_option(
-            order.symbol,
-            strike,
-            option_type,
-            0  # Simplified
+        return option_data.iloc[0]
+
+    def execute_orders(self, orders: List[OrderEvent]) -> List[FillEvent]:
+        """
+        Fill a batch of market orders in one pass.
+
+        One chain lookup per symbol and one vectorized slippage call for the
+        whole batch, e.g. for the 3:55pm auto-close. Contracts are matched
+        exactly as in execute_market_order. Fills are put on the event queue.
+
+        Multi-leg orders are filled one by one with execute_spread_order.
+
+        Args:
+            orders: Market orders to execute
+
+        Returns:
+            List of FillEvents (orders without market data are skipped)
+        """
+        current_timestamp = self.data.current_timestamp
+        matched = []  # (order, option row)
+        fills = []
+
+        for order in orders:
+            if order.is_multi_leg:
+                fill = self.execute_spread_order(order)
+                if fill:
+                    self.events.put(fill)
+                    fills.append(fill)
+
+        orders = [order for order in orders if not order.is_multi_leg]
+
+        for symbol in dict.fromkeys(order.symbol for order in orders):
+            symbol_orders = [order for order in orders if order.symbol == symbol]
+            chain = self.data.get_options_chain(symbol, min_dte=0, max_dte=7)
+
+            if len(chain) == 0:
+                self.log.warning("No data available for {}", symbol)
+                continue
+
+            # Latest quote per contract, same as the per-order lookup
+            quotes = live_quotes(chain)
+            contracts = quotes.drop_duplicates(['strike', 'option_type'], keep='first')
+            contracts = contracts.set_index(['strike', 'option_type'])
+            dated = None  # Every expiration (built on demand)
+
+            for order in symbol_orders:
+                if not order.strikes:
+                    self.log.warning("No strikes specified in order {}", order.order_id)
+                    continue
+
+                key = (order.strikes[0], order.option_types[0] if order.option_types else 'P')
+                index = contracts
+                if order.expirations and order.expirations[0] is not None:
+                    if dated is None:
+                        dated = quotes.set_index(['strike', 'option_type', 'expiration_timestamp'], drop=False)
+                    key += (order.expirations[0],)
+                    index = dated
+
+                if key not in index.index:
+                    self.log.warning("Option not found: {} {} {}", symbol, key[0], key[1])
+                    continue
+
+                matched.append((order, index.loc[key]))
+
+        if not matched:
+            return fills
+
+        quotes = pd.DataFrame([row for _, row in matched])
+        hours_to_expiry = (
+            quotes['expiration_timestamp'].to_numpy(dtype=np.int64) - to_us(current_timestamp)
+        ) / US_PER_HOUR
+
+        fill_prices, slippages, qualities = self.model_slippage_batch(
+            quotes,
+            np.array([order.direction for order, _ in matched]),
+            hours_to_expiry,
+            np.array([order.quantity for order, _ in matched])
+        )
+
+        for i, (order, option_data) in enumerate(matched):
+            fill = create_fill_event(
+                symbol=order.symbol,
+                quantity=order.quantity,
+                direction=order.direction,
+                fill_price=float(fill_prices[i]),
+                commission=self.commission * order.quantity,
+                timestamp=current_timestamp,
+                slippage=float(slippages[i]),
+                order_id=order.order_id,
+                strikes=order.strikes,
+                option_types=order.option_types,
+                execution_quality=str(qualities[i]),
+                expirations=[int(option_data['expiration_timestamp'])],
+                greeks=quote_greeks(option_data)
+            )
+
+            self.log.info("Executed {} {} @ ${:.2f}\n  Slippage: ${:.4f}, Quality: {}",
+                          order.direction, order.quantity, fill.fill_price, fill.slippage,
+                          fill.execution_quality)
+
+            self._record_fill(fill, option_data, hours_to_expiry[i])
+            self.events.put(fill)
+            fills.append(fill)
+
+        return fills
+
+    def execute_spread_order(self, order: OrderEvent) -> Optional[FillEvent]:
+        """
+        Fill every leg of a multi-leg order atomically.
+
+        All legs are priced against the same chain snapshot with one
+        vectorized slippage call. If any leg has no quote the whole order
+        is rejected, so a spread is never left half-filled. Limit orders
+        fill only if the net price is at least as good as limit_price.
+
+        Args:
+            order: Multi-leg order (see events.create_spread_order)
+
+        Returns:
+            FillEvent with the net premium and per-leg fills, or None
+        """
+        legs = order.get_legs()
+        if len(legs) == 0:
+            self.log.warning("No strikes specified in order {}", order.order_id)
+            return None
+
+        chain = self.data.get_options_chain(order.symbol, min_dte=0, max_dte=7)
+
+        if len(chain) == 0:
+            self.log.warning("No data available for {}", order.symbol)
+            return None
+
+        # Latest quote per contract, same as the single-leg lookup
+        contracts = live_quotes(chain)
+
+        rows = []
+        for leg in legs:
+            mask = (contracts['strike'] == leg['strike']) & (contracts['option_type'] == leg['option_type'])
+            if leg['expiration_ts'] is not None:
+                mask &= contracts['expiration_timestamp'] == leg['expiration_ts']
+
+            option_data = contracts[mask]
+            if len(option_data) == 0:
+                self.log.warning("Spread {} rejected, leg not found: {} {} {}",
+                                 order.order_id, order.symbol, leg['strike'], leg['option_type'])
+                return None
+
+            rows.append(option_data.iloc[0])
+
+        current_timestamp = self.data.current_timestamp
+        quotes = pd.DataFrame(rows)
+        sides = np.array([leg['direction'] for leg in legs])
+        ratios = np.array([leg['ratio'] for leg in legs])
+        hours_to_expiry = (
+            quotes['expiration_timestamp'].to_numpy(dtype=np.int64) - to_us(current_timestamp)
+        ) / US_PER_HOUR
+
+        fill_prices, slippages, qualities = self.model_slippage_batch(
+            quotes, sides, hours_to_expiry, ratios * order.quantity
         )
 
+        # Net premium per spread: positive = debit paid, negative = credit received
+        signs = np.where(sides == 'BUY', 1.0, -1.0)
+        net_premium = float(np.sum(signs * fill_prices * ratios))
+
+        if order.order_type == 'LIMIT' and order.limit_price is not None and net_premium > order.limit_price:
+            return None
+
+        leg_fills = [
+            {
+                'strike': leg['strike'],
+                'option_type': leg['option_type'],
+                'expiration_ts': int(rows[i]['expiration_timestamp']),
+                'direction': leg['direction'],
+                'ratio': int(leg['ratio']),
+                'quantity': int(leg['ratio'] * order.quantity),
+                'fill_price': float(fill_prices[i]),
+                'slippage': float(slippages[i]),
+                'execution_quality': str(qualities[i]),
+                'greeks': quote_greeks(rows[i]),
+            }
+            for i, leg in enumerate(legs)
+        ]
+
+        # Worst leg sets the quality of the spread
+        quality = next(q for q in ('POOR', 'FAIR', 'GOOD') if q in qualities)
+
+        fill = create_fill_event(
+            symbol=order.symbol,
+            quantity=order.quantity,
+            direction='BUY' if net_premium > 0 else 'SELL',
+            fill_price=abs(net_premium),
+            commission=self.commission * int(ratios.sum()) * order.quantity,
+            timestamp=current_timestamp,
+            slippage=float(np.sum(slippages * ratios)),
+            order_id=order.order_id,
+            strikes=order.strikes,
+            option_types=order.option_types,
+            execution_quality=quality,
+            legs=leg_fills
+        )
+
+        self.log.info("Executed {}-leg spread x{} @ ${:.2f} net {}\n  Slippage: ${:.4f}, Quality: {}",
+                      len(legs), order.quantity, fill.fill_price,
+                      'debit' if fill.direction == 'BUY' else 'credit', fill.slippage, quality)
+
+        for i, leg_fill in enumerate(leg_fills):
+            self._record_fill(fill, rows[i], hours_to_expiry[i], leg=leg_fill,
+                              order_type=order.order_type)
+
+        return fill
+
+    def _record_fill(self, fill: FillEvent, option_data, hours_to_expiry: float,
+                     leg: Optional[dict] = None, order_type: str = 'MARKET'):
+        """Keep the quote a fill (or one spread leg) was priced from, for stats and re-pricing."""
+        priced = leg or {
+            'direction': fill.direction,
+            'quantity': fill.quantity,
+            'fill_price': fill.fill_price,
+            'slippage': fill.slippage,
+            'execution_quality': fill.execution_quality,
+        }
+
+        self.fill_log.append({
+            'timestamp': fill.timestamp,
+            'order_id': fill.order_id,
+            'symbol': fill.symbol,
+            'order_type': order_type,
+            'direction': priced['direction'],
+            'quantity': priced['quantity'],
+            'bid_price': float(option_data['bid_price']),
+            'ask_price': float(option_data['ask_price']),
+            'mid_price': float(option_data['mid_price']),
+            'implied_vol': float(option_data['implied_vol']),
+            'hours_to_expiry': float(hours_to_expiry),
+            'fill_price': priced['fill_price'],
+            'slippage': priced['slippage'],
+            'execution_quality': priced['execution_quality'],
+        })
+
+    def execute_limit_order(self, order: OrderEvent) -> Optional[FillEvent]:
+        """
+        Execute a single-leg limit order, resting it if it does not cross.
+
+        A limit that crosses the current quote fills at once at the bid
+        or ask. Otherwise the order rests on the book until it crosses a
+        later snapshot (see match_resting_orders) or its time in force
+        ends: the session close for DAY, the contract's expiration for
+        GTC. IOC orders that do not cross are cancelled.
+
+        Args:
+            order: Limit order to execute
+
+        Returns:
+            FillEvent, or None if the order rests or is cancelled
+        """
+        if not order.strikes:
+            self.log.warning("No strikes specified in order {}", order.order_id)
+            return None
+        if order.limit_price is None:
+            self.log.warning("No limit price in order {}", order.order_id)
+            return None
+
+        time_in_force = order.time_in_force or 'DAY'
+        if time_in_force not in TIME_IN_FORCE:
+            raise ValueError(f"time_in_force must be one of {TIME_IN_FORCE}, got {time_in_force!r}")
+
+        option_data = self.find_option(order)
         if option_data is None:
             return None
 
-        # Check if limit price is within bid-ask
+        # Buy limit must be >= ask (sell limit <= bid) to fill immediately
         if order.direction == 'BUY':
-            # Buy limit must be >= ask to fill immediately
-            if order.limit_price >= option_data['ask_price']:
-                fill_price = option_data['ask_price']
-            else:
-                return None  # Order not filled
+            quote = float(option_data['ask_price'])
+            crosses = order.limit_price >= quote
         else:
-            # Sell limit must be <= bid to fill immediately
-            if order.limit_price <= option_data['bid_price']:
-                fill_price = option_data['bid_price']
-            else:
-                return None  # Order not filled
+            quote = float(option_data['bid_price'])
+            crosses = order.limit_price <= quote
+
+        if crosses:
+            return self._fill_limit_order(order, option_data, quote)
+
+        if time_in_force == 'IOC':
+            self.log.info("IOC order {} not filled, cancelled", order.order_id)
+            return None
+
+        expiration_ts = int(option_data['expiration_timestamp'])
+        expires_us = self.data.clock.close if time_in_force == 'DAY' else expiration_ts
+        self.book.add(order, expiration_ts, expires_us)
+
+        self.log.info("Resting {} {} {} @ ${:.2f} limit ({})",
+                      order.direction, order.quantity, order.symbol, order.limit_price, time_in_force)
+        return None
+
+    def match_resting_orders(self) -> List[FillEvent]:
+        """
+        Match the resting book against the current snapshot.
+
+        Orders whose time in force has ended are dropped first, then the
+        book is matched in one vectorized pass per underlying. Crossed
+        orders fill at their limit price; fills are put on the event queue.
+
+        Returns:
+            List of FillEvents
+        """
+        for order in self.book.remove_expired(self.data.clock.now):
+            self.log.info("Limit order {} expired unfilled", order.order_id)
+
+        fills = []
+        for symbol in self.book.working_symbols():
+            chain = self.data.get_options_chain(symbol, min_dte=0, max_dte=7)
+
+            for order_id, position in self.book.match(symbol, chain):
+                order = self.book.remove(order_id)
+                fill = self._fill_limit_order(order, chain.iloc[position], order.limit_price)
+                self.events.put(fill)
+                fills.append(fill)
+
+        return fills
+
+    def cancel_order(self, order_id: str) -> Optional[OrderEvent]:
+        """
+        Cancel a resting limit order.
+
+        Args:
+            order_id: Order to cancel
+
+        Returns:
+            The cancelled order, or None if it was not working
+        """
+        order = self.book.remove(order_id)
+        if order is not None:
+            self.log.info("Cancelled limit order {}", order_id)
+        return order
+
+    def cancel_all(self, symbol: Optional[str] = None) -> List[OrderEvent]:
+        """
+        Cancel every resting limit order (of one underlying).
+
+        Args:
+            symbol: Underlying to cancel (default: all)
+
+        Returns:
+            The cancelled orders
+        """
+        return self.book.remove_all(symbol)
+
+    def _fill_limit_order(self, order: OrderEvent, option_data, fill_price: float) -> FillEvent:
+        """Fill a limit order at fill_price (no slippage) and record it."""
+        current_timestamp = self.data.current_timestamp
+        hours_to_expiry = (int(option_data['expiration_timestamp']) - to_us(current_timestamp)) / US_PER_HOUR
 
         fill = create_fill_event(
             symbol=order.symbol,
             quantity=order.quantity,
             direction=order.direction,
-            fill_price=fill_price,
+            fill_price=float(fill_price),
             commission=self.commission * order.quantity,
-            timestamp=self.data.current_timestamp,
+            timestamp=current_timestamp,
             slippage=0,  # No slippage on limit orders
             order_id=order.order_id,
             strikes=order.strikes,
             option_types=order.option_types,
-            execution_quality='GOOD'
+            execution_quality='GOOD',
+            expirations=[int(option_data['expiration_timestamp'])],
+            greeks=quote_greeks(option_data)
         )
 
+        self.log.info("Executed limit {} {} @ ${:.2f}", order.direction, order.quantity, fill.fill_price)
+
+        self._record_fill(fill, option_data, hours_to_expiry, order_type='LIMIT')
+
         return fill
 
     def model_slippage(self, market_data: pd.Series, side: str,
@@ -212,9 +580,11 @@ class ExecutionHandler:
         Returns:
             (fill_price, slippage, execution_quality)
         """
-        mid_price = market_data['mid_price']
-        bid_price = market_data['bid_price']
-        ask_price = market_data['ask_price']
+        # float64 for the arithmetic even when the chain is compact (float32)
+        mid_price = float(market_data['mid_price'])
+        bid_price = float(market_data['bid_price'])
+        ask_price = float(market_data['ask_price'])
+        implied_vol = float(market_data['implied_vol'])
         spread = ask_price - bid_price
 
         # Base fill at bid/ask
@@ -238,9 +608,9 @@ class ExecutionHandler:
 
         # Component 3: IV-based slippage
         iv_slippage = 0
-        if market_data['implied_vol'] > self.iv_slippage_threshold:
+        if implied_vol > self.iv_slippage_threshold:
             # High IV increases slippage
-            iv_factor = market_data['implied_vol'] / self.iv_slippage_threshold
+            iv_factor = implied_vol / self.iv_slippage_threshold
             iv_slippage = 0.01 * mid_price * (iv_factor - 1)
 
         # Component 4: Wide spread penalty
@@ -286,6 +656,143 @@ class ExecutionHandler:
 
         return fill_price, total_slippage, quality
 
+    def model_slippage_batch(self, quotes, sides, time_to_expiry_hours, quantities,
+                             base_slippage_pct: Optional[float] = None,
+                             iv_slippage_threshold: Optional[float] = None) -> tuple:
+        """
+        Vectorized model_slippage for a batch of orders.
+
+        Same components and tiers as model_slippage, computed with array
+        operations instead of per-order Python branches.
+
+        Args:
+            quotes: DataFrame (or dict of arrays) with bid_price, ask_price,
+                mid_price and implied_vol per order
+            sides: Array of 'BUY' / 'SELL'
+            time_to_expiry_hours: Array of hours until expiration
+            quantities: Array of contract counts
+            base_slippage_pct: Override self.base_slippage_pct (stress tests)
+            iv_slippage_threshold: Override self.iv_slippage_threshold
+
+        Returns:
+            (fill_prices, slippages, qualities) arrays
+        """
+        if base_slippage_pct is None:
+            base_slippage_pct = self.base_slippage_pct
+        if iv_slippage_threshold is None:
+            iv_slippage_threshold = self.iv_slippage_threshold
+
+        bid_price = np.asarray(quotes['bid_price'], dtype=np.float64)
+        ask_price = np.asarray(quotes['ask_price'], dtype=np.float64)
+        mid_price = np.asarray(quotes['mid_price'], dtype=np.float64)
+        implied_vol = np.asarray(quotes['implied_vol'], dtype=np.float64)
+        hours = np.asarray(time_to_expiry_hours, dtype=np.float64)
+        quantity = np.asarray(quantities)
+        is_buy = np.asarray(sides) == 'BUY'
+
+        spread = ask_price - bid_price
+        base_fill = np.where(is_buy, ask_price, bid_price)
+
+        # Component 1: Base slippage
+        base_slippage = spread * base_slippage_pct
+
+        # Component 2: DTE-based slippage (exponential in final hour)
+        dte_slippage = np.where(
+            hours < 1, spread * 0.5 * np.exp(1 - np.minimum(hours, 1)),
+            np.where(hours < 4, spread * 0.2, 0.0)
+        )
+
+        # Component 3: IV-based slippage
+        iv_slippage = np.where(
+            implied_vol > iv_slippage_threshold,
+            0.01 * mid_price * (implied_vol / iv_slippage_threshold - 1), 0.0
+        )
+
+        # Component 4: Wide spread penalty
+        positive_mid = mid_price > 0
+        safe_mid = np.where(positive_mid, mid_price, 1.0)
+        spread_pct = np.where(positive_mid, spread / safe_mid, 0.0)
+        wide_spread_slippage = np.where(spread_pct > 0.20, spread * 0.1, 0.0)
+
+        # Component 5: Order size penalty
+        size_multiplier = np.select(
+            [quantity <= 10, quantity <= 50, quantity <= 100],
+            [0.25, 0.40, 0.60], default=0.80
+        )
+        size_slippage = spread * size_multiplier * 0.15
+
+        total_slippage = base_slippage + dte_slippage + iv_slippage + wide_spread_slippage + size_slippage
+
+        fill_price = np.where(is_buy, base_fill + total_slippage, base_fill - total_slippage)
+        fill_price = np.maximum(fill_price, 0.01)
+
+        slippage_pct = np.where(positive_mid, total_slippage / safe_mid, 0.0)
+        quality = np.select([slippage_pct < 0.05, slippage_pct < 0.15], ['GOOD', 'FAIR'], default='POOR')
+
+        return fill_price, total_slippage, quality
+
+    def get_fill_log(self) -> pd.DataFrame:
+        """
+        Get every fill with the quote it was priced from.
+
+        Returns:
+            DataFrame with one row per fill
+        """
+        return pd.DataFrame(self.fill_log)
+
+    def reprice_fills(self, fills: Optional[pd.DataFrame] = None,
+                      base_slippage_pct: Optional[float] = None,
+                      iv_slippage_threshold: Optional[float] = None) -> pd.DataFrame:
+        """
+        Re-price historical fills under different slippage parameters.
+
+        Lets stress tests ask "what if slippage were worse" without re-running
+        the simulation. Positions and signals are assumed unchanged. Limit
+        fills keep their price: single-leg ones traded at the limit, not
+        through the slippage model, and worse leg prices would break a
+        limit spread's net premium cap.
+
+        Args:
+            fills: Fill log (default: this handler's get_fill_log())
+            base_slippage_pct: Base slippage as a fraction of the spread
+            iv_slippage_threshold: IV above which extra slippage applies
+
+        Returns:
+            Fill log with repriced (False for limit fills),
+            repriced_fill_price, repriced_slippage, repriced_quality and
+            cost_delta (extra dollars paid, positive means worse for us)
+            columns
+        """
+        fills = self.get_fill_log() if fills is None else fills.copy()
+        if len(fills) == 0:
+            return fills
+
+        fill_prices, slippages, qualities = self.model_slippage_batch(
+            fills, fills['direction'].to_numpy(), fills['hours_to_expiry'].to_numpy(),
+            fills['quantity'].to_numpy(), base_slippage_pct, iv_slippage_threshold
+        )
+
+        # Fill logs from before order types were recorded hold market fills only
+        if 'order_type' in fills:
+            repriced = fills['order_type'].to_numpy() != 'LIMIT'
+        else:
+            repriced = np.ones(len(fills), dtype=bool)
+        if not repriced.all():
+            fill_prices = np.where(repriced, fill_prices, fills['fill_price'].to_numpy())
+            slippages = np.where(repriced, slippages, fills['slippage'].to_numpy())
+            qualities = np.where(repriced, qualities, fills['execution_quality'].to_numpy())
+
+        is_buy = fills['direction'].to_numpy() == 'BUY'
+        price_change = fill_prices - fills['fill_price'].to_numpy()
+
+        fills['repriced'] = repriced
+        fills['repriced_fill_price'] = fill_prices
+        fills['repriced_slippage'] = slippages
+        fills['repriced_quality'] = qualities
+        fills['cost_delta'] = np.where(is_buy, price_change, -price_change) * fills['quantity'] * 100
+
+        return fills
+
     def get_execution_stats(self) -> dict:
         """
         Get execution statistics (for analysis).
@@ -293,13 +800,24 @@ class ExecutionHandler:
         Returns:
             Dictionary with execution stats
         """
-        # TODO: Track execution stats over time
+        if len(self.fill_log) == 0:
+            return {
+                'total_orders': 0,
+                'avg_slippage': 0,
+                'good_fills': 0,
+                'fair_fills': 0,
+                'poor_fills': 0
+            }
+
+        fills = self.get_fill_log()
+        quality_counts = fills['execution_quality'].value_counts()
+
         return {
-            'total_orders': 0,
-            'avg_slippage': 0,
-            'good_fills': 0,
-            'fair_fills': 0,
-            'poor_fills': 0
+            'total_orders': len(fills),
+            'avg_slippage': float(fills['slippage'].mean()),
+            'good_fills': int(quality_counts.get('GOOD', 0)),
+            'fair_fills': int(quality_counts.get('FAIR', 0)),
+            'poor_fills': int(quality_counts.get('POOR', 0))
         }
 
 
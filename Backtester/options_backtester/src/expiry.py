@@ -0,0 +1,59 @@
+"""
+Option expiration queue.
+
+Open contracts are kept in a min-heap keyed by expiration (µs), so the
+event loop checks one heap top per tick and touches only contracts that
+are actually expiring. Contracts closed before expiry stay in the heap
+and are dropped when they surface (lazy deletion).
+
+Expired positions are settled at intrinsic value by Portfolio.expire():
+cash-settled options pay it out; an assignment or exercise of a
+physically settled option is modelled as delivery closed out at the
+underlying price at expiry, which books the same cash.
+"""
+
+import heapq
+from typing import List, Tuple
+
+
+class ExpiryQueue:
+    """Min-heap of (expiration_us, contract_id) for open contracts."""
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int]] = []
+        self._queued = set()  # Contract IDs currently in the heap
+
+    def schedule(self, contract_id: int, expiration_us: int):
+        """Queue a contract for expiry (no-op if already queued or undated)."""
+        if not expiration_us or contract_id in self._queued:
+            return
+        self._queued.add(contract_id)
+        heapq.heappush(self._heap, (expiration_us, contract_id))
+
+    def due(self, now_us: int) -> bool:
+        """True if some queued contract expires at or before now_us."""
+        return bool(self._heap) and self._heap[0][0] <= now_us
+
+    def pop_due(self, now_us: int) -> List[Tuple[int, int]]:
+        """
+        Remove and return every contract expiring at or before now_us.
+
+        Args:
+            now_us: Current time (µs)
+
+        Returns:
+            [(expiration_us, contract_id)] in expiration order
+        """
+        expired = []
+        while self._heap and self._heap[0][0] <= now_us:
+            expiration_us, contract_id = heapq.heappop(self._heap)
+            self._queued.discard(contract_id)
+            expired.append((expiration_us, contract_id))
+        return expired
+
+    def next_expiration(self):
+        """Earliest queued expiration (µs), or None."""
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._heap)
@@ -0,0 +1,199 @@
+"""
+Multi-strategy fan-out over a single market data pass.
+
+Comparing strategies or parameter sets with separate Backtests reads the
+same chains once per variant. MultiStrategyBacktest advances one shared
+DataHandler and feeds each MarketEvent to every variant, each with its
+own event queue, Strategy, Portfolio and ExecutionHandler, so N variants
+cost one data pass plus N strategy evaluations.
+
+The shared DataHandler loads the merged subscription of all variants.
+Each variant then sees exactly its own subscription, cut from the merged
+slice, so it trades as it would in a Backtest of its own. Variants whose
+subscription is the merged one share the same chain DataFrames, which
+must be treated as read-only.
+"""
+
+from typing import Dict, List, Optional, Tuple, Type
+
+from backtest import Backtest
+from data_handler import DataHandler
+from event_log import EventLogger, make_logger
+from events import EventType, MarketEvent
+from progress import ProgressReporter
+from strategy import Strategy
+from subscription import DataSubscription
+
+
+# Portfolio config keys passed through to each variant's Backtest
+BACKTEST_KEYS = ('initial_capital', 'commission', 'mark_pricing', 'greek_limits')
+
+# Portfolio config keys set on the variant's Portfolio (risk parameters)
+PORTFOLIO_KEYS = ('max_position_size', 'max_total_exposure')
+
+
+class MultiStrategyBacktest:
+    """
+    Runs several strategy variants side by side on one data pass.
+
+    Each variant is a (strategy_class, params, portfolio_config) tuple:
+    params are keyword arguments for the strategy, portfolio_config may
+    set initial_capital, commission, mark_pricing, greek_limits,
+    max_position_size and max_total_exposure.
+    """
+
+    def __init__(
+        self,
+        symbols: list,
+        start_date: str,
+        end_date: str,
+        variants: List[Tuple[Type[Strategy], Optional[dict], Optional[dict]]],
+        db_connection,
+        initial_capital: float = 100000,
+        progress: Optional[ProgressReporter] = None,
+        quiet: bool = False,
+        log_level: str = 'info',
+        logger: Optional[EventLogger] = None,
+        names: Optional[List[str]] = None
+    ):
+        """
+        Initialize the shared data handler and one Backtest per variant.
+
+        Args:
+            symbols: List of underlying symbols to trade
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            variants: List of (strategy_class, params, portfolio_config)
+            db_connection: Database connection
+            initial_capital: Default starting capital for each variant
+            progress: Structured progress channel
+            quiet: Disable per-event logging
+            log_level: Minimum event log level
+            logger: Event logger shared by all variants
+            names: Result key per variant (default: strategy class name,
+                numbered when several variants use the same class)
+        """
+        if not variants:
+            raise ValueError("MultiStrategyBacktest needs at least one variant")
+        if names is not None and len(names) != len(variants):
+            raise ValueError(f"Got {len(names)} names for {len(variants)} variants")
+
+        self.progress = progress
+        self.log = logger or make_logger(quiet, log_level)
+        self.data = DataHandler(db_connection, start_date, end_date, symbols)
+        print(f"Shared DataHandler: {start_date} to {end_date}, {len(symbols)} symbols")
+
+        self.names = names or self._default_names(variants)
+        self.backtests: Dict[str, Backtest] = {}
+
+        for name, (strategy_class, params, portfolio_config) in zip(self.names, variants):
+            portfolio_config = dict(portfolio_config or {})
+            unknown = set(portfolio_config) - set(BACKTEST_KEYS) - set(PORTFOLIO_KEYS)
+            if unknown:
+                raise ValueError(f"Unknown portfolio config {sorted(unknown)} for variant {name}")
+
+            settings = {'initial_capital': initial_capital}
+            settings.update((key, portfolio_config[key]) for key in BACKTEST_KEYS if key in portfolio_config)
+
+            backtest = Backtest(
+                symbols=symbols,
+                start_date=start_date,
+                end_date=end_date,
+                strategy_class=strategy_class,
+                db_connection=db_connection,
+                enable_checkpoints=False,
+                logger=self.log,
+                strategy_params=params,
+                data_handler=self.data,
+                **settings
+            )
+            for key in PORTFOLIO_KEYS:
+                if key in portfolio_config:
+                    setattr(backtest.portfolio, key, portfolio_config[key])
+
+            self.backtests[name] = backtest
+
+        # One chain slice covering every variant's subscription
+        merged = DataSubscription.merge(bt.strategy.subscription for bt in self.backtests.values())
+        self.data.subscribe(merged)
+
+        # Subscription to cut each variant's slice with (None = the merged slice as is)
+        self.slices: Dict[str, Optional[DataSubscription]] = {
+            name: None if backtest.strategy.subscription == merged
+            else backtest.strategy.subscription or DataSubscription()
+            for name, backtest in self.backtests.items()
+        }
+
+    @staticmethod
+    def _default_names(variants) -> List[str]:
+        classes = [variant[0].__name__ for variant in variants]
+        return [
+            name if classes.count(name) == 1 else f"{name}_{classes[:i].count(name) + 1}"
+            for i, name in enumerate(classes)
+        ]
+
+    def variant_event(self, market_event: MarketEvent, subscription: DataSubscription) -> MarketEvent:
+        """
+        MarketEvent restricted to one variant's subscription.
+
+        Args:
+            market_event: Event carrying the merged slice
+            subscription: The variant's subscription
+
+        Returns:
+            MarketEvent with the same timestamp and the variant's chains
+        """
+        now = self.data.clock.now
+        return MarketEvent(
+            type=EventType.MARKET,
+            timestamp=market_event.timestamp,
+            data={symbol: subscription.apply(chain, now) for symbol, chain in market_event.data.items()}
+        )
+
+    def run(self) -> Dict[str, dict]:
+        """
+        Advance the data once per tick and step every variant.
+
+        Returns:
+            {variant name: results as returned by Backtest.run}
+        """
+        print("\n" + "="*60)
+        print(f"STARTING MULTI-STRATEGY BACKTEST ({len(self.backtests)} variants)")
+        print("="*60)
+
+        backtests = list(self.backtests.values())
+        slices = [self.slices[name] for name in self.backtests]
+        total_iterations = len(self.data.get_all_timestamps())
+
+        progress = self.progress
+        if progress is not None:
+            progress.start(total_iterations)
+
+        iteration = 0
+        while self.data.continue_backtest:
+            # 1. Update market data once for all variants
+            market_event = self.data.update_bars()
+
+            if market_event is None:
+                break
+            iteration += 1
+
+            for backtest, subscription in zip(backtests, slices):
+                if subscription is None:
+                    backtest.process_tick(market_event)
+                else:
+                    backtest.process_tick(self.variant_event(market_event, subscription))
+
+            if progress is not None:
+                progress.update(iteration, sum(len(bt.portfolio.trades) for bt in backtests),
+                                timestamp=self.data.current_timestamp)
+
+        if progress is not None:
+            progress.finish(iteration, sum(len(bt.portfolio.trades) for bt in backtests))
+
+        results = {}
+        for name, backtest in self.backtests.items():
+            print(f"\nVariant: {name}")
+            results[name] = backtest.generate_results()
+
+        return results
@@ -0,0 +1,169 @@
+"""
+Resting limit-order book.
+
+Working single-leg limit orders live in parallel NumPy arrays, keyed by
+packed contract ID (see positions.py) and limit price. Each tick the
+whole book is matched against the new chain snapshot in one vectorized
+pass: one hash join of the resting orders' contract IDs against the
+snapshot's, then one price comparison. The cost is linear in resting
+orders plus chain rows, never their product.
+
+Time in force:
+    'DAY'  Works until the session close (default)
+    'GTC'  Works until cancelled or the contract expires
+    'IOC'  Fills on submission or is cancelled (never rests)
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from events import OrderEvent
+from positions import SymbolTable, encode_contracts, latest_quotes
+
+
+TIME_IN_FORCE = ('DAY', 'GTC', 'IOC')
+
+
+class LimitOrderBook:
+    """
+    Working limit orders indexed by contract ID and limit price.
+
+    Rows of cancelled or filled orders are recycled.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize an empty book.
+
+        Args:
+            capacity: Initial number of rows (grows by doubling)
+        """
+        self.symbols = SymbolTable()
+        self.orders: Dict[str, OrderEvent] = {}  # order_id -> working order
+        self._rows: Dict[str, int] = {}  # order_id -> row
+        self._order_ids: List[Optional[str]] = [None] * capacity  # row -> order_id
+        self._free: List[int] = []
+        self._size = 0
+
+        self.contract_id = np.zeros(capacity, dtype=np.int64)
+        self.is_buy = np.zeros(capacity, dtype=bool)
+        self.limit_price = np.zeros(capacity, dtype=np.float64)
+        self.expires_us = np.zeros(capacity, dtype=np.int64)  # Time in force ends
+        self.active = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        capacity = len(self.contract_id) * 2
+        for name in ('contract_id', 'is_buy', 'limit_price', 'expires_us', 'active'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self._order_ids.extend([None] * (capacity - len(self._order_ids)))
+
+    def __len__(self):
+        """Number of working orders."""
+        return len(self.orders)
+
+    def contract_key(self, symbol: str, strike: float, option_type: str, expiration_ts: int) -> int:
+        """Contract ID of an order's contract."""
+        return int(encode_contracts(self.symbols.code(symbol), expiration_ts, strike, option_type))
+
+    def add(self, order: OrderEvent, expiration_ts: int, expires_us: int):
+        """
+        Rest a limit order.
+
+        Args:
+            order: Single-leg LIMIT order
+            expiration_ts: Contract expiration (µs), resolved from the chain
+            expires_us: When the order's time in force ends (µs)
+        """
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._size == len(self.contract_id):
+                self._grow()
+            row = self._size
+            self._size += 1
+
+        option_type = order.option_types[0] if order.option_types else 'P'
+        self.contract_id[row] = self.contract_key(order.symbol, order.strikes[0], option_type, expiration_ts)
+        self.is_buy[row] = order.direction == 'BUY'
+        self.limit_price[row] = order.limit_price
+        self.expires_us[row] = expires_us
+        self.active[row] = True
+
+        self.orders[order.order_id] = order
+        self._rows[order.order_id] = row
+        self._order_ids[row] = order.order_id
+
+    def remove(self, order_id: str) -> Optional[OrderEvent]:
+        """
+        Take an order off the book (cancel or fill).
+
+        Returns:
+            The order, or None if it was not working
+        """
+        row = self._rows.pop(order_id, None)
+        if row is None:
+            return None
+
+        self.active[row] = False
+        self._order_ids[row] = None
+        self._free.append(row)
+        return self.orders.pop(order_id)
+
+    def remove_all(self, symbol: Optional[str] = None) -> List[OrderEvent]:
+        """Take every order (of one underlying) off the book."""
+        order_ids = [order_id for order_id, order in self.orders.items()
+                     if symbol is None or order.symbol == symbol]
+        return [self.remove(order_id) for order_id in order_ids]
+
+    def remove_expired(self, now_us: int) -> List[OrderEvent]:
+        """Take off every order whose time in force ended at or before now_us."""
+        rows = np.flatnonzero(self.active[:self._size] & (self.expires_us[:self._size] <= now_us))
+        return [self.remove(self._order_ids[row]) for row in rows]
+
+    def working_symbols(self) -> List[str]:
+        """Underlyings with working orders."""
+        return list(dict.fromkeys(order.symbol for order in self.orders.values()))
+
+    def chain_ids(self, symbol: str, chain: pd.DataFrame) -> np.ndarray:
+        """Contract IDs for every row of a chain (see PositionTable.chain_ids)."""
+        return encode_contracts(self.symbols.code(symbol), chain['expiration_timestamp'].to_numpy(),
+                                chain['strike'].to_numpy(), chain['option_type'].to_numpy())
+
+    def match(self, symbol: str, chain: pd.DataFrame) -> List[Tuple[str, int]]:
+        """
+        Working orders the snapshot crosses, in one vectorized pass.
+
+        Uses the latest quote per contract. A buy crosses when
+        ask <= limit, a sell when bid >= limit. Orders stay on the book
+        until remove() is called.
+
+        Args:
+            symbol: Underlying symbol of the chain
+            chain: Options chain snapshot
+
+        Returns:
+            [(order_id, chain row position)] for every crossed order
+        """
+        rows = np.flatnonzero(self.active[:self._size])
+        if len(rows) == 0 or len(chain) == 0:
+            return []
+
+        # Row position of the latest quote per contract
+        ids = self.chain_ids(symbol, chain)
+        latest = latest_quotes(chain, ids)
+
+        found = pd.Index(ids[latest]).get_indexer(self.contract_id[rows])
+        quoted = found >= 0
+        rows, found = rows[quoted], latest[found[quoted]]
+
+        limit = self.limit_price[rows]
+        bid = chain['bid_price'].to_numpy(dtype=np.float64)[found]
+        ask = chain['ask_price'].to_numpy(dtype=np.float64)[found]
+        crossed = np.where(self.is_buy[rows], ask <= limit, bid >= limit)
+
+        return [(self._order_ids[row], int(position)) for row, position in zip(rows[crossed], found[crossed])]
@@ -12,7 +12,6 @@ All patterns must be statistically validated.
 
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
 from typing import Dict, List, Optional
 
 
@@ -223,7 +222,8 @@ class PatternDiscovery:
             print("ERROR: No data available for clustering")
             return pd.DataFrame()
 
-        # Perform k-means clustering
+        # Perform k-means clustering (sklearn deferred until first use)
+        from sklearn.cluster import KMeans
         kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
         features_df['regime'] = kmeans.fit_predict(features_df)
 
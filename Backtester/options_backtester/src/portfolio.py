@@ -4,15 +4,25 @@ Portfolio management with proper cash tracking and T+1 settlement.
 Handles:
 - Position tracking
 - Cash settlement (T+1)
+- Expiration at intrinsic value (see expiry.py)
 - Position sizing
 - Risk management
 - Converting signals to orders
 """
 
+from bisect import insort
 from queue import Queue
-from events import SignalEvent, OrderEvent, FillEvent, EventType, create_order_event
+from events import (SignalEvent, OrderEvent, FillEvent, EventType, create_fill_event, create_order_event,
+                    create_spread_order)
+from event_log import EventLogger
+from positions import PositionTable, GREEKS
+from expiry import ExpiryQueue
+from risk import GreeksBook
+from clock import from_us, to_us
+from trading_calendar import TradingCalendar
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import uuid
 
 
@@ -27,22 +37,35 @@ class Portfolio:
     - Kelly criterion for position sizing
     """
 
-    def __init__(self, events_queue: Queue, initial_capital: float = 100000):
+    def __init__(self, events_queue: Queue, initial_capital: float = 100000,
+                 logger: Optional[EventLogger] = None,
+                 greek_limits: Optional[Dict[str, float]] = None,
+                 calendar: Optional[TradingCalendar] = None):
         """
         Initialize portfolio.
 
         Args:
             events_queue: Queue for putting order events
             initial_capital: Starting capital
+            logger: Event logger (default: print to stdout)
+            greek_limits: Max absolute net Greeks per underlying, e.g.
+                {'delta': 500, 'vega': 2000} (default: no limits)
+            calendar: Trading calendar for T+1 settlement dates (default:
+                NYSE sessions, computed on demand)
         """
         self.events = events_queue
+        self.calendar = calendar or TradingCalendar()
+        self.log = logger or EventLogger()
         self.initial_capital = initial_capital
         self.settled_cash = initial_capital  # Cash available for trading
         self.unsettled_cash = 0  # Cash pending settlement
-        self.positions = {}  # {symbol: {quantity, avg_cost, realized_pnl}}
-        self.pending_settlements = []  # List of pending cash settlements
+        self.positions = PositionTable()  # Per contract, keyed by packed contract ID
+        self.greeks = GreeksBook(self.positions.symbols, greek_limits)  # Net Greeks per underlying
+        self.expiries = ExpiryQueue()  # Open contracts by expiration
+        self.pending_settlements = []  # Pending cash settlements, in settlement order
         self.all_holdings = []  # Historical holdings
         self.trades = []  # All executed trades
+        self.cash_bounds = (-np.inf, np.inf)  # Settled cash range that leaves every sizing decision unchanged
 
         # Risk parameters
         self.max_position_size = 0.05  # Max 5% of capital per position
@@ -55,90 +78,141 @@ class Portfolio:
         Args:
             signal_event: Signal from strategy
         """
-        # Calculate position size
-        position_size = self.calculate_position_size(signal_event)
+        # Calculate position size (same size for any settled cash in cash_range)
+        position_size, cash_range = self.calculate_position_size(signal_event)
+        self._bound_cash(*cash_range)
 
         if position_size == 0:
-            print(f"Position size is 0 for {signal_event.symbol}, skipping")
+            self.log.info("Position size is 0 for {}, skipping", signal_event.symbol)
             return
 
         # Check if we have enough capital
         estimated_cost = self.estimate_trade_cost(signal_event, position_size)
 
         if estimated_cost > self.settled_cash:
-            print(f"Insufficient settled cash for {signal_event.symbol}")
-            print(f"  Need: ${estimated_cost:,.2f}, Have: ${self.settled_cash:,.2f}")
+            self._bound_cash(-np.inf, estimated_cost)
+            self.log.warning("Insufficient settled cash for {}\n  Need: ${:,.2f}, Have: ${:,.2f}",
+                             signal_event.symbol, estimated_cost, self.settled_cash)
+            return
+        self._bound_cash(estimated_cost)
+
+        # Check Greek limits (exits only ever reduce risk)
+        if signal_event.signal_type != 'EXIT':
+            breach = self.check_greek_limits(signal_event, position_size)
+            if breach:
+                self.log.warning("Greek limit for {}: {}, skipping", signal_event.symbol, breach)
+                return
+
+        # Generate order (strategies may set the ID to cancel a limit order by)
+        metadata = signal_event.metadata or {}
+        order_id = metadata.get('order_id') or str(uuid.uuid4())
+        direction = 'BUY' if signal_event.signal_type == 'LONG' else 'SELL'
+
+        if signal_event.metadata and signal_event.metadata.get('legs'):
+            # Multi-leg: legs carry their own directions
+            if signal_event.signal_type == 'EXIT' and not self._holds_legs(signal_event):
+                self.log.info("No open legs to exit for {}, skipping", signal_event.symbol)
+                return
+
+            order = create_spread_order(
+                symbol=signal_event.symbol,
+                legs=signal_event.metadata['legs'],
+                quantity=position_size,
+                direction=direction,
+                order_id=order_id
+            )
+            self.events.put(order)
+
+            self.log.info("Generated {}-leg order for {} spreads of {}",
+                          len(order.strikes), position_size, order.symbol)
             return
 
-        # Generate order
-        order_id = str(uuid.uuid4())
-
+        # Market order unless the strategy asks for a limit; the expiration
+        # pins the exact contract (the same strike is listed in every expiry)
+        limit_price = metadata.get('limit_price')
+        expiration_ts = metadata.get('expiration_ts')
+        option_type = metadata.get('option_type', 'P')
+
+        if signal_event.signal_type == 'EXIT':
+            # Close the held contract: buy back a short, sell a long, never flip
+            held = self.positions.get(self.positions.key(
+                signal_event.symbol, signal_event.strikes[0], option_type, expiration_ts))
+            if not held or held['quantity'] == 0:
+                self.log.info("No open position to exit for {}, skipping", signal_event.symbol)
+                return
+            direction = 'BUY' if held['quantity'] < 0 else 'SELL'
+            position_size = min(position_size, abs(held['quantity']))
         order = create_order_event(
             symbol=signal_event.symbol,
-            order_type='MARKET',  # Use market orders for now
+            order_type='MARKET' if limit_price is None else 'LIMIT',
             quantity=position_size,
-            direction='BUY' if signal_event.signal_type == 'LONG' else 'SELL',
+            direction=direction,
             strikes=signal_event.strikes,
-            option_types=[signal_event.metadata.get('option_type', 'P')]
-                         if signal_event.metadata else ['P'],
-            order_id=order_id
+            option_types=[option_type],
+            limit_price=limit_price,
+            order_id=order_id,
+            expirations=[int(expiration_ts) if expiration_ts is not None else None],
+            time_in_force=metadata.get('time_in_force')
         )
 
         self.events.put(order)
 
-        print(f"Generated {order.direction} order for {position_size} contracts of {order.symbol}")
+        self.log.info("Generated {} order for {} contracts of {}",
+                      order.direction, position_size, order.symbol)
 
     def update_fill(self, fill_event: FillEvent):
         """
-        Update positions and track settlement (T+1).
+        Update contract positions and track settlement (T+1).
+
+        Single-leg fills update one contract; multi-leg fills update each
+        leg as its own contract and book the net premium.
 
         Args:
             fill_event: Fill event from execution
         """
         symbol = fill_event.symbol
+        legs = fill_event.legs or [{
+            'strike': fill_event.strikes[0],
+            'option_type': fill_event.option_types[0] if fill_event.option_types else 'P',
+            'expiration_ts': fill_event.expirations[0] if fill_event.expirations else None,
+            'direction': fill_event.direction,
+            'quantity': fill_event.quantity,
+            'fill_price': fill_event.fill_price
+        }]
+
+        for leg in legs:
+            signed_qty = leg['quantity'] if leg['direction'] == 'BUY' else -leg['quantity']
+            contract_id = self.positions.key(symbol, leg['strike'], leg['option_type'], leg['expiration_ts'])
+
+            row = self.positions.row(contract_id)
+            before = self.positions.position_greeks(row) if row is not None else 0.0
 
-        # Update position
-        if symbol not in self.positions:
-            self.positions[symbol] = {
-                'quantity': 0,
-                'avg_cost': 0.0,
-                'realized_pnl': 0.0,
-                'total_cost': 0.0
-            }
+            self.positions.apply_fill(symbol, leg['strike'], leg['option_type'], leg['expiration_ts'],
+                                      signed_qty, leg['fill_price'],
+                                      leg.get('greeks', fill_event.greeks))
 
-        position = self.positions[symbol]
+            # Incremental Greeks update for this contract only
+            row = self.positions.row(contract_id)
+            self.greeks.add(symbol, self.positions.position_greeks(row) - before)
+
+            if self.positions.quantity[row] != 0:
+                self.expiries.schedule(contract_id, leg['expiration_ts'])
 
-        # Calculate cash impact
         # Options are priced per share, multiplied by 100 shares per contract
-        if fill_event.direction == 'BUY':
-            cash_impact = -(fill_event.fill_price * fill_event.quantity * 100 +
-                          fill_event.commission)
-            position['quantity'] += fill_event.quantity
-
-            # Update average cost
-            new_total_cost = position['total_cost'] + abs(cash_impact)
-            position['avg_cost'] = new_total_cost / position['quantity']
-            position['total_cost'] = new_total_cost
-
-        else:  # SELL
-            cash_impact = (fill_event.fill_price * fill_event.quantity * 100 -
-                         fill_event.commission)
-            position['quantity'] -= fill_event.quantity
-
-            # Calculate realized P&L for closed portion
-            if position['quantity'] >= 0:
-                realized_pnl = cash_impact - (fill_event.quantity * position['avg_cost'] * 100)
-                position['realized_pnl'] += realized_pnl
+        cash_impact = -fill_event.get_cost()
 
         # Track unsettled cash (settles T+1)
         self.unsettled_cash += cash_impact
-        settlement_date = fill_event.timestamp + pd.Timedelta(days=1)
+        # Open of the next session (kept in settlement order; fills mostly append)
+        settlement_us = self.calendar.settlement_time(to_us(fill_event.timestamp))
+        settlement_date = from_us(settlement_us)
 
-        self.pending_settlements.append({
+        insort(self.pending_settlements, {
             'amount': cash_impact,
             'settlement_date': settlement_date,
+            'settlement_us': settlement_us,
             'fill_event': fill_event
-        })
+        }, key=lambda settlement: settlement['settlement_us'])
 
         # Record trade
         self.trades.append({
@@ -149,44 +223,172 @@ class Portfolio:
             'fill_price': fill_event.fill_price,
             'commission': fill_event.commission,
             'slippage': fill_event.slippage,
-            'cash_impact': cash_impact
+            'cash_impact': cash_impact,
+            'legs': len(legs)
         })
 
-        print(f"Position updated: {symbol} {position['quantity']} contracts")
-        print(f"  Cash impact: ${cash_impact:,.2f} (settles {settlement_date.date()})")
+        self.log.info("Position updated: {} {} leg(s), {} open contracts\n  Cash impact: ${:,.2f} (settles {:%Y-%m-%d})",
+                      symbol, len(legs), len(self.positions), cash_impact, settlement_date)
 
-    def process_settlements(self, current_date: pd.Timestamp):
+    def expire(self, contract_id: int, underlying_price: float,
+               timestamp: pd.Timestamp) -> Optional[FillEvent]:
         """
-        Move unsettled cash to settled on T+1.
+        Settle an expired contract at intrinsic value.
+
+        The position is closed with a zero-commission fill at
+        max(S - K, 0) for calls and max(K - S, 0) for puts, so cash, T+1
+        settlement, realized P&L and the Greeks book update as for any
+        other fill. Out-of-the-money contracts expire at 0.
 
         Args:
-            current_date: Current backtest date
+            contract_id: Packed contract ID
+            underlying_price: Underlying price at expiration
+            timestamp: Expiration time
+
+        Returns:
+            The settlement FillEvent, or None if the position was already flat
         """
-        settlements_processed = 0
+        row = self.positions.row(contract_id)
+        if row is None or self.positions.quantity[row] == 0:
+            return None
+
+        quantity = int(self.positions.quantity[row])
+        symbol = self.positions.symbols.symbol(int(self.positions.underlying[row]))
+        strike = float(self.positions.strike[row])
+        option_type = 'C' if self.positions.is_call[row] else 'P'
+
+        intrinsic = max(underlying_price - strike, 0.0) if option_type == 'C' else max(strike - underlying_price, 0.0)
+        if intrinsic == 0:
+            outcome = 'EXPIRED'
+        else:
+            outcome = 'EXERCISED' if quantity > 0 else 'ASSIGNED'
+
+        fill = create_fill_event(
+            symbol=symbol,
+            quantity=abs(quantity),
+            direction='SELL' if quantity > 0 else 'BUY',
+            fill_price=intrinsic,
+            commission=0.0,
+            timestamp=timestamp,
+            strikes=[strike],
+            option_types=[option_type],
+            expirations=[int(self.positions.expiration_ts[row])],
+            execution_quality=outcome,
+            greeks={greek: 0.0 for greek in GREEKS}
+        )
 
-        for settlement in self.pending_settlements[:]:
-            if settlement['settlement_date'] <= current_date:
-                self.settled_cash += settlement['amount']
-                self.unsettled_cash -= settlement['amount']
-                self.pending_settlements.remove(settlement)
-                settlements_processed += 1
+        self.log.info("{}: {} {:%Y-%m-%d} {:g}{} x{} at intrinsic ${:.2f} (underlying ${:.2f})",
+                      outcome, symbol, timestamp, strike, option_type, quantity, intrinsic, underlying_price)
+        self.update_fill(fill)
+
+        return fill
+
+    def check_greek_limits(self, signal_event: SignalEvent, quantity: int) -> Optional[str]:
+        """
+        Check a signal against the Greek limits without rescanning the book.
+
+        Uses the per-contract Greeks the strategy put in the signal metadata
+        ('greeks', or per-leg 'greeks' for multi-leg signals; 'delta' alone
+        is enough for a delta limit).
+
+        Args:
+            signal_event: Signal to check
+            quantity: Contracts (or spreads) the order would trade
+
+        Returns:
+            Description of the breach, or None if within limits (or unknown)
+        """
+        if not self.greeks.limits:
+            return None
+
+        impact = self._signal_greeks(signal_event)
+        if impact is None:
+            return None
+
+        return self.greeks.check(signal_event.symbol, impact * quantity * 100)
+
+    @staticmethod
+    def _signal_greeks(signal_event: SignalEvent) -> Optional[np.ndarray]:
+        """Greeks of one unit of a signal's position, signed, in GREEKS order."""
+        metadata = signal_event.metadata or {}
+
+        def unit(greeks: dict) -> np.ndarray:
+            return np.array([greeks.get(greek, 0.0) for greek in GREEKS])
+
+        if metadata.get('legs'):
+            total = np.zeros(len(GREEKS))
+            for leg in metadata['legs']:
+                if not leg.get('greeks'):
+                    return None
+                sign = 1 if leg['direction'] == 'BUY' else -1
+                total += sign * leg.get('ratio', 1) * unit(leg['greeks'])
+            return total
+
+        sign = 1 if signal_event.signal_type == 'LONG' else -1
+        if metadata.get('greeks'):
+            return sign * unit(metadata['greeks'])
+        if metadata.get('delta') is not None:
+            return sign * unit({'delta': metadata['delta']})
+
+        return None
+
+    def _bound_cash(self, low: float, high: float = np.inf):
+        """Narrow cash_bounds to [low, high)."""
+        self.cash_bounds = (max(self.cash_bounds[0], low), min(self.cash_bounds[1], high))
+
+    def _holds_legs(self, signal_event: SignalEvent) -> bool:
+        """True if any leg of a multi-leg signal is an open position."""
+        for leg in signal_event.metadata['legs']:
+            position = self.positions.get(self.positions.key(
+                signal_event.symbol, leg['strike'], leg['option_type'], leg.get('expiration_ts')
+            ))
+            if position and position['quantity'] != 0:
+                return True
+        return False
+
+    def process_settlements(self, current_date):
+        """
+        Move unsettled cash to settled on T+1 (the next session's open).
+
+        Pending settlements are in settlement order, so only the due
+        prefix of the list is looked at.
+
+        Args:
+            current_date: Current backtest time (pd.Timestamp or µs)
+        """
+        pending = self.pending_settlements
+        if not pending:
+            return
+
+        now = to_us(current_date)
+        settlements_processed = 0
+        while settlements_processed < len(pending) and pending[settlements_processed]['settlement_us'] <= now:
+            self.settled_cash += pending[settlements_processed]['amount']
+            self.unsettled_cash -= pending[settlements_processed]['amount']
+            settlements_processed += 1
 
         if settlements_processed > 0:
-            print(f"Processed {settlements_processed} settlements on {current_date.date()}")
-            print(f"  Settled cash: ${self.settled_cash:,.2f}")
+            del pending[:settlements_processed]
+            self.log.info("Processed {} settlements on {:%Y-%m-%d}\n  Settled cash: ${:,.2f}",
+                          settlements_processed, from_us(now), self.settled_cash)
 
-    def calculate_position_size(self, signal: SignalEvent) -> int:
+    def calculate_position_size(self, signal: SignalEvent) -> Tuple[int, Tuple[float, float]]:
         """
         Calculate position size using risk-based sizing.
 
         For now, uses simple fixed sizing.
         TODO: Implement Kelly criterion.
 
+        The settled cash range is derived here, next to the formula, so
+        any sizing change keeps it exact: day-sharded runs reuse a
+        session only if its start cash gives every signal the same size.
+
         Args:
             signal: Signal event
 
         Returns:
-            Number of contracts
+            (contracts, (low, high)): the size, and the settled cash range
+            [low, high) in which it would be the same
         """
         # Simple: 1 contract for now
         # In production, calculate based on:
@@ -195,12 +397,23 @@ class Portfolio:
         # - Risk per trade
         # - Signal strength
 
-        base_size = int(signal.strength)  # Use signal strength
+        wanted = min(int(signal.strength), 10)  # Signal strength, capped at 10 contracts for safety
 
         # Cap at maximum position size
+        cash_per_contract = 1000 / self.max_position_size
         max_contracts = int(self.settled_cash * self.max_position_size / 1000)
 
-        return min(base_size, max_contracts, 10)  # Cap at 10 contracts for safety
+        contracts = min(wanted, max_contracts)
+
+        if contracts < wanted:
+            # Cash cap binds: same size until the next contract is affordable
+            cash_range = (contracts * cash_per_contract, (contracts + 1) * cash_per_contract)
+        elif wanted > 0:
+            cash_range = (wanted * cash_per_contract, np.inf)
+        else:
+            cash_range = (-np.inf, np.inf)
+
+        return contracts, cash_range
 
     def estimate_trade_cost(self, signal: SignalEvent, quantity: int) -> float:
         """
@@ -225,50 +438,83 @@ class Portfolio:
 
         return cost
 
-    def get_total_value(self, current_prices: Dict[str, float] = None) -> float:
+    def get_total_value(self, chains: Optional[Dict[str, pd.DataFrame]] = None,
+                        pricing: str = 'mid') -> float:
         """
         Calculate total portfolio value.
 
+        Open contracts are marked against the chains in one vectorized
+        gather; contracts without a quote keep their last mark.
+
         Args:
-            current_prices: Dict of {symbol: current_price}
+            chains: Dict of {symbol: current options chain}
+            pricing: 'mid', or 'conservative' (longs at bid, shorts at ask)
 
         Returns:
             Total portfolio value
         """
         total = self.settled_cash + self.unsettled_cash
 
-        # Add market value of positions
-        if current_prices:
-            for symbol, position in self.positions.items():
-                if position['quantity'] != 0 and symbol in current_prices:
-                    market_value = position['quantity'] * current_prices[symbol] * 100
-                    total += market_value
+        # Add market value of positions (shorts are negative)
+        total += self.positions.market_value(chains, pricing)
 
         return total
 
+    def mark_to_market(self, chains: Dict[str, pd.DataFrame], pricing: str = 'mid') -> dict:
+        """
+        Value the whole book against one chain snapshot.
+
+        Args:
+            chains: Dict of {symbol: current options chain}
+            pricing: 'mid', or 'conservative' (longs at bid, shorts at ask)
+
+        Returns:
+            Dict with total_value, market_value, unrealized_pnl,
+            realized_pnl, num_positions and aggregate delta, gamma,
+            theta and vega
+        """
+        market_value = self.positions.market_value(chains, pricing)
+        self.greeks.rebuild(self.positions)
+
+        summary = {
+            'total_value': self.settled_cash + self.unsettled_cash + market_value,
+            'market_value': market_value,
+            'unrealized_pnl': float(self.positions.unrealized_pnl().sum()),
+            'realized_pnl': self.positions.total_realized_pnl(),
+            'num_positions': len(self.positions),
+        }
+        summary.update(self.greeks.totals())
+
+        return summary
+
     def get_positions_summary(self) -> pd.DataFrame:
         """
         Get summary of current positions.
 
         Returns:
-            DataFrame with position details
+            DataFrame with one row per open contract
         """
-        positions_list = []
-
-        for symbol, pos in self.positions.items():
-            if pos['quantity'] != 0:
-                positions_list.append({
-                    'symbol': symbol,
-                    'quantity': pos['quantity'],
-                    'avg_cost': pos['avg_cost'],
-                    'total_cost': pos['total_cost'],
-                    'realized_pnl': pos['realized_pnl']
-                })
-
-        if len(positions_list) == 0:
+        positions = self.positions.open_positions()
+
+        if len(positions) == 0:
             return pd.DataFrame()
 
-        return pd.DataFrame(positions_list)
+        positions['avg_cost'] = positions['avg_price'] * 100
+        positions['total_cost'] = positions['avg_cost'] * positions['quantity']
+
+        return positions
+
+    def get_greeks_exposure(self, symbol: Optional[str] = None) -> Dict[str, float]:
+        """
+        Net position Greeks.
+
+        Args:
+            symbol: Underlying (default: summed over all underlyings)
+
+        Returns:
+            Dict of delta, gamma, theta and vega
+        """
+        return self.greeks.get(symbol) if symbol else self.greeks.totals()
 
     def get_trades_summary(self) -> pd.DataFrame:
         """
@@ -291,9 +537,8 @@ class Portfolio:
         """
         total_exposure = 0
 
-        for symbol, pos in self.positions.items():
-            if pos['quantity'] != 0:
-                total_exposure += abs(pos['total_cost'])
+        rows = self.positions.open_rows()
+        total_exposure += float(np.abs(self.positions.avg_price[rows] * self.positions.quantity[rows]).sum()) * 100
 
         return total_exposure / self.initial_capital
 
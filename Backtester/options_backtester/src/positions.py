@@ -0,0 +1,407 @@
+"""
+Contract-level position book.
+
+Every option contract gets a compact int64 ID packed from its underlying,
+expiration, strike and right. Positions live in parallel NumPy arrays
+indexed by a dense row number, so marking the whole book against a chain
+is one vectorized gather instead of a Python loop per position.
+
+ID layout (high to low bits):
+    underlying code  10 bits  (index into a SymbolTable, up to 1024 symbols)
+    expiration       25 bits  (minutes since 2000-01-01 UTC, to ~2063)
+    strike           27 bits  (thousandths of a dollar, OCC style)
+    right             1 bit   (1 = call, 0 = put)
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+UNDERLYING_BITS = 10
+EXPIRY_BITS = 25
+STRIKE_BITS = 27
+
+# Mark-to-market pricing: 'mid', or 'conservative' (longs at bid, shorts at ask)
+PRICING = ('mid', 'conservative')
+
+# Per-contract Greeks gathered from the chain when marking
+GREEKS = ('delta', 'gamma', 'theta', 'vega')
+
+EXPIRY_EPOCH_US = 946684800 * 10**6  # 2000-01-01 00:00 UTC in microseconds
+US_PER_MINUTE = 60 * 10**6
+
+_STRIKE_SHIFT = 1
+_EXPIRY_SHIFT = _STRIKE_SHIFT + STRIKE_BITS
+_UNDERLYING_SHIFT = _EXPIRY_SHIFT + EXPIRY_BITS
+
+
+class SymbolTable:
+    """Two-way mapping between underlying symbols and small integer codes."""
+
+    def __init__(self):
+        self._codes = {}
+        self._symbols = []
+
+    def code(self, symbol: str) -> int:
+        """Code for a symbol, assigning the next free one if new."""
+        code = self._codes.get(symbol)
+        if code is None:
+            if len(self._symbols) >= 1 << UNDERLYING_BITS:
+                raise ValueError(f"More than {1 << UNDERLYING_BITS} underlyings")
+            code = len(self._symbols)
+            self._codes[symbol] = code
+            self._symbols.append(symbol)
+        return code
+
+    def symbol(self, code: int) -> str:
+        """Symbol for a code."""
+        return self._symbols[code]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._codes
+
+    def __len__(self):
+        return len(self._symbols)
+
+
+def encode_contracts(underlying_codes, expiration_ts, strikes, option_types) -> np.ndarray:
+    """
+    Pack contracts into int64 IDs (vectorized).
+
+    Args:
+        underlying_codes: Underlying codes (scalar or array)
+        expiration_ts: Expiration timestamps in microseconds
+        strikes: Strike prices
+        option_types: 'C' or 'P'
+
+    Returns:
+        Array of int64 contract IDs
+    """
+    underlying = np.asarray(underlying_codes, dtype=np.int64)
+    expiry = (np.asarray(expiration_ts, dtype=np.int64) - EXPIRY_EPOCH_US) // US_PER_MINUTE
+    strike = np.rint(np.asarray(strikes, dtype=np.float64) * 1000).astype(np.int64)
+    is_call = (np.asarray(option_types) == 'C').astype(np.int64)
+
+    return ((underlying << _UNDERLYING_SHIFT) | (expiry << _EXPIRY_SHIFT) |
+            (strike << _STRIKE_SHIFT) | is_call)
+
+
+def encode_contract(underlying_code: int, expiration_ts: int, strike: float, option_type: str) -> int:
+    """Pack one contract into an int64 ID (see encode_contracts)."""
+    return int(encode_contracts(underlying_code, expiration_ts, strike, option_type))
+
+
+def decode_contract(contract_id: int) -> tuple:
+    """
+    Unpack a contract ID.
+
+    Args:
+        contract_id: ID from encode_contract
+
+    Returns:
+        (underlying_code, expiration_ts, strike, option_type)
+    """
+    underlying = contract_id >> _UNDERLYING_SHIFT
+    expiry = (contract_id >> _EXPIRY_SHIFT) & ((1 << EXPIRY_BITS) - 1)
+    strike = (contract_id >> _STRIKE_SHIFT) & ((1 << STRIKE_BITS) - 1)
+    option_type = 'C' if contract_id & 1 else 'P'
+
+    return underlying, expiry * US_PER_MINUTE + EXPIRY_EPOCH_US, strike / 1000, option_type
+
+
+def latest_quotes(chain: pd.DataFrame, ids: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Row positions of the latest quote per contract.
+
+    Chains carry every quote up to now (ordered by strike, not time), so
+    the live quote is the row with the highest timestamp_available for
+    its contract; the last such row on a tie. One hash pass, no sort.
+
+    Args:
+        chain: Options chain (strike, option_type, expiration_timestamp)
+        ids: Contract IDs of the chain rows (default: encoded with
+            underlying code 0, enough within one symbol's chain)
+
+    Returns:
+        Row positions (for iloc), in chain order
+    """
+    if ids is None:
+        ids = encode_contracts(0, chain['expiration_timestamp'].to_numpy(),
+                               chain['strike'].to_numpy(), chain['option_type'].to_numpy())
+    ids = np.asarray(ids)
+
+    rows = np.arange(len(ids))
+    if 'timestamp_available' in chain:
+        available = pd.Series(chain['timestamp_available'].to_numpy())
+        newest = available.groupby(ids, sort=False).transform('max').to_numpy()
+        rows = np.flatnonzero(available.to_numpy() == newest)
+
+    return rows[~pd.Index(ids[rows]).duplicated(keep='last')]
+
+
+class PositionTable:
+    """
+    Array-backed book of option positions keyed by contract ID.
+
+    Rows are never removed; a closed position keeps its row (quantity 0)
+    so realized P&L stays attached and reopening reuses it.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """
+        Initialize an empty table.
+
+        Args:
+            capacity: Initial number of rows (grows by doubling)
+        """
+        self.symbols = SymbolTable()
+        self._rows = {}  # {contract_id: row}
+        self._size = 0
+
+        self.contract_id = np.zeros(capacity, dtype=np.int64)
+        self.underlying = np.zeros(capacity, dtype=np.int64)
+        self.expiration_ts = np.zeros(capacity, dtype=np.int64)
+        self.strike = np.zeros(capacity, dtype=np.float64)
+        self.is_call = np.zeros(capacity, dtype=bool)
+        self.quantity = np.zeros(capacity, dtype=np.int64)  # Signed, negative = short
+        self.avg_price = np.zeros(capacity, dtype=np.float64)  # Per share
+        self.realized_pnl = np.zeros(capacity, dtype=np.float64)
+        self.last_mark = np.zeros(capacity, dtype=np.float64)  # Last known price per share
+        self.last_greeks = np.zeros((capacity, len(GREEKS)), dtype=np.float64)  # Per contract, GREEKS order
+
+    def _grow(self):
+        capacity = len(self.contract_id) * 2
+        for name in ('contract_id', 'underlying', 'expiration_ts', 'strike', 'is_call',
+                     'quantity', 'avg_price', 'realized_pnl', 'last_mark', 'last_greeks'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def key(self, symbol: str, strike: float, option_type: str, expiration_ts: Optional[int]) -> int:
+        """
+        Contract ID for a contract.
+
+        Args:
+            symbol: Underlying symbol
+            strike: Strike price
+            option_type: 'C' or 'P'
+            expiration_ts: Expiration timestamp in microseconds (None if unknown)
+
+        Returns:
+            int64 contract ID
+        """
+        return encode_contract(self.symbols.code(symbol), expiration_ts or EXPIRY_EPOCH_US,
+                               strike, option_type)
+
+    def row(self, contract_id: int) -> Optional[int]:
+        """Row of a contract, or None if it was never traded."""
+        return self._rows.get(contract_id)
+
+    def apply_fill(self, symbol: str, strike: float, option_type: str,
+                   expiration_ts: Optional[int], quantity: int, price: float,
+                   greeks: Optional[Dict[str, float]] = None) -> float:
+        """
+        Apply a fill to a contract position.
+
+        Args:
+            symbol: Underlying symbol
+            strike: Strike price
+            option_type: 'C' or 'P'
+            expiration_ts: Expiration timestamp in microseconds
+            quantity: Signed contracts (positive = bought, negative = sold)
+            price: Fill price per share
+            greeks: Per-contract Greeks at the fill (refreshes the row)
+
+        Returns:
+            Realized P&L of the closed portion (0.0 when opening or adding)
+        """
+        contract_id = self.key(symbol, strike, option_type, expiration_ts)
+        row = self._rows.get(contract_id)
+
+        if row is None:
+            if self._size == len(self.contract_id):
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[contract_id] = row
+            self.contract_id[row] = contract_id
+            self.underlying[row] = self.symbols.code(symbol)
+            self.expiration_ts[row] = expiration_ts or 0
+            self.strike[row] = strike
+            self.is_call[row] = option_type == 'C'
+
+        held = int(self.quantity[row])
+        realized = 0.0
+
+        if held == 0 or (held > 0) == (quantity > 0):
+            # Opening or adding: weighted average entry price
+            self.avg_price[row] = (self.avg_price[row] * abs(held) + price * abs(quantity)) / (abs(held) + abs(quantity))
+        else:
+            # Reducing (or flipping): realize P&L on the closed contracts
+            closed = min(abs(held), abs(quantity))
+            realized = (price - self.avg_price[row]) * closed * 100 * (1 if held > 0 else -1)
+            self.realized_pnl[row] += realized
+            if abs(quantity) > abs(held):
+                self.avg_price[row] = price
+
+        self.quantity[row] = held + quantity
+        if held == 0:
+            self.last_mark[row] = price
+        if greeks:
+            self.last_greeks[row] = [greeks.get(greek, 0.0) for greek in GREEKS]
+
+        return realized
+
+    def open_rows(self) -> np.ndarray:
+        """Row indices of positions with non-zero quantity."""
+        return np.flatnonzero(self.quantity[:self._size])
+
+    def __len__(self):
+        """Number of open positions."""
+        return int(np.count_nonzero(self.quantity[:self._size]))
+
+    def get(self, contract_id: int) -> Optional[dict]:
+        """Position of one contract as a dict (None if never traded)."""
+        row = self._rows.get(contract_id)
+        if row is None:
+            return None
+        return {
+            'quantity': int(self.quantity[row]),
+            'avg_price': float(self.avg_price[row]),
+            'realized_pnl': float(self.realized_pnl[row]),
+        }
+
+    def chain_ids(self, symbol: str, chain: pd.DataFrame) -> np.ndarray:
+        """
+        Contract IDs for every row of a chain.
+
+        Args:
+            symbol: Underlying symbol of the chain
+            chain: Options chain (strike, option_type, expiration_timestamp)
+
+        Returns:
+            int64 array aligned with chain rows
+        """
+        return encode_contracts(self.symbols.code(symbol), chain['expiration_timestamp'].to_numpy(),
+                                chain['strike'].to_numpy(), chain['option_type'].to_numpy())
+
+    def mark(self, chains: Dict[str, pd.DataFrame], pricing: str = 'mid') -> np.ndarray:
+        """
+        Mark open positions against current chains with one gather per symbol.
+
+        Uses the latest quote per contract and refreshes each position's
+        Greeks from the same rows. Positions without a quote keep their
+        last known mark and Greeks.
+
+        Args:
+            chains: {symbol: options chain}
+            pricing: 'mid', or 'conservative' to mark longs at the bid and
+                shorts at the ask
+
+        Returns:
+            Marks (price per share) for open_rows(), in the same order
+        """
+        if pricing not in PRICING:
+            raise ValueError(f"pricing must be one of {PRICING}, got {pricing!r}")
+
+        rows = self.open_rows()
+        if len(rows) == 0:
+            return self.last_mark[rows]
+
+        for symbol, chain in chains.items():
+            if chain is None or len(chain) == 0 or symbol not in self.symbols:
+                continue
+
+            ids = self.chain_ids(symbol, chain)
+            latest = latest_quotes(chain, ids)
+
+            found = pd.Index(ids[latest]).get_indexer(self.contract_id[rows])
+            hit = found >= 0
+            if not hit.any():
+                continue
+
+            hit_rows = rows[hit]
+            quotes = chain.iloc[latest[found[hit]]]
+
+            if pricing == 'mid':
+                self.last_mark[hit_rows] = quotes['mid_price'].to_numpy()
+            else:
+                self.last_mark[hit_rows] = np.where(self.quantity[hit_rows] > 0,
+                                                    quotes['bid_price'].to_numpy(),
+                                                    quotes['ask_price'].to_numpy())
+
+            if all(greek in quotes for greek in GREEKS):
+                self.last_greeks[hit_rows] = quotes[list(GREEKS)].to_numpy(dtype=np.float64)
+
+        return self.last_mark[rows]
+
+    def market_value(self, chains: Optional[Dict[str, pd.DataFrame]] = None,
+                     pricing: str = 'mid') -> float:
+        """
+        Market value of all open positions (shorts are negative).
+
+        Args:
+            chains: {symbol: options chain}; None reuses the last marks
+            pricing: 'mid' or 'conservative' (see mark)
+
+        Returns:
+            Dollar value
+        """
+        rows = self.open_rows()
+        marks = self.mark(chains, pricing) if chains else self.last_mark[rows]
+        return float(np.sum(self.quantity[rows] * marks) * 100)
+
+    def unrealized_pnl(self) -> np.ndarray:
+        """Unrealized P&L in dollars per open position, at the last marks."""
+        rows = self.open_rows()
+        return (self.last_mark[rows] - self.avg_price[rows]) * self.quantity[rows] * 100
+
+    def position_greeks(self, rows) -> np.ndarray:
+        """Position Greeks (quantity x Greek x 100) of rows, in GREEKS order."""
+        return self.quantity[rows, None] * self.last_greeks[rows] * 100
+
+    def exposure(self) -> Dict[str, float]:
+        """
+        Aggregate Greeks of the open book at the last marks.
+
+        Returns:
+            Dict of GREEKS, each summed as quantity x Greek x 100 (delta in
+            shares, theta in dollars per day, vega in dollars per vol point)
+        """
+        rows = self.open_rows()
+        totals = self.position_greeks(rows).sum(axis=0)
+        return {greek: float(total) for greek, total in zip(GREEKS, totals)}
+
+    def open_positions(self) -> pd.DataFrame:
+        """
+        Open positions as a DataFrame.
+
+        Returns:
+            DataFrame with contract_id, symbol, strike, option_type,
+            expiration_ts, quantity, avg_price, realized_pnl, last_mark,
+            unrealized_pnl and per-contract Greeks
+        """
+        rows = self.open_rows()
+        positions = pd.DataFrame({
+            'contract_id': self.contract_id[rows],
+            'symbol': [self.symbols.symbol(code) for code in self.underlying[rows]],
+            'strike': self.strike[rows],
+            'option_type': np.where(self.is_call[rows], 'C', 'P'),
+            'expiration_ts': self.expiration_ts[rows],
+            'quantity': self.quantity[rows],
+            'avg_price': self.avg_price[rows],
+            'realized_pnl': self.realized_pnl[rows],
+            'last_mark': self.last_mark[rows],
+            'unrealized_pnl': self.unrealized_pnl(),
+        })
+        for i, greek in enumerate(GREEKS):
+            positions[greek] = self.last_greeks[rows, i]
+
+        return positions
+
+    def total_realized_pnl(self) -> float:
+        """Realized P&L over every contract ever traded."""
+        return float(self.realized_pnl[:self._size].sum())
@@ -0,0 +1,170 @@
+"""
+Opt-in per-stage profiler for the backtest event loop.
+
+Wraps the component methods the loop calls (update_bars, calculate_signals,
+update_signal, execute_order, update_fill, process_settlements,
+record_holdings, checkpointing) with timers, and attributes database
+queries and rows fetched to whichever stage issued them. Reads by the
+prefetch thread are charged to a 'prefetch' stage as each block is used.
+
+Only installed when Backtest(profile=True); unprofiled runs pay nothing.
+"""
+
+import time
+from array import array
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class StageProfiler:
+    """
+    Collects per-call timings and query counts per stage.
+
+    Call durations are kept in compact float arrays so percentiles can be
+    computed at the end of the run.
+    """
+
+    def __init__(self):
+        """Initialize profiler."""
+        self.timings = {}  # {stage: array of seconds per call}
+        self.queries = {}  # {stage: query count}
+        self.rows = {}  # {stage: rows fetched}
+        self._stack = []  # Active stages, innermost last
+        self.loop_start = None
+        self.loop_seconds = 0.0
+
+    def wrap(self, obj: Any, method_name: str, stage: Optional[str] = None):
+        """
+        Replace a bound method on an instance with a timed wrapper.
+
+        Args:
+            obj: Component instance
+            method_name: Method to wrap
+            stage: Stage name (default: method_name)
+        """
+        stage = stage or method_name
+        method = getattr(obj, method_name)
+        timings = self.timings.setdefault(stage, array('d'))
+        stack = self._stack
+        clock = time.perf_counter
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            stack.append(stage)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings.append(clock() - start)
+                stack.pop()
+
+        setattr(obj, method_name, timed)
+
+    def record_query(self, rows: int, stage: Optional[str] = None):
+        """
+        Attribute one database query to a stage.
+
+        Args:
+            rows: Rows returned by the query
+            stage: Stage to charge (default: the innermost active stage)
+        """
+        if stage is None:
+            stage = self._stack[-1] if self._stack else 'other'
+        self.queries[stage] = self.queries.get(stage, 0) + 1
+        self.rows[stage] = self.rows.get(stage, 0) + rows
+
+    def start(self):
+        """Mark the start of the event loop."""
+        self.loop_start = time.perf_counter()
+
+    def stop(self):
+        """Mark the end of the event loop."""
+        if self.loop_start is not None:
+            self.loop_seconds = time.perf_counter() - self.loop_start
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Build the per-stage summary table.
+
+        Returns:
+            List of rows (one per stage, slowest first) with call count,
+            cumulative time, share of loop time, latency percentiles,
+            queries and rows fetched
+        """
+        stages = set(self.timings) | set(self.queries)
+        table = []
+
+        for stage in stages:
+            calls = np.frombuffer(self.timings.get(stage, array('d')), dtype=np.float64)
+            total = float(calls.sum()) if len(calls) else 0.0
+
+            if len(calls):
+                p50, p95, p99 = np.percentile(calls, [50, 95, 99]) * 1e6
+                max_us = float(calls.max()) * 1e6
+            else:
+                p50 = p95 = p99 = max_us = 0.0
+
+            table.append({
+                'stage': stage,
+                'calls': int(len(calls)),
+                'total_ms': round(total * 1e3, 3),
+                'pct_of_loop': round(total / self.loop_seconds * 100, 2) if self.loop_seconds else 0.0,
+                'mean_us': round(total / len(calls) * 1e6, 1) if len(calls) else 0.0,
+                'p50_us': round(float(p50), 1),
+                'p95_us': round(float(p95), 1),
+                'p99_us': round(float(p99), 1),
+                'max_us': round(max_us, 1),
+                'queries': self.queries.get(stage, 0),
+                'rows': self.rows.get(stage, 0),
+            })
+
+        table.sort(key=lambda row: row['total_ms'], reverse=True)
+        return table
+
+    def format_table(self, summary: Optional[List[Dict[str, Any]]] = None) -> str:
+        """
+        Render the summary as a fixed-width text table.
+
+        Args:
+            summary: Output of summary() (computed if omitted)
+
+        Returns:
+            Table text
+        """
+        summary = summary if summary is not None else self.summary()
+
+        lines = [
+            f"{'Stage':<22}{'Calls':>8}{'Total ms':>11}{'%Loop':>7}"
+            f"{'p50 us':>9}{'p95 us':>9}{'p99 us':>10}{'Queries':>9}{'Rows':>10}",
+            "-" * 95,
+        ]
+        for row in summary:
+            lines.append(
+                f"{row['stage']:<22}{row['calls']:>8}{row['total_ms']:>11.1f}{row['pct_of_loop']:>7.1f}"
+                f"{row['p50_us']:>9.0f}{row['p95_us']:>9.0f}{row['p99_us']:>10.0f}"
+                f"{row['queries']:>9}{row['rows']:>10}"
+            )
+        lines.append(f"Event loop: {self.loop_seconds * 1e3:,.1f} ms")
+
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    class Component:
+        def work(self, n):
+            return sum(range(n))
+
+    profiler = StageProfiler()
+    component = Component()
+    profiler.wrap(component, 'work')
+
+    profiler.start()
+    for i in range(1000):
+        component.work(i)
+        if i % 10 == 0:
+            profiler.record_query(rows=5)
+    profiler.stop()
+
+    print(profiler.format_table())
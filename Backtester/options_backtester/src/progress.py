@@ -0,0 +1,187 @@
+"""
+Structured progress channel for the Node.js parent process.
+
+The legacy `PROGRESS:` lines share stdout with the results JSON, cost a
+print every 100 iterations regardless of speed, and can corrupt the JSON
+parse when interleaved. This channel writes newline-delimited JSON to a
+dedicated fd, socket or file instead, rate limited by wall time.
+
+Record schema (one JSON object per line, "v" is the schema version):
+
+    {"type": "start",    "v": 1, "total": int, "start_iteration": int}
+    {"type": "progress", "v": 1, "iteration": int, "total": int, "pct": float,
+     "iter_per_sec": float, "eta_s": float, "elapsed_s": float,
+     "trades": int, "equity": float|null, "timestamp": str|null}
+    {"type": "done",     "v": 1, "iteration": int, "total": int, "elapsed_s": float,
+     "iter_per_sec": float, "trades": int, "equity": float|null}
+
+From Node.js, spawn with an extra pipe and pass its fd number:
+    spawn(python, [script, config], {stdio: ['pipe', 'pipe', 'pipe', 'pipe']})
+    // config.progress_channel = 3, read child.stdio[3] line by line
+"""
+
+import json
+import os
+import time
+from typing import Any, Optional, TextIO, Union
+
+
+SCHEMA_VERSION = 1
+
+
+class ProgressReporter:
+    """
+    Rate-limited NDJSON progress reporter.
+
+    update() is cheap enough to call every iteration: it only compares a
+    monotonic clock reading and returns unless min_interval has passed.
+    """
+
+    def __init__(self, stream: TextIO, min_interval: float = 0.5):
+        """
+        Initialize progress reporter.
+
+        Args:
+            stream: Text stream for NDJSON records
+            min_interval: Minimum seconds between progress records
+        """
+        self.stream = stream
+        self.min_interval = min_interval
+        self.total = 0
+        self.start_iteration = 0
+        self.start_time = None
+        self.last_emit = 0.0
+        self.records_written = 0
+
+    @classmethod
+    def open(cls, target: Union[int, str], min_interval: float = 0.5) -> 'ProgressReporter':
+        """
+        Open a progress channel.
+
+        Args:
+            target: File descriptor number (e.g. 3), 'unix:<path>' for a
+                Unix socket, or a file/named pipe path
+            min_interval: Minimum seconds between progress records
+
+        Returns:
+            ProgressReporter
+        """
+        if isinstance(target, int) or (isinstance(target, str) and target.isdigit()):
+            # Leave the fd open on close() so a worker can reuse it per job
+            stream = os.fdopen(int(target), 'w', buffering=1, closefd=False)
+        elif target.startswith('unix:'):
+            import socket
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(target[len('unix:'):])
+            stream = sock.makefile('w', buffering=1)
+        else:
+            stream = open(target, 'w', buffering=1)
+
+        return cls(stream, min_interval)
+
+    def _emit(self, record: dict):
+        record['v'] = SCHEMA_VERSION
+        try:
+            self.stream.write(json.dumps(record) + '\n')
+            self.stream.flush()
+            self.records_written += 1
+        except (OSError, ValueError):
+            # Parent closed the channel; progress is best-effort
+            pass
+
+    def start(self, total: int, start_iteration: int = 0):
+        """
+        Mark the start of the event loop.
+
+        Args:
+            total: Total iterations expected
+            start_iteration: Iteration resumed from (checkpoint)
+        """
+        self.total = total
+        self.start_iteration = start_iteration
+        self.start_time = time.monotonic()
+        self.last_emit = self.start_time
+        self._emit({'type': 'start', 'total': total, 'start_iteration': start_iteration})
+
+    def _rates(self, iteration: int, now: float) -> tuple:
+        elapsed = now - self.start_time
+        done = iteration - self.start_iteration
+        iter_per_sec = done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - iteration, 0)
+        eta = remaining / iter_per_sec if iter_per_sec > 0 else None
+        return elapsed, iter_per_sec, eta
+
+    def update(self, iteration: int, trades: int = 0, equity: Optional[float] = None,
+               timestamp: Any = None, force: bool = False) -> bool:
+        """
+        Report progress if min_interval has passed since the last record.
+
+        Args:
+            iteration: Current iteration
+            trades: Trades executed so far
+            equity: Current portfolio value
+            timestamp: Current simulation timestamp
+            force: Emit regardless of rate limit
+
+        Returns:
+            True if a record was written
+        """
+        now = time.monotonic()
+        if not force and now - self.last_emit < self.min_interval:
+            return False
+
+        self.last_emit = now
+        elapsed, iter_per_sec, eta = self._rates(iteration, now)
+
+        self._emit({
+            'type': 'progress',
+            'iteration': iteration,
+            'total': self.total,
+            'pct': round(iteration / self.total * 100, 2) if self.total else 100.0,
+            'iter_per_sec': round(iter_per_sec, 1),
+            'eta_s': round(eta, 1) if eta is not None else None,
+            'elapsed_s': round(elapsed, 3),
+            'trades': trades,
+            'equity': float(equity) if equity is not None else None,
+            'timestamp': str(timestamp) if timestamp is not None else None,
+        })
+        return True
+
+    def finish(self, iteration: int, trades: int = 0, equity: Optional[float] = None):
+        """
+        Report completion of the event loop.
+
+        Args:
+            iteration: Final iteration
+            trades: Total trades executed
+            equity: Final portfolio value
+        """
+        elapsed, iter_per_sec, _ = self._rates(iteration, time.monotonic())
+
+        self._emit({
+            'type': 'done',
+            'iteration': iteration,
+            'total': self.total,
+            'elapsed_s': round(elapsed, 3),
+            'iter_per_sec': round(iter_per_sec, 1),
+            'trades': trades,
+            'equity': float(equity) if equity is not None else None,
+        })
+
+    def close(self):
+        """Close the underlying stream."""
+        try:
+            self.stream.close()
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    import sys
+
+    reporter = ProgressReporter(sys.stdout, min_interval=0.01)
+    reporter.start(total=1000)
+    for i in range(1, 1001):
+        reporter.update(i, trades=i // 100, equity=100000 + i)
+        time.sleep(0.0001)
+    reporter.finish(1000, trades=10, equity=101000)
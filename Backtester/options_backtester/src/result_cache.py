@@ -0,0 +1,353 @@
+"""
+On-disk result cache for backtest runs.
+
+The Node.js server often submits a config identical to a previous one
+(e.g. when a user reloads the page). Re-running the full simulation is
+wasteful, so finished results are stored keyed by:
+
+- A hash of the normalized config (ids and output-only options removed)
+- The data version of options_data_pit (new data invalidates entries)
+- A fingerprint of the engine source and runner script (code changes
+  invalidate entries)
+
+Entries are evicted least-recently-used once the cache exceeds its size
+budget.
+"""
+
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+
+# Bump when the cached result format changes
+CACHE_FORMAT_VERSION = 1
+
+# Config keys that never change simulation results
+NON_RESULT_KEYS = {
+    'config_id',
+    'use_cache',
+    'cache_dir',
+    'cache_max_mb',
+    'progress_channel',
+    'progress_interval',
+    'quiet',
+    'log_level',
+}
+
+# Defaults applied by run_backtest_from_config, so that omitted and
+# explicit default values hash identically
+CONFIG_DEFAULTS = {
+    'commission': 0.05,
+    'strategy_name': 'BuyAndHold',
+    'strategy_params': {},
+}
+
+# Runner script (next to src/) that builds the cached payload
+RUNNER_SCRIPT = 'run_backtest.py'
+
+# Strategy names that map to the same class
+STRATEGY_ALIASES = {
+    'BuyAndHold': 'BuyAndHoldStrategy',
+}
+
+
+def normalize_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a backtest config for hashing.
+
+    Args:
+        config: Raw config dictionary
+
+    Returns:
+        Config with defaults filled in and non-result keys removed
+    """
+    normalized = dict(CONFIG_DEFAULTS)
+    normalized.update({k: v for k, v in config.items() if k not in NON_RESULT_KEYS})
+
+    name = normalized['strategy_name']
+    normalized['strategy_name'] = STRATEGY_ALIASES.get(name, name)
+    normalized['initial_capital'] = float(normalized.get('initial_capital', 0))
+    normalized['commission'] = float(normalized['commission'])
+
+    return normalized
+
+
+def source_fingerprint(src_dir: Optional[str] = None,
+                       extra_files: Optional[List[str]] = None) -> str:
+    """
+    Fingerprint the engine source files by name, size and mtime.
+
+    Cheap enough to compute per run (one stat per module), and ensures
+    edits to the engine never serve stale results. The runner script
+    builds the cached payload (metrics, alpha/beta, serialization), so
+    it counts as engine source too.
+
+    Args:
+        src_dir: Directory with engine modules (default: this package)
+        extra_files: Other files to fingerprint (default: RUNNER_SCRIPT
+            next to src_dir, if present)
+
+    Returns:
+        Hex digest
+    """
+    if src_dir is None:
+        src_dir = os.path.dirname(os.path.abspath(__file__))
+    if extra_files is None:
+        extra_files = [os.path.join(os.path.dirname(os.path.abspath(src_dir)), RUNNER_SCRIPT)]
+
+    paths = [os.path.join(src_dir, name) for name in sorted(os.listdir(src_dir)) if name.endswith('.py')]
+    paths += [path for path in extra_files if os.path.exists(path)]
+
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    LRU on-disk cache of serialized backtest results.
+
+    Each entry is a single JSON file named by its key. Access time is
+    tracked through the file mtime, which is bumped on every hit.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize result cache.
+
+        Args:
+            cache_dir: Directory to store entries (default: data/cache/results)
+            max_bytes: Total size budget before LRU eviction
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(
+                os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                'data', 'cache', 'results'
+            )
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, config: Dict[str, Any], data_version: Dict[str, Any],
+                 code_version: Optional[str] = None) -> str:
+        """
+        Build cache key for a config against the current data.
+
+        Args:
+            config: Raw config dictionary
+            data_version: Stamp from DatabaseManager.get_data_version()
+            code_version: Engine fingerprint (default: source_fingerprint())
+
+        Returns:
+            Hex digest key
+        """
+        if code_version is None:
+            code_version = source_fingerprint()
+
+        payload = {
+            'format': CACHE_FORMAT_VERSION,
+            'config': normalize_config(config),
+            'data_version': data_version,
+            'code_version': code_version,
+        }
+
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get_text(self, key: str) -> Optional[str]:
+        """
+        Get serialized results without parsing them.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            JSON text, or None on miss
+        """
+        path = self._path(key)
+
+        try:
+            with open(path, 'r') as f:
+                text = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+
+        # Mark as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return text
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached results.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Results dictionary, or None on miss
+        """
+        text = self.get_text(key)
+        if text is None:
+            return None
+
+        return json.loads(text)
+
+    def put(self, key: str, results: Any) -> bool:
+        """
+        Store results (dict or pre-serialized JSON text).
+
+        Written atomically so a concurrent reader never sees a partial file.
+
+        Args:
+            key: Cache key
+            results: JSON-serializable results or JSON text
+
+        Returns:
+            True if stored
+        """
+        text = results if isinstance(results, str) else json.dumps(results)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Failed to write result cache entry: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+        self.evict()
+        return True
+
+    @contextmanager
+    def writer(self, key: str):
+        """
+        Stream an entry to disk while it is being produced.
+
+        The entry only becomes visible if the block completes without
+        raising, so a failed run never leaves a truncated result behind.
+
+        Args:
+            key: Cache key
+
+        Yields:
+            Writable text file
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        try:
+            with open(tmp_path, 'w') as f:
+                yield f
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove least-recently-used entries until under the size budget.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        total_bytes = 0
+
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        if total_bytes <= self.max_bytes:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_bytes -= size
+                removed += 1
+            except OSError:
+                pass
+
+        return removed
+
+    def clear(self):
+        """Remove all cache entries."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, size and hit/miss counts
+        """
+        sizes = [
+            os.path.getsize(os.path.join(self.cache_dir, name))
+            for name in os.listdir(self.cache_dir)
+            if name.endswith('.json')
+        ]
+
+        return {
+            'entries': len(sizes),
+            'total_bytes': sum(sizes),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    cache = ResultCache(cache_dir=tempfile.mkdtemp(), max_bytes=1024)
+    config = {'config_id': 'a', 'symbols': ['SPY'], 'start_date': '2024-01-01',
+              'end_date': '2024-01-31', 'initial_capital': 100000}
+    key = cache.make_key(config, {'database': 'sqlite://', 'max_id': 1})
+
+    start = time.perf_counter()
+    cache.put(key, {'initial_capital': 100000, 'total_return': 1.5})
+    print(f"Cached: {cache.get(key)} in {(time.perf_counter() - start) * 1000:.2f} ms")
+    print(f"Stats: {cache.get_stats()}")
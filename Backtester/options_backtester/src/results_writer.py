@@ -0,0 +1,256 @@
+"""
+Streaming serializer for backtest results.
+
+Large runs produce equity curves and trade logs with hundreds of thousands
+of rows. Converting them row by row into Python dicts and dumping one giant
+JSON document is slow and memory hungry, so frames are serialized in
+chunks straight from the DataFrames using pandas' C JSON encoder.
+
+Formats:
+- json:     Single JSON document, same shape the Node.js bridge parses
+            (summary keys, equity_curve and trades_data record lists)
+- ndjson:   One JSON object per line: a summary line, then record chunks
+            per section, then an end marker
+- columnar: Like ndjson, but each chunk holds column arrays instead of
+            records (smaller, faster to load into typed arrays)
+- arrow:    Compact binary. Summary is written as JSON and every frame
+            section as an Arrow IPC file next to it (requires pyarrow)
+"""
+
+import json
+from typing import Any, Dict, IO, Optional
+
+import numpy as np
+import pandas as pd
+
+
+FORMATS = ('json', 'ndjson', 'columnar', 'arrow')
+
+# Results keys holding DataFrames, and the key each is written under
+FRAME_SECTIONS = {
+    'equity_curve': 'equity_curve',
+    'trades': 'trades_data',
+}
+
+# Columns kept per section (others are internal, e.g. 'returns')
+SECTION_COLUMNS = {
+    'equity_curve': ['timestamp', 'total_value', 'settled_cash', 'unsettled_cash', 'num_positions'],
+}
+
+# Results keys that are never serialized
+DROPPED_KEYS = ('positions',)
+
+
+def _to_native(value: Any) -> Any:
+    """Convert numpy/pandas scalars to JSON-serializable Python values."""
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, 'item'):  # numpy scalar
+        return value.item()
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    native = _to_native(value)
+    if native is value:
+        return str(value)
+    return native
+
+
+def split_results(results: Dict[str, Any]) -> tuple:
+    """
+    Separate summary values from DataFrame sections.
+
+    Args:
+        results: Results dictionary from Backtest.run()
+
+    Returns:
+        (summary dict, {section name: DataFrame})
+    """
+    summary = {}
+    frames = {}
+
+    for key, value in results.items():
+        if key in DROPPED_KEYS:
+            continue
+        if isinstance(value, pd.DataFrame) and key in FRAME_SECTIONS:
+            section = FRAME_SECTIONS[key]
+            if section in SECTION_COLUMNS:
+                value = value[[c for c in SECTION_COLUMNS[section] if c in value.columns]]
+            frames[section] = value
+        else:
+            summary[key] = _to_native(value)
+
+    return summary, frames
+
+
+class ResultsWriter:
+    """
+    Writes backtest results to a stream in chunks.
+
+    Memory stays bounded by chunk_size rows per section, regardless of
+    run length.
+    """
+
+    def __init__(self, stream: IO[str], fmt: str = 'json', chunk_size: int = 50000,
+                 path: Optional[str] = None):
+        """
+        Initialize results writer.
+
+        Args:
+            stream: Text stream to write to (file, pipe or stdout)
+            fmt: One of FORMATS
+            chunk_size: Rows serialized per chunk
+            path: Output file path (required for 'arrow' sidecar files)
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported results format: {fmt} (expected one of {FORMATS})")
+        if fmt == 'arrow' and path is None:
+            raise ValueError("Arrow output requires a file path")
+
+        self.stream = stream
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.path = path
+
+    def write(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Serialize results to the stream.
+
+        Args:
+            results: Results dictionary (DataFrame sections allowed)
+
+        Returns:
+            Summary dictionary (results without frame sections)
+        """
+        summary, frames = split_results(results)
+
+        if self.fmt == 'json':
+            self._write_json(summary, frames)
+        elif self.fmt == 'arrow':
+            self._write_arrow(summary, frames)
+        else:
+            self._write_lines(summary, frames)
+
+        self.stream.flush()
+        return summary
+
+    def _chunks(self, df: pd.DataFrame):
+        for start in range(0, len(df), self.chunk_size):
+            yield df.iloc[start:start + self.chunk_size]
+
+    def _records_text(self, chunk: pd.DataFrame) -> str:
+        """JSON array text of a chunk's records (C encoder, no Python dicts)."""
+        return chunk.to_json(orient='records', date_format='iso', double_precision=15)
+
+    def _columns_text(self, chunk: pd.DataFrame) -> str:
+        """JSON object text mapping each column to its value array."""
+        parts = [
+            f"{json.dumps(str(col))}:{chunk[col].to_json(orient='values', date_format='iso', double_precision=15)}"
+            for col in chunk.columns
+        ]
+        return '{' + ','.join(parts) + '}'
+
+    def _write_json(self, summary: Dict[str, Any], frames: Dict[str, pd.DataFrame]):
+        write = self.stream.write
+        head = json.dumps(summary, default=_json_default)
+
+        if not frames:
+            write(head + '\n')
+            return
+
+        # Open the summary object and append each section as a streamed array
+        write(head[:-1] + (', ' if summary else ''))
+
+        for i, (section, df) in enumerate(frames.items()):
+            write(f"{', ' if i else ''}{json.dumps(section)}: [")
+            first = True
+            for chunk in self._chunks(df):
+                text = self._records_text(chunk)[1:-1]
+                if text:
+                    write(text if first else ',' + text)
+                    first = False
+            write(']')
+
+        write('}\n')
+
+    def _write_lines(self, summary: Dict[str, Any], frames: Dict[str, pd.DataFrame]):
+        write = self.stream.write
+        write(json.dumps({'type': 'summary', 'data': summary}, default=_json_default) + '\n')
+
+        for section, df in frames.items():
+            for chunk in self._chunks(df):
+                if self.fmt == 'columnar':
+                    body = self._columns_text(chunk)
+                    write(f'{{"type":{json.dumps(section)},"columns":{body}}}\n')
+                else:
+                    body = self._records_text(chunk)
+                    write(f'{{"type":{json.dumps(section)},"rows":{body}}}\n')
+
+        write(json.dumps({'type': 'end', 'sections': {s: len(df) for s, df in frames.items()}}) + '\n')
+
+    def _write_arrow(self, summary: Dict[str, Any], frames: Dict[str, pd.DataFrame]):
+        try:
+            import pyarrow as pa
+            import pyarrow.ipc as ipc
+        except ImportError:
+            raise ImportError("Arrow output requires pyarrow (pip install pyarrow)")
+
+        sidecars = {}
+
+        for section, df in frames.items():
+            sidecar_path = f"{self.path}.{section}.arrow"
+            table = pa.Table.from_pandas(df, preserve_index=False)
+
+            with pa.OSFile(sidecar_path, 'wb') as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    for batch in table.to_batches(max_chunksize=self.chunk_size):
+                        writer.write_batch(batch)
+
+            sidecars[section] = sidecar_path
+
+        summary['arrow_sections'] = sidecars
+        self.stream.write(json.dumps(summary, default=_json_default) + '\n')
+
+
+def write_results(results: Dict[str, Any], fmt: str = 'json',
+                  path: Optional[str] = None, stream: Optional[IO[str]] = None,
+                  chunk_size: int = 50000) -> Dict[str, Any]:
+    """
+    Convenience wrapper: write results to a path or stream.
+
+    Args:
+        results: Results dictionary
+        fmt: One of FORMATS
+        path: File or named pipe to write (opened and closed here)
+        stream: Already-open text stream (used if path is None)
+        chunk_size: Rows serialized per chunk
+
+    Returns:
+        Summary dictionary
+    """
+    if path is not None:
+        with open(path, 'w') as f:
+            return ResultsWriter(f, fmt, chunk_size, path=path).write(results)
+
+    return ResultsWriter(stream, fmt, chunk_size).write(results)
+
+
+if __name__ == "__main__":
+    import io
+    import time
+
+    n = 200000
+    equity = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-02 09:30', periods=n, freq='min'),
+        'total_value': 100000 + np.random.randn(n).cumsum(),
+        'settled_cash': 100000.0,
+        'unsettled_cash': 0.0,
+        'num_positions': np.random.randint(0, 5, n),
+    })
+
+    for fmt in ('json', 'ndjson', 'columnar'):
+        buffer = io.StringIO()
+        start = time.perf_counter()
+        ResultsWriter(buffer, fmt).write({'initial_capital': 100000, 'equity_curve': equity})
+        print(f"{fmt:9} {(time.perf_counter() - start) * 1000:8.1f} ms  {len(buffer.getvalue()) / 1e6:.1f} MB")
@@ -0,0 +1,107 @@
+"""
+Portfolio Greeks book and Greek risk limits.
+
+Keeps net delta, gamma, theta and vega per underlying in a small NumPy
+array. Fills adjust it incrementally, each tick rebuilds it from the
+freshly marked position table in one vectorized pass, and a proposed
+order is checked against the limits with a handful of comparisons, so
+risk checks never rescan the book.
+
+All values are position Greeks: quantity x per-contract Greek x 100
+(delta in shares, theta in dollars per day, vega in dollars per vol point).
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from positions import GREEKS, PositionTable, SymbolTable
+
+
+class GreeksBook:
+    """
+    Net Greeks per underlying with optional absolute limits.
+
+    Limits apply to each underlying separately, e.g. {'delta': 500,
+    'vega': 2000} rejects orders that would take any underlying's net
+    delta beyond ±500 shares or net vega beyond ±$2,000 per vol point.
+    Orders that reduce an existing breach are always allowed.
+    """
+
+    def __init__(self, symbols: SymbolTable, limits: Optional[Dict[str, float]] = None):
+        """
+        Initialize an empty book.
+
+        Args:
+            symbols: Symbol table shared with the PositionTable
+            limits: {greek: max absolute net value per underlying}
+        """
+        limits = limits or {}
+        unknown = set(limits) - set(GREEKS)
+        if unknown:
+            raise ValueError(f"Unknown Greek limits {sorted(unknown)}, expected some of {GREEKS}")
+
+        self.symbols = symbols
+        self.limits = {greek: float(limit) for greek, limit in limits.items() if limit is not None}
+        self._checks = [(GREEKS.index(greek), greek, limit) for greek, limit in self.limits.items()]
+        self.net = np.zeros((max(len(symbols), 4), len(GREEKS)), dtype=np.float64)
+
+    def _row(self, code: int) -> np.ndarray:
+        if code >= len(self.net):
+            grown = np.zeros((max(code + 1, len(self.net) * 2), len(GREEKS)), dtype=np.float64)
+            grown[:len(self.net)] = self.net
+            self.net = grown
+        return self.net[code]
+
+    def add(self, symbol: str, change: np.ndarray):
+        """
+        Apply a change in position Greeks (e.g. from a fill).
+
+        Args:
+            symbol: Underlying symbol
+            change: Position Greeks to add, in GREEKS order
+        """
+        self._row(self.symbols.code(symbol))[:] += change
+
+    def rebuild(self, positions: PositionTable):
+        """
+        Recompute every underlying from the position table's last marks.
+
+        Args:
+            positions: Position table (after marking)
+        """
+        rows = positions.open_rows()
+        self.net = np.zeros((max(len(self.symbols), len(self.net)), len(GREEKS)), dtype=np.float64)
+        np.add.at(self.net, positions.underlying[rows], positions.position_greeks(rows))
+
+    def get(self, symbol: str) -> Dict[str, float]:
+        """Net Greeks of one underlying."""
+        if symbol not in self.symbols:
+            return {greek: 0.0 for greek in GREEKS}
+        return dict(zip(GREEKS, self._row(self.symbols.code(symbol)).tolist()))
+
+    def totals(self) -> Dict[str, float]:
+        """Net Greeks summed over all underlyings."""
+        return dict(zip(GREEKS, self.net.sum(axis=0).tolist()))
+
+    def check(self, symbol: str, impact: np.ndarray) -> Optional[str]:
+        """
+        Check whether adding impact would breach a limit.
+
+        Args:
+            symbol: Underlying symbol
+            impact: Position Greeks the order would add, in GREEKS order
+
+        Returns:
+            Description of the first breach, or None if within limits
+        """
+        if not self._checks:
+            return None
+
+        net = self._row(self.symbols.code(symbol))
+        for i, greek, limit in self._checks:
+            after = net[i] + impact[i]
+            if abs(after) > limit and abs(after) > abs(net[i]):
+                return f"net {greek} {after:,.1f} beyond ±{limit:,.0f}"
+
+        return None
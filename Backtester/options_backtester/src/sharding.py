@@ -0,0 +1,376 @@
+"""
+Day-sharded parallel backtests.
+
+Backtest closes every position by 3:55pm, so each session starts flat:
+only cash, pending T+1 settlements and the strategy's carried_state
+cross from one day to the next. ShardedBacktest simulates the sessions
+in worker processes from a nominal starting state (initial capital,
+nothing pending, fresh strategy) and then stitches them together in one
+sequential pass that carries the real state forward.
+
+A session simulated from the nominal state is kept when none of its
+decisions could have differed under the real state: the strategy
+started from the same carried_state, and settled cash stayed inside
+the range over which every sizing and cash check gives the same answer
+(Portfolio.cash_bounds). Otherwise the stitch pass re-simulates that
+session in-process from the real state, so the stitched run matches a
+sequential one either way.
+
+Multi-timeframe bars would restart each session, so a strategy that
+reads them is refused (ValueError) as soon as a session shows it did.
+Sessions that end before 3:55pm are flattened at their last bar.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional, Type
+
+import pandas as pd
+
+from backtest import Backtest
+from data_handler import DataHandler
+from database import get_database
+from progress import ProgressReporter
+from strategy import Strategy
+
+
+# Connection of the current worker process (set by _init_worker)
+_worker_connection = None
+
+
+def _init_worker(connection_args: dict):
+    """Open one database connection per worker process."""
+    global _worker_connection
+    _worker_connection = get_database(**connection_args).get_connection()
+
+
+def _same_state(a: dict, b: dict) -> bool:
+    """Compare carried strategy states (unorderable values count as different)."""
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+def run_session(job: dict, connection=None) -> dict:
+    """
+    Simulate one session from a given starting state.
+
+    Args:
+        job: Session spec from ShardedBacktest.make_job()
+        connection: Database connection (default: this worker's)
+
+    Returns:
+        Dict with the session's equity curve rows, trades, end state
+        (settled/unsettled cash, pending settlements, carried strategy
+        state), the cash range its decisions hold for and how often the
+        strategy read multi-timeframe bars
+    """
+    day = pd.Timestamp(job['day'])
+    state = job['state']
+
+    # Backtest banners and per-tick PROGRESS lines would flood the parent's stdout
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        backtest = Backtest(
+            symbols=job['symbols'],
+            start_date=str(day),
+            end_date=str(day + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)),
+            initial_capital=job['initial_capital'],
+            strategy_class=job['strategy_class'],
+            db_connection=connection if connection is not None else _worker_connection,
+            commission=job['commission'],
+            enable_checkpoints=False,
+            quiet=job['quiet'],
+            log_level=job['log_level'],
+            mark_pricing=job['mark_pricing'],
+            greek_limits=job['greek_limits']
+        )
+
+        portfolio = backtest.portfolio
+        portfolio.settled_cash = state['settled_cash']
+        portfolio.unsettled_cash = state['unsettled_cash']
+        portfolio.pending_settlements = [dict(settlement) for settlement in state['pending']]
+        if state['strategy'] is not None:
+            backtest.strategy.set_carried_state(state['strategy'])
+        strategy_start = backtest.strategy.get_carried_state()
+
+        backtest.run(verbose=False, flatten_at_end=True)
+
+    return {
+        'day': job['day'],
+        'exact': job['exact'],
+        'strategy_start': strategy_start,
+        'strategy_end': backtest.strategy.get_carried_state(),
+        'cash_bounds': portfolio.cash_bounds,
+        'timeframe_reads': backtest.data.timeframe_reads,
+        'equity_curve': backtest.equity_curve,
+        'trades': portfolio.trades,
+        'positions': portfolio.get_positions_summary(),
+        'settled_cash': portfolio.settled_cash,
+        'unsettled_cash': portfolio.unsettled_cash,
+        'pending': [
+            {'amount': settlement['amount'], 'settlement_date': settlement['settlement_date'],
+             'settlement_us': settlement['settlement_us']}
+            for settlement in portfolio.pending_settlements
+        ],
+    }
+
+
+class ShardedBacktest:
+    """
+    Runs a backtest as independent sessions on a process pool.
+
+    Takes the same settings as Backtest, plus the DatabaseManager (each
+    worker opens its own connection) and the number of workers.
+    """
+
+    def __init__(
+        self,
+        symbols: list,
+        start_date: str,
+        end_date: str,
+        initial_capital: float,
+        strategy_class: Type[Strategy],
+        db,
+        connection=None,
+        commission: float = 0.05,
+        workers: Optional[int] = None,
+        progress: Optional[ProgressReporter] = None,
+        quiet: bool = False,
+        log_level: str = 'info',
+        mark_pricing: str = 'mid',
+        greek_limits: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize sharded backtest.
+
+        Args:
+            symbols: List of underlying symbols to trade
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            initial_capital: Starting capital
+            strategy_class: Strategy class to use (must be importable
+                by the worker processes)
+            db: DatabaseManager the workers reconnect to
+            connection: Open connection for this process (listing
+                sessions and re-simulating them; default: a new one)
+            commission: Commission per contract
+            workers: Worker processes (default: CPU count; 1 runs the
+                sessions sequentially in this process)
+            progress: Structured progress channel (one record per session)
+            quiet: Disable per-event logging
+            log_level: Minimum event log level
+            mark_pricing: 'mid' or 'conservative' marking
+            greek_limits: Max absolute net position Greeks per underlying
+        """
+        self.symbols = symbols
+        self.start_date = start_date
+        self.end_date = end_date
+        self.initial_capital = initial_capital
+        self.strategy_class = strategy_class
+        self.db = db
+        self.connection = connection if connection is not None else db.get_connection()
+        self.workers = workers or os.cpu_count() or 1
+        self.progress = progress
+        self.settings = {
+            'symbols': symbols,
+            'initial_capital': initial_capital,
+            'strategy_class': strategy_class,
+            'commission': commission,
+            'quiet': quiet,
+            'log_level': log_level,
+            'mark_pricing': mark_pricing,
+            'greek_limits': greek_limits,
+        }
+
+        self.resimulated = 0  # Sessions the stitch pass had to re-run
+
+    def sessions(self) -> List[pd.Timestamp]:
+        """Trading days with data in the backtest period."""
+        data = DataHandler(self.connection, self.start_date, self.end_date, self.symbols,
+                           enable_multi_timeframe=False)
+        timestamps = pd.DatetimeIndex(data.get_all_timestamps())
+        return list(timestamps.normalize().unique())
+
+    def initial_state(self) -> dict:
+        """State at the start of the first session."""
+        return {
+            'settled_cash': self.initial_capital,
+            'unsettled_cash': 0.0,
+            'pending': [],
+            'strategy': None,  # Fresh strategy
+        }
+
+    def make_job(self, day: pd.Timestamp, state: dict, exact: bool) -> dict:
+        """
+        Session spec for run_session().
+
+        Args:
+            day: Session date
+            state: Starting state
+            exact: True if state is the real carried state, False for
+                the nominal state of a speculative parallel run
+
+        Returns:
+            Picklable job dict
+        """
+        return dict(self.settings, day=str(day.date()), state=state, exact=exact)
+
+    def is_reusable(self, result: dict, state: dict) -> bool:
+        """
+        Check whether a nominal session holds under the real carried state.
+
+        Args:
+            result: run_session() output
+            state: Real state at the start of the session
+
+        Returns:
+            True if every decision in the session would be the same
+        """
+        if result['exact']:
+            return True
+
+        if state['strategy'] is not None and not _same_state(result['strategy_start'], state['strategy']):
+            return False
+
+        # Range of settled cash through the session as carried settlements land
+        settled = low = high = state['settled_cash']
+        session_end = result['equity_curve'][-1]['timestamp'] if result['equity_curve'] else None
+        for settlement in sorted(state['pending'], key=lambda s: s['settlement_date']):
+            if session_end is None or settlement['settlement_date'] > session_end:
+                break
+            settled += settlement['amount']
+            low, high = min(low, settled), max(high, settled)
+
+        bound_low, bound_high = result['cash_bounds']
+        return bound_low <= low and high < bound_high
+
+    def stitch(self, result: dict, state: dict, equity_curve: list, trades: list) -> dict:
+        """
+        Append a session to the run and carry its state forward.
+
+        Nominal sessions started from initial capital with nothing
+        pending; their cash is shifted by the real carried cash, with the
+        carried settlements landing at their settlement times.
+
+        Args:
+            result: run_session() output
+            state: Real state at the start of the session
+            equity_curve: Stitched equity curve rows (appended to)
+            trades: Stitched trades (appended to)
+
+        Returns:
+            Real state at the end of the session
+        """
+        trades.extend(result['trades'])
+        end_state = {'strategy': result['strategy_end']}
+
+        if result['exact']:
+            equity_curve.extend(result['equity_curve'])
+            end_state.update(settled_cash=result['settled_cash'], unsettled_cash=result['unsettled_cash'],
+                             pending=result['pending'])
+            return end_state
+
+        carried = sorted(state['pending'], key=lambda s: s['settlement_date'])
+        offset = state['settled_cash'] + state['unsettled_cash'] - self.initial_capital
+        landed = 0.0  # Carried settlements moved to settled cash so far
+        i = 0
+
+        for row in result['equity_curve']:
+            while i < len(carried) and carried[i]['settlement_date'] <= row['timestamp']:
+                landed += carried[i]['amount']
+                i += 1
+            equity_curve.append(dict(
+                row,
+                total_value=row['total_value'] + offset,
+                settled_cash=row['settled_cash'] - self.initial_capital + state['settled_cash'] + landed,
+                unsettled_cash=row['unsettled_cash'] + state['unsettled_cash'] - landed
+            ))
+
+        end_state.update(
+            settled_cash=result['settled_cash'] - self.initial_capital + state['settled_cash'] + landed,
+            unsettled_cash=result['unsettled_cash'] + state['unsettled_cash'] - landed,
+            pending=carried[i:] + result['pending']
+        )
+        return end_state
+
+    def run(self) -> dict:
+        """
+        Simulate all sessions and stitch them into one run.
+
+        Returns:
+            Dictionary with backtest results (as Backtest.run), plus
+            'sharding': {sessions, workers, resimulated}
+
+        Raises:
+            ValueError: If the strategy reads multi-timeframe bars
+        """
+        print("\n" + "="*60)
+        print("STARTING SHARDED BACKTEST")
+        print("="*60)
+
+        sessions = self.sessions()
+        workers = min(self.workers, len(sessions)) or 1
+        print(f"\nSimulating {len(sessions)} sessions on {workers} worker process(es)...")
+
+        progress = self.progress
+        if progress is not None:
+            progress.start(len(sessions))
+
+        state = self.initial_state()
+        equity_curve = []
+        trades = []
+        positions = pd.DataFrame()
+        self.resimulated = 0
+
+        pool = None
+        if workers > 1:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(self.db.connection_args(),))
+
+        try:
+            if pool is not None:
+                nominal = self.initial_state()
+                results = pool.map(run_session, [self.make_job(day, nominal, exact=False) for day in sessions])
+            else:
+                results = iter([None] * len(sessions))
+
+            for iteration, (day, result) in enumerate(zip(sessions, results), 1):
+                if result is None or not self.is_reusable(result, state):
+                    if result is not None:
+                        self.resimulated += 1
+                    result = run_session(self.make_job(day, state, exact=True), self.connection)
+
+                if result['timeframe_reads']:
+                    raise ValueError(
+                        f"{self.strategy_class.__name__} reads multi-timeframe bars, which restart "
+                        f"each session under shard_by_day; run it without sharding"
+                    )
+
+                state = self.stitch(result, state, equity_curve, trades)
+                positions = result['positions']
+
+                if progress is not None:
+                    progress.update(iteration, len(trades),
+                                    equity_curve[-1]['total_value'] if equity_curve else None, day)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+        if progress is not None:
+            progress.finish(len(sessions), len(trades),
+                            equity_curve[-1]['total_value'] if equity_curve else None)
+
+        print(f"\nStitched {len(sessions)} sessions ({self.resimulated} re-simulated with carried state)")
+
+        results = Backtest.summarize_results(self.initial_capital, equity_curve,
+                                             pd.DataFrame(trades) if trades else pd.DataFrame(),
+                                             positions)
+        results['sharding'] = {
+            'sessions': len(sessions),
+            'workers': workers,
+            'resimulated': self.resimulated,
+        }
+
+        return results
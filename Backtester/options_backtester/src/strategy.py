@@ -5,9 +5,14 @@ Strategies generate SignalEvents from MarketEvents.
 All strategies must use ONLY point-in-time data from MarketEvent.
 """
 
+import copy
 from queue import Queue
-from events import SignalEvent, MarketEvent, EventType
+from events import SignalEvent, MarketEvent, EventType, create_order_event
 from data_handler import DataHandler
+from event_log import EventLogger
+from subscription import DataSubscription
+from delta_index import DeltaIndex
+from clock import US_PER_DAY, US_PER_HOUR, to_us
 import pandas as pd
 import numpy as np
 from typing import Optional
@@ -19,8 +24,18 @@ class Strategy:
 
     Generates SignalEvents from MarketEvents.
     Override calculate_signals() with your strategy logic.
+
+    List in carried_state the attributes that must survive from one
+    session to the next; day-sharded runs re-simulate any day that
+    started from different values.
+
+    Set subscription to the slice of the chain the strategy reads;
+    MarketEvent.data then carries only that slice.
     """
 
+    carried_state = ()  # Attribute names carried across sessions
+    subscription: Optional[DataSubscription] = None  # None = full 0-7 DTE chain
+
     def __init__(self, events_queue: Queue, data_handler: DataHandler):
         """
         Initialize strategy.
@@ -33,6 +48,21 @@ class Strategy:
         self.data = data_handler
         self.strategy_id = self.__class__.__name__
 
+        # Replaced by the Backtest's shared logger
+        self.log = EventLogger()
+
+        # Delta index of the last chain searched by delta (rebuilt per snapshot)
+        self._delta_index = None
+
+    def get_carried_state(self) -> dict:
+        """Current values of the carried_state attributes."""
+        return {name: copy.deepcopy(getattr(self, name)) for name in self.carried_state}
+
+    def set_carried_state(self, state: dict):
+        """Restore carried_state attributes (e.g. at the start of a session)."""
+        for name, value in state.items():
+            setattr(self, name, copy.deepcopy(value))
+
     def calculate_signals(self, market_event: MarketEvent):
         """
         Override this method with your strategy logic.
@@ -45,6 +75,18 @@ class Strategy:
         """
         raise NotImplementedError("Must implement calculate_signals()")
 
+    def on_expiry(self, fill_event):
+        """
+        Called when a held contract expires and is settled at intrinsic
+        value (only when positions are held past the auto-close).
+
+        Override to clear strategy-side position tracking.
+
+        Args:
+            fill_event: The settlement fill (execution_quality is
+                'EXPIRED', 'EXERCISED' or 'ASSIGNED')
+        """
+
     def calculate_iv_rank(self, df: pd.DataFrame, lookback: int = 252) -> float:
         """
         Calculate IV Rank for current IV.
@@ -95,8 +137,27 @@ class Strategy:
 
         return percentile
 
+    def delta_index(self, options_df: pd.DataFrame) -> DeltaIndex:
+        """
+        Sorted delta index of a chain, built once per snapshot.
+
+        Repeated calls with the same DataFrame (e.g. one per spread leg)
+        reuse the index; a new snapshot replaces it.
+
+        Args:
+            options_df: DataFrame with options data (not modified in place
+                while in use)
+
+        Returns:
+            DeltaIndex over options_df
+        """
+        if self._delta_index is None or self._delta_index.chain is not options_df:
+            self._delta_index = DeltaIndex(options_df)
+        return self._delta_index
+
     def find_delta_strike(self, options_df: pd.DataFrame, target_delta: float,
-                         option_type: str = 'P', tolerance: float = 0.02) -> Optional[pd.Series]:
+                         option_type: str = 'P', tolerance: float = 0.02,
+                         expiration_ts: Optional[int] = None) -> Optional[pd.Series]:
         """
         Find option strike closest to target delta.
 
@@ -105,55 +166,32 @@ class Strategy:
             target_delta: Target delta (e.g., 0.30 for 30 delta)
             option_type: 'C' or 'P'
             tolerance: Acceptable delta range (e.g., 0.02 for ±2 delta)
+            expiration_ts: Only consider this expiration (µs)
 
         Returns:
             Series with option data or None
         """
-        # Filter by option type
-        filtered = options_df[options_df['option_type'] == option_type].copy()
+        position = self.delta_index(options_df).nearest(target_delta, option_type, tolerance, expiration_ts)
 
-        if len(filtered) == 0:
+        if position is None:
             return None
 
-        # For puts, delta is negative, so use absolute value
-        if option_type == 'P':
-            filtered['abs_delta'] = filtered['delta'].abs()
-            target_delta_abs = abs(target_delta)
-        else:
-            filtered['abs_delta'] = filtered['delta']
-            target_delta_abs = target_delta
-
-        # Find closest to target
-        filtered['delta_diff'] = abs(filtered['abs_delta'] - target_delta_abs)
+        return options_df.iloc[position]
 
-        # Filter by tolerance
-        within_tolerance = filtered[filtered['delta_diff'] <= tolerance]
-
-        if len(within_tolerance) == 0:
-            return None
-
-        # Return closest match
-        closest = within_tolerance.sort_values('delta_diff').iloc[0]
-
-        return closest
-
-    def get_days_to_expiration(self, expiration_ts: int, current_ts: pd.Timestamp) -> float:
+    def get_days_to_expiration(self, expiration_ts: int, current_ts) -> float:
         """
         Calculate days to expiration.
 
         Args:
             expiration_ts: Expiration timestamp (microseconds)
-            current_ts: Current timestamp
+            current_ts: Current timestamp (pd.Timestamp or microseconds)
 
         Returns:
             Days to expiration (float)
         """
-        expiration = pd.Timestamp(expiration_ts, unit='us')
-        dte = (expiration - current_ts).total_seconds() / (24 * 3600)
-
-        return dte
+        return (int(expiration_ts) - to_us(current_ts)) / US_PER_DAY
 
-    def is_near_expiration(self, expiration_ts: int, current_ts: pd.Timestamp,
+    def is_near_expiration(self, expiration_ts: int, current_ts,
                           hours_threshold: float = 1.0) -> bool:
         """
         Check if option is near expiration.
@@ -162,14 +200,13 @@ class Strategy:
 
         Args:
             expiration_ts: Expiration timestamp (microseconds)
-            current_ts: Current timestamp
+            current_ts: Current timestamp (pd.Timestamp or microseconds)
             hours_threshold: Hours threshold (default: 1 hour)
 
         Returns:
             True if near expiration
         """
-        expiration = pd.Timestamp(expiration_ts, unit='us')
-        hours_to_expiry = (expiration - current_ts).total_seconds() / 3600
+        hours_to_expiry = (int(expiration_ts) - to_us(current_ts)) / US_PER_HOUR
 
         return hours_to_expiry < hours_threshold
 
@@ -202,6 +239,25 @@ class Strategy:
 
         return signal
 
+    def cancel_order(self, symbol: str, order_id: str):
+        """
+        Queue the cancel of a resting limit order.
+
+        Limit orders come from signals whose metadata has limit_price;
+        set metadata['order_id'] to choose the ID to cancel by.
+
+        Args:
+            symbol: Underlying symbol
+            order_id: Order to cancel
+        """
+        self.events.put(create_order_event(
+            symbol=symbol,
+            order_type='CANCEL',
+            quantity=0,
+            direction=None,
+            order_id=order_id
+        ))
+
 
 # Example strategy implementation
 
@@ -212,6 +268,9 @@ class BuyAndHoldStrategy(Strategy):
     Buys on first bar, holds until end.
     """
 
+    carried_state = ('invested',)
+    subscription = DataSubscription(columns=())  # Contract, quotes and Greeks only
+
     def __init__(self, events_queue: Queue, data_handler: DataHandler):
         super().__init__(events_queue, data_handler)
         self.invested = False
@@ -0,0 +1,153 @@
+"""
+Strategy data subscriptions.
+
+A strategy declares the slice of the options chain it reads: extra
+columns, DTE window, option types, and a moneyness or delta band.
+DataHandler pushes the subscription into the query that builds
+MarketEvent.data (or applies it to a prefetched block), so strategies
+only pay for the rows and columns they use.
+
+MarketEvent.data always keeps REQUIRED_COLUMNS: open positions are
+marked from it each tick. Contracts outside the band keep their last
+mark until they come back into it or are closed; order execution still
+reads the full chain.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import pandas as pd
+
+from clock import US_PER_DAY
+from positions import GREEKS
+
+
+# Columns every chain slice keeps (contract key, quotes and Greeks for marking)
+REQUIRED_COLUMNS = ('timestamp_available', 'underlying_symbol', 'option_type', 'strike',
+                    'expiration_timestamp', 'underlying_price', 'bid_price', 'ask_price',
+                    'mid_price') + GREEKS
+
+
+@dataclass(frozen=True)
+class DataSubscription:
+    """
+    Slice of the options chain a strategy needs.
+
+    Attributes:
+        columns: Columns beyond REQUIRED_COLUMNS (None = every column)
+        min_dte: Minimum days to expiration
+        max_dte: Maximum days to expiration
+        option_types: 'C' and/or 'P' (None = both)
+        moneyness: (low, high) band on strike / underlying_price
+        abs_delta: (low, high) band on |delta|
+    """
+    columns: Optional[Tuple[str, ...]] = None
+    min_dte: int = 0
+    max_dte: int = 7
+    option_types: Optional[Tuple[str, ...]] = None
+    moneyness: Optional[Tuple[float, float]] = None
+    abs_delta: Optional[Tuple[float, float]] = None
+
+    def __post_init__(self):
+        # Column names end up in the SELECT list
+        for column in self.columns or ():
+            if not column.isidentifier():
+                raise ValueError(f"Invalid column name {column!r}")
+
+    def selected_columns(self) -> Optional[list]:
+        """Columns to load, in order (None = every column)."""
+        if self.columns is None:
+            return None
+        return list(REQUIRED_COLUMNS) + [c for c in self.columns if c not in REQUIRED_COLUMNS]
+
+    def sql(self) -> Tuple[str, str, dict]:
+        """
+        SQL pushdown of the subscription.
+
+        Returns:
+            (select list, extra AND predicates, bound parameters)
+        """
+        columns = self.selected_columns()
+        select = ', '.join(columns) if columns is not None else '*'
+
+        predicates = []
+        params = {}
+        if self.option_types is not None:
+            names = [f'opt_type_{i}' for i in range(len(self.option_types))]
+            predicates.append(f"option_type IN ({', '.join(':' + name for name in names)})")
+            params.update(zip(names, self.option_types))
+        if self.moneyness is not None:
+            predicates.append("strike BETWEEN underlying_price * :moneyness_low AND underlying_price * :moneyness_high")
+            params.update(moneyness_low=self.moneyness[0], moneyness_high=self.moneyness[1])
+        if self.abs_delta is not None:
+            predicates.append("ABS(delta) BETWEEN :delta_low AND :delta_high")
+            params.update(delta_low=self.abs_delta[0], delta_high=self.abs_delta[1])
+
+        where = ''.join(f"\n              AND {predicate}" for predicate in predicates)
+        return select, where, params
+
+    def apply(self, chain: pd.DataFrame, now_us: Optional[int] = None) -> pd.DataFrame:
+        """
+        Apply the row filters and column projection to a loaded chain.
+
+        Args:
+            chain: Loaded chain
+            now_us: Current time (µs) to also restrict to the DTE window;
+                None if the chain is already restricted
+
+        Returns:
+            Subscribed slice (fresh RangeIndex)
+        """
+        if len(chain) > 0:
+            mask = pd.Series(True, index=chain.index)
+            if now_us is not None:
+                mask &= chain['expiration_timestamp'].between(now_us + self.min_dte * US_PER_DAY,
+                                                              now_us + self.max_dte * US_PER_DAY)
+            if self.option_types is not None:
+                mask &= chain['option_type'].isin(self.option_types)
+            if self.moneyness is not None:
+                ratio = chain['strike'] / chain['underlying_price']
+                mask &= ratio.between(*self.moneyness)
+            if self.abs_delta is not None:
+                mask &= chain['delta'].abs().between(*self.abs_delta)
+            chain = chain[mask]
+
+        columns = self.selected_columns()
+        if columns is not None:
+            chain = chain[[c for c in columns if c in chain.columns]]
+
+        return chain.reset_index(drop=True)
+
+    @staticmethod
+    def merge(subscriptions: Iterable[Optional['DataSubscription']]) -> Optional['DataSubscription']:
+        """
+        Smallest subscription covering all of several (for shared data).
+
+        Args:
+            subscriptions: Subscriptions, None meaning the full chain
+
+        Returns:
+            Covering subscription, or None if any wants the full chain
+        """
+        subscriptions = list(subscriptions)
+        if not subscriptions or any(s is None for s in subscriptions):
+            return None
+
+        def union(values):
+            if any(v is None for v in values):
+                return None
+            return tuple(dict.fromkeys(item for v in values for item in v))
+
+        def envelope(bands):
+            if any(b is None for b in bands):
+                return None
+            return (min(b[0] for b in bands), max(b[1] for b in bands))
+
+        return DataSubscription(
+            columns=union([s.columns for s in subscriptions]),
+            min_dte=min(s.min_dte for s in subscriptions),
+            max_dte=max(s.max_dte for s in subscriptions),
+            option_types=union([s.option_types for s in subscriptions]),
+            moneyness=envelope([s.moneyness for s in subscriptions]),
+            abs_delta=envelope([s.abs_delta for s in subscriptions]),
+        )
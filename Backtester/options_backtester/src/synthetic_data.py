@@ -0,0 +1,224 @@
+"""
+Synthetic 0-7 DTE options chains for benchmarks and tests.
+
+Generates point-in-time rows in the options_data_pit schema at a chosen
+scale (symbols x minutes x expirations x strikes). Prices and Greeks are
+Black-Scholes from a random-walk underlying and a volatility surface with
+a put skew, a term structure and a slowly drifting level, so IV rank and
+delta-based strategies behave like they would on real data. Spreads widen
+toward expiration. Output is deterministic for a given seed.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Base underlying prices per symbol (others start at 100)
+BASE_PRICES = {
+    'SPY': 470.0,
+    'QQQ': 400.0,
+    'IWM': 195.0,
+}
+
+# Strike spacing per symbol (others use 1.0)
+STRIKE_STEPS = {
+    'SPY': 1.0,
+    'QQQ': 1.0,
+    'IWM': 0.5,
+}
+
+MINUTES_PER_DAY = 390  # 9:30 to 16:00
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    from scipy.special import ndtr
+    return ndtr(x)
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def black_scholes(S: np.ndarray, K: np.ndarray, T: np.ndarray, sigma: np.ndarray,
+                  is_call: np.ndarray, r: float = 0.05) -> Dict[str, np.ndarray]:
+    """
+    Vectorized Black-Scholes prices and Greeks.
+
+    Args:
+        S: Underlying prices
+        K: Strikes
+        T: Years to expiration
+        sigma: Implied volatilities
+        is_call: Boolean mask of calls
+        r: Risk-free rate
+
+    Returns:
+        Dict with price, delta, gamma, theta (per day), vega (per 1%), rho (per 1%)
+    """
+    sqrt_t = np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    discount = np.exp(-r * T)
+    pdf_d1 = _norm_pdf(d1)
+
+    call_price = S * _norm_cdf(d1) - K * discount * _norm_cdf(d2)
+    put_price = K * discount * _norm_cdf(-d2) - S * _norm_cdf(-d1)
+
+    common_theta = -S * pdf_d1 * sigma / (2 * sqrt_t)
+    call_theta = common_theta - r * K * discount * _norm_cdf(d2)
+    put_theta = common_theta + r * K * discount * _norm_cdf(-d2)
+
+    return {
+        'price': np.where(is_call, call_price, put_price),
+        'delta': np.where(is_call, _norm_cdf(d1), _norm_cdf(d1) - 1),
+        'gamma': pdf_d1 / (S * sigma * sqrt_t),
+        'theta': np.where(is_call, call_theta, put_theta) / 365,
+        'vega': S * pdf_d1 * sqrt_t / 100,
+        'rho': np.where(is_call, K * T * discount * _norm_cdf(d2),
+                        -K * T * discount * _norm_cdf(-d2)) / 100,
+    }
+
+
+def generate_chains(symbols: Optional[List[str]] = None, days: int = 2,
+                    minutes: int = 120, strikes: int = 21, expirations: int = 4,
+                    start_date: str = '2024-01-15', seed: int = 42) -> pd.DataFrame:
+    """
+    Generate synthetic options chain snapshots.
+
+    Args:
+        symbols: Underlying symbols (default: ['SPY'])
+        days: Trading days
+        minutes: One-minute snapshots per day, starting at 9:30 (max 390)
+        strikes: Strikes per expiration, centered on the money
+        expirations: Daily expirations listed per snapshot (0 DTE first, max 8)
+        start_date: First trading day (YYYY-MM-DD)
+        seed: Random seed
+
+    Returns:
+        DataFrame in the options_data_pit schema (without id)
+    """
+    symbols = symbols or ['SPY']
+    minutes = min(minutes, MINUTES_PER_DAY)
+    expirations = min(expirations, 8)
+    rng = np.random.default_rng(seed)
+
+    sessions = pd.bdate_range(start_date, periods=days + expirations)
+    trading_days = sessions[:days]
+    frames = []
+
+    for symbol in symbols:
+        spot = BASE_PRICES.get(symbol, 100.0)
+        step = STRIKE_STEPS.get(symbol, 1.0)
+        vol_level = 0.16
+
+        for day_index, day in enumerate(trading_days):
+            # One-minute underlying path and a slowly drifting vol level
+            returns = rng.normal(0, 0.0004, minutes)
+            path = spot * np.exp(np.cumsum(returns))
+            spot = path[-1]
+            vol_path = np.clip(vol_level + np.cumsum(rng.normal(0, 0.0015, minutes)), 0.08, 0.6)
+            vol_level = vol_path[-1]
+
+            timestamps = day + pd.Timedelta(hours=9, minutes=30) + pd.to_timedelta(np.arange(minutes), unit='min')
+            expiry_dates = sessions[day_index:day_index + expirations] + pd.Timedelta(hours=16)
+
+            # Grid: minute x expiration x strike x type
+            n_contracts = expirations * strikes * 2
+            minute_idx = np.repeat(np.arange(minutes), n_contracts)
+            expiry_idx = np.tile(np.repeat(np.arange(expirations), strikes * 2), minutes)
+            strike_offset = np.tile(np.repeat(np.arange(strikes) - strikes // 2, 2), minutes * expirations)
+            is_call = np.tile(np.array([True, False]), minutes * expirations * strikes)
+
+            S = path[minute_idx]
+            atm = np.round(path[0] / step) * step
+            K = atm + strike_offset * step
+
+            ts_us = timestamps.as_unit('us').asi8[minute_idx]
+            exp_us = expiry_dates.as_unit('us').asi8[expiry_idx]
+            T = np.maximum((exp_us - ts_us) / 1e6 / (365 * 86400), 1e-6)
+
+            # Put skew and short-dated term structure on top of the vol level
+            moneyness = np.log(K / S)
+            sigma = vol_path[minute_idx] * (1 - 1.5 * moneyness + 8 * moneyness ** 2) * (1 + 0.02 * expiry_idx)
+            sigma = np.clip(sigma, 0.05, 2.0)
+
+            bs = black_scholes(S, K, T, sigma, is_call)
+            mid = np.maximum(bs['price'], 0.01)
+
+            # Spreads widen toward expiration
+            hours_to_expiry = T * 365 * 24
+            spread = np.maximum(0.01, mid * (0.02 + 0.08 / (1 + hours_to_expiry)))
+            bid = np.maximum(mid - spread / 2, 0.0)
+            ask = mid + spread / 2
+
+            option_type = np.where(is_call, 'C', 'P')
+            expiry_codes = pd.DatetimeIndex(expiry_dates).strftime('%y%m%d').to_numpy()[expiry_idx]
+            contract_symbol = (
+                symbol + pd.Series(expiry_codes) + pd.Series(option_type)
+                + pd.Series((K * 1000).astype(np.int64)).astype(str).str.zfill(8)
+            ).to_numpy()
+
+            frames.append(pd.DataFrame({
+                'timestamp_available': ts_us,
+                'timestamp_recorded': ts_us,
+                'symbol': contract_symbol,
+                'underlying_symbol': symbol,
+                'option_type': option_type,
+                'strike': K,
+                'expiration_timestamp': exp_us,
+                'underlying_price': S,
+                'bid_price': bid,
+                'ask_price': ask,
+                'mid_price': mid,
+                'last_price': mid,
+                'delta': bs['delta'],
+                'gamma': bs['gamma'],
+                'theta': bs['theta'],
+                'vega': bs['vega'],
+                'rho': bs['rho'],
+                'implied_vol': sigma,
+                'volume': rng.poisson(50 * np.exp(-8 * np.abs(moneyness))),
+                'open_interest': rng.poisson(500 * np.exp(-8 * np.abs(moneyness))),
+                'bid_ask_spread': ask - bid,
+                'is_stale': 0,
+                'quote_age_seconds': 0,
+            }))
+
+    return pd.concat(frames, ignore_index=True).sort_values(
+        ['timestamp_available', 'underlying_symbol'], kind='stable', ignore_index=True
+    )
+
+
+def write_synthetic_db(db_path: str, chunk_size: int = 100000, **scale) -> int:
+    """
+    Create a SQLite database filled with synthetic chains.
+
+    Args:
+        db_path: SQLite file to create (existing data is kept)
+        chunk_size: Rows per insert batch
+        **scale: Arguments for generate_chains()
+
+    Returns:
+        Number of rows inserted
+    """
+    from database import get_database
+
+    db = get_database(db_type='sqlite', db_path=db_path)
+    db.create_schema()
+
+    df = generate_chains(**scale)
+    df.to_sql('options_data_pit', db.engine, if_exists='append', index=False,
+              chunksize=chunk_size)
+
+    return len(df)
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    df = generate_chains(symbols=['SPY', 'QQQ'], days=2, minutes=60, strikes=21, expirations=4)
+    print(f"Generated {len(df):,} rows in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print(df[['symbol', 'strike', 'option_type', 'mid_price', 'delta', 'implied_vol']].head(10))
@@ -9,23 +9,30 @@ import pandas as pd
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
+from clock import MARKET_OPEN_US, US_PER_DAY, US_PER_MINUTE, from_us, to_us
+
 
 class MultiTimeframeAggregator:
     """Aggregate 1-minute bars into multiple timeframes"""
 
-    def __init__(self, timeframes: List[int] = None):
+    def __init__(self, timeframes: List[int] = None, calendar=None):
         """
         Initialize aggregator.
 
         Args:
             timeframes: List of timeframes in minutes (default: [3, 5, 15, 30, 60, 120, 240])
+            calendar: TradingCalendar for session opens (default: 9:30am every day)
         """
         if timeframes is None:
             timeframes = [3, 5, 15, 30, 60, 120, 240]
 
         self.timeframes = timeframes
+        self.calendar = calendar
         self.bars = {tf: [] for tf in timeframes}
         self.current_bars = {tf: None for tf in timeframes}
+        self._bar_starts = {tf: None for tf in timeframes}  # Current bar start per timeframe (µs)
+        self._day = None  # Day and open (µs) of the last bar aggregated
+        self._open = None
 
     def aggregate_bar(self, minute_bar: dict):
         """
@@ -34,21 +41,22 @@ class MultiTimeframeAggregator:
         Args:
             minute_bar: Dict with timestamp, open, high, low, close, volume
         """
-        timestamp = minute_bar['timestamp']
+        us = to_us(minute_bar['timestamp'])
 
         for tf in self.timeframes:
             # Determine bar boundary
-            bar_start = self._get_bar_start(timestamp, tf)
+            bar_start = self._get_bar_start_us(us, tf)
 
             # Check if we need to create a new bar
-            if self.current_bars[tf] is None or self.current_bars[tf]['timestamp'] != bar_start:
+            if self.current_bars[tf] is None or self._bar_starts[tf] != bar_start:
                 # Save the completed bar if exists
                 if self.current_bars[tf] is not None:
                     self.bars[tf].append(self.current_bars[tf].copy())
 
                 # Create new bar
+                self._bar_starts[tf] = bar_start
                 self.current_bars[tf] = {
-                    'timestamp': bar_start,
+                    'timestamp': from_us(bar_start),
                     'open': minute_bar['open'],
                     'high': minute_bar['high'],
                     'low': minute_bar['low'],
@@ -73,27 +81,19 @@ class MultiTimeframeAggregator:
         Returns:
             Start timestamp of the bar
         """
-        # Market opens at 9:30 AM ET
-        market_open_hour = 9
-        market_open_minute = 30
-
-        # Calculate minutes since market open
-        current_minutes = (timestamp.hour - market_open_hour) * 60 + (timestamp.minute - market_open_minute)
-
-        # Find which bar this belongs to
-        bar_number = current_minutes // timeframe_minutes
-
-        # Calculate bar start time
-        bar_start_minutes = bar_number * timeframe_minutes
-        bar_hour = market_open_hour + (market_open_minute + bar_start_minutes) // 60
-        bar_minute = (market_open_minute + bar_start_minutes) % 60
-
-        return timestamp.replace(
-            hour=bar_hour,
-            minute=bar_minute,
-            second=0,
-            microsecond=0
-        )
+        return from_us(self._get_bar_start_us(to_us(timestamp), timeframe_minutes))
+
+    def _get_bar_start_us(self, us: int, timeframe_minutes: int) -> int:
+        """_get_bar_start() in microseconds."""
+        # Session open (9:30 AM ET), looked up once per day
+        day = us - us % US_PER_DAY
+        if day != self._day:
+            self._day = day
+            self._open = self.calendar.session_bounds(day)[0] if self.calendar is not None else day + MARKET_OPEN_US
+
+        # Whole minutes since the open, floored to the timeframe
+        minutes = (us - self._open) // US_PER_MINUTE
+        return self._open + (minutes // timeframe_minutes) * timeframe_minutes * US_PER_MINUTE
 
     def get_bar(self, timeframe: int, timestamp: pd.Timestamp = None) -> Optional[dict]:
         """
@@ -0,0 +1,178 @@
+"""
+Exchange trading calendar.
+
+Sessions are weekdays that are not NYSE holidays; early-close days
+(July 3, the day after Thanksgiving, Christmas Eve) end at 1:00pm. For
+the backtest window the calendar precomputes, keyed by day (midnight in
+µs, see clock.py):
+
+- each session's open, auto-close cutoff (5 minutes before the close)
+  and close
+- the next session after every calendar day (T+1 settlement)
+
+so the event loop's lookups are single dict hits. Days outside the
+window are computed on demand from the same rules and cached.
+
+Ticks on days the rules call closed (e.g. synthetic data on a holiday)
+get regular hours; they never count as a session for settlement.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USLaborDay, USMartinLutherKingJr,
+    USMemorialDay, USPresidentsDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+
+from clock import US_PER_DAY, US_PER_MINUTE, MARKET_OPEN_US, MARKET_CLOSE_US, day_start, to_us
+
+
+EARLY_CLOSE_US = 13 * 60 * US_PER_MINUTE  # 1:00pm
+AUTO_CLOSE_LEAD_US = 5 * US_PER_MINUTE  # Flatten 5 minutes before the close (3:55pm)
+
+# Days of padding around the window in the lookup tables
+WINDOW_PADDING_DAYS = 14
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """NYSE full-day holidays."""
+
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-01-01', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ]
+
+
+class TradingCalendar:
+    """
+    Session dates, session times and next-session lookups.
+
+    All times are int64 microseconds; days are keyed by their midnight.
+    """
+
+    def __init__(self, start_date=None, end_date=None, holidays: Optional[Iterable] = None,
+                 early_closes: Optional[Iterable] = None):
+        """
+        Precompute the tables for a backtest window.
+
+        Args:
+            start_date: First day of the window (None = no precomputation)
+            end_date: Last day of the window
+            holidays: Closed dates (default: NYSE holidays)
+            early_closes: 1:00pm close dates (default: NYSE early closes)
+        """
+        self._rule_based = holidays is None
+        self._holidays = set() if holidays is None else {to_us(pd.Timestamp(d).normalize()) for d in holidays}
+        self._early_rule_based = early_closes is None
+        self._early = set() if early_closes is None else {to_us(pd.Timestamp(d).normalize()) for d in early_closes}
+        self._years = set()  # Years whose rule-based dates are loaded
+
+        self._sessions: Dict[int, Tuple[int, int, int]] = {}  # day -> (open, cutoff, close)
+        self._closed = set()  # Days known not to be sessions
+        self._next: Dict[int, int] = {}  # day -> next session day
+
+        if start_date is not None:
+            first = to_us(pd.Timestamp(start_date).normalize()) - WINDOW_PADDING_DAYS * US_PER_DAY
+            last = to_us(pd.Timestamp(end_date if end_date is not None else start_date).normalize())
+            last += WINDOW_PADDING_DAYS * US_PER_DAY
+
+            following = None
+            for day in range(last, first - 1, -US_PER_DAY):
+                if following is not None:
+                    self._next[day] = following
+                if self.is_session(day):
+                    following = day
+
+    def _load_year(self, year: int):
+        """Load rule-based holidays and early closes for a year."""
+        if year in self._years:
+            return
+        self._years.add(year)
+
+        if self._rule_based:
+            dates = NYSEHolidayCalendar().holidays(f'{year - 1}-12-01', f'{year + 1}-01-31')
+            self._holidays.update(to_us(date) for date in dates)
+
+        if self._early_rule_based:
+            for date in (f'{year}-07-03', f'{year}-12-24'):
+                date = pd.Timestamp(date)
+                if date.weekday() < 5:
+                    self._early.add(to_us(date))
+            thanksgiving = USThanksgivingDay.dates(f'{year}-01-01', f'{year}-12-31')
+            self._early.update(to_us(date + pd.Timedelta(days=1)) for date in thanksgiving)
+
+    def is_session(self, us: int) -> bool:
+        """True if the day containing us is a trading session."""
+        day = day_start(us)
+        if day in self._sessions:
+            return True
+        if day in self._closed:
+            return False
+
+        date = pd.Timestamp(day, unit='us')
+        self._load_year(date.year)
+
+        if date.weekday() >= 5 or day in self._holidays:
+            self._closed.add(day)
+            return False
+
+        close = day + (EARLY_CLOSE_US if day in self._early and day not in self._holidays else MARKET_CLOSE_US)
+        self._sessions[day] = (day + MARKET_OPEN_US, close - AUTO_CLOSE_LEAD_US, close)
+        return True
+
+    def session_bounds(self, us: int) -> Tuple[int, int, int]:
+        """
+        Open, auto-close cutoff and close of the day containing us.
+
+        Args:
+            us: Any time in the day (µs)
+
+        Returns:
+            (open, cutoff, close) in µs; regular hours on closed days
+        """
+        day = day_start(us)
+        bounds = self._sessions.get(day)
+        if bounds is not None:
+            return bounds
+        if self.is_session(day):
+            return self._sessions[day]
+        return (day + MARKET_OPEN_US, day + MARKET_CLOSE_US - AUTO_CLOSE_LEAD_US, day + MARKET_CLOSE_US)
+
+    def in_auto_close(self, us: int) -> bool:
+        """True from the auto-close cutoff until the close."""
+        _, cutoff, close = self.session_bounds(us)
+        return cutoff <= us < close
+
+    def next_session(self, us: int) -> int:
+        """
+        First session strictly after the day containing us.
+
+        Args:
+            us: Any time in the day (µs)
+
+        Returns:
+            Midnight of the next session (µs)
+        """
+        day = day_start(us)
+        following = self._next.get(day)
+        if following is not None:
+            return following
+
+        following = day + US_PER_DAY
+        while not self.is_session(following):
+            following += US_PER_DAY
+        self._next[day] = following
+        return following
+
+    def settlement_time(self, us: int) -> int:
+        """T+1 settlement of a trade at us: the open of the next session."""
+        return self.session_bounds(self.next_session(us))[0]
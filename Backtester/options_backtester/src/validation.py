@@ -13,7 +13,6 @@ CRITICAL: Never test on same out-of-sample data multiple times!
 import numpy as np
 import pandas as pd
 from scipy.stats import norm
-from sklearn.model_selection import TimeSeriesSplit
 from typing import Dict, List, Callable, Any
 from itertools import product
 
@@ -62,6 +61,9 @@ class WalkForwardOptimizer:
         Returns:
             (results_list, walk_forward_efficiency)
         """
+        # Deferred: sklearn is heavy and only needed for walk-forward runs
+        from sklearn.model_selection import TimeSeriesSplit
+
         print("\n" + "="*60)
         print("WALK-FORWARD OPTIMIZATION")
         print("="*60)
@@ -0,0 +1,87 @@
+"""
+Shared test fixtures: synthetic chain databases, a one-snapshot data
+handler stand-in and helper strategies.
+"""
+
+import io
+import os
+import sys
+from contextlib import redirect_stdout
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from database import get_database
+from strategy import Strategy
+from synthetic_data import generate_chains, write_synthetic_db
+
+
+class SnapshotData:
+    """Minimal DataHandler stand-in serving one chain snapshot."""
+
+    def __init__(self, chain: pd.DataFrame, timestamp: pd.Timestamp):
+        self.chain = chain
+        self.current_timestamp = timestamp
+
+    def get_options_chain(self, symbol, min_dte=0, max_dte=7):
+        return self.chain[self.chain['underlying_symbol'] == symbol]
+
+
+class MorningPutSeller(Strategy):
+    """Sells one put at 10:00 every day (no state carried between days)."""
+
+    def calculate_signals(self, market_event):
+        if market_event.timestamp.time() != pd.Timestamp('10:00').time():
+            return
+
+        for symbol, data in market_event.data.items():
+            puts = data[data['option_type'] == 'P']
+            if len(puts) > 0:
+                option = puts.iloc[len(puts) // 2]
+                self.create_signal(symbol, 'SHORT', strength=1.0, strikes=[option['strike']],
+                                   metadata={'option_type': 'P', 'delta': option['delta']})
+
+
+@pytest.fixture(scope='session')
+def synthetic_db(tmp_path_factory):
+    """
+    Factory for SQLite databases of synthetic chains.
+
+    synthetic_db(symbols=('SPY',), **scale) takes generate_chains()
+    arguments. Each scale is written once per session and shared by
+    every test asking for it, so tests must not write to it.
+    """
+    databases = {}
+
+    def make(symbols=('SPY',), **scale):
+        key = (tuple(symbols), tuple(sorted(scale.items())))
+        if key not in databases:
+            db_path = str(tmp_path_factory.mktemp('synthetic') / 'synthetic.db')
+            write_synthetic_db(db_path, symbols=list(symbols), **scale)
+            databases[key] = get_database(db_type='sqlite', db_path=db_path)
+        return databases[key]
+
+    return make
+
+
+@pytest.fixture
+def snapshot():
+    """SnapshotData over one minute of SPY: 21 strikes, 2 expirations."""
+    chain = generate_chains(symbols=['SPY'], days=1, minutes=1, strikes=21, expirations=2)
+    timestamp = pd.Timestamp(int(chain['timestamp_available'].iloc[0]), unit='us')
+    return SnapshotData(chain, timestamp)
+
+
+@pytest.fixture
+def morning_put_seller():
+    """MorningPutSeller strategy class."""
+    return MorningPutSeller
+
+
+@pytest.fixture
+def silent():
+    """Context manager factory muting stdout (run banners bypass the event logger)."""
+    return lambda: redirect_stdout(io.StringIO())
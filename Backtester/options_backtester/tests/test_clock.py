@@ -0,0 +1,67 @@
+"""
+Tests for the integer microsecond event loop clock.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from clock import SessionClock, US_PER_DAY, from_us, to_us
+from data_handler import DataHandler
+from strategy import Strategy
+
+
+def test_session_boundaries_follow_the_day():
+    clock = SessionClock()
+    clock.advance(to_us('2024-01-15 15:54:59'))
+
+    assert from_us(clock.open) == pd.Timestamp('2024-01-15 09:30')
+    assert from_us(clock.cutoff) == pd.Timestamp('2024-01-15 15:55')
+    assert from_us(clock.close) == pd.Timestamp('2024-01-15 16:00')
+    assert not clock.in_auto_close()
+
+    clock.advance(to_us('2024-01-15 15:55'))
+    assert clock.in_auto_close()
+
+    clock.advance(to_us('2024-01-16 10:00'))
+    assert from_us(clock.cutoff) == pd.Timestamp('2024-01-16 15:55')
+    assert not clock.in_auto_close()
+    assert clock.days_to(clock.now + US_PER_DAY // 2) == 0.5
+
+
+def test_auto_close_window_matches_wall_clock():
+    for time_of_day in ('09:30', '15:54:59.999999', '15:55', '15:59:59', '16:00', '16:30'):
+        timestamp = pd.Timestamp(f'2024-01-15 {time_of_day}')
+        expected = pd.Timestamp('15:55').time() <= timestamp.time() < pd.Timestamp('16:00').time()
+
+        clock = SessionClock()
+        clock.advance(to_us(timestamp))
+        assert clock.in_auto_close() == expected
+
+
+def test_data_handler_clock_tracks_current_timestamp(synthetic_db):
+    db = synthetic_db(days=2, minutes=3, strikes=3, expirations=1)
+    data = DataHandler(db.get_connection(), '2024-01-15', '2024-01-17', ['SPY'],
+                       enable_multi_timeframe=False)
+
+    ticks = list(data.get_all_timestamps_us())
+    seen = []
+    while (market_event := data.update_bars()) is not None:
+        assert to_us(market_event.timestamp) == data.clock.now
+        seen.append(data.clock.now)
+    assert seen == ticks
+
+    # Setting current_timestamp directly (tests, tools) moves the clock too
+    data.current_timestamp = pd.Timestamp('2024-01-15 10:00')
+    assert data.clock.now == to_us('2024-01-15 10:00')
+
+    strategy = Strategy(Queue(), data)
+    expiration_ts = to_us('2024-01-16 16:00')
+    assert strategy.get_days_to_expiration(expiration_ts, data.current_timestamp) == 1.25
+    assert strategy.get_days_to_expiration(expiration_ts, data.clock.now) == 1.25
+    assert not strategy.is_near_expiration(expiration_ts, data.clock.now)
@@ -0,0 +1,74 @@
+"""
+Tests for compact chain dtypes.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backtest import Backtest
+from compact import compact_chain, frame_nbytes
+from data_handler import DataHandler
+from synthetic_data import generate_chains
+
+
+SCALE = dict(days=2, minutes=390, strikes=5, expirations=1)
+
+
+def test_compact_chain_keeps_keys_and_values():
+    chain = generate_chains(symbols=['SPY', 'QQQ'], days=1, minutes=5, strikes=5, expirations=2)
+    compact = compact_chain(chain, symbols=['SPY', 'QQQ'])
+
+    assert compact['mid_price'].dtype == np.float32 and compact['delta'].dtype == np.float32
+    assert compact['is_stale'].dtype == np.uint8
+    assert list(compact['option_type'].cat.categories) == ['C', 'P']
+    assert list(compact['underlying_symbol'].cat.categories) == ['SPY', 'QQQ']
+
+    # Contract keys are untouched, prices round-trip to float32 precision
+    for column in ('strike', 'expiration_timestamp', 'timestamp_available'):
+        assert compact[column].dtype == chain[column].dtype
+        assert compact[column].equals(chain[column])
+    assert (compact['option_type'] == 'P').equals(chain['option_type'] == 'P')
+    assert np.allclose(compact['mid_price'], chain['mid_price'], rtol=1e-6)
+
+    assert frame_nbytes(compact) < frame_nbytes(chain) / 2
+
+
+def test_compact_prefetched_run_matches_full_dtypes(synthetic_db, morning_put_seller, silent):
+    """Same trades as a float64 run, prices within float32 rounding."""
+    db = synthetic_db(**SCALE)
+    settings = dict(symbols=['SPY'], start_date='2024-01-15', end_date='2024-01-17',
+                    initial_capital=100000, strategy_class=morning_put_seller, quiet=True,
+                    enable_checkpoints=False)
+
+    with silent():
+        full = Backtest(db_connection=db.get_connection(), **settings).run(verbose=False)
+        compact = Backtest(db_connection=db.get_connection(), prefetch_depth=1,
+                           compact_dtypes=True, **settings).run(verbose=False)
+
+    assert compact['total_trades'] == full['total_trades'] > 0
+    assert np.allclose(compact['trades']['fill_price'], full['trades']['fill_price'], atol=1e-4)
+    assert np.isclose(compact['final_value'], full['final_value'], atol=0.1)
+
+    # Cash is still accounted in float64
+    assert compact['equity_curve']['settled_cash'].dtype == np.float64
+
+    memory = compact['chain_memory']
+    assert memory['chains'] == 2  # One block per session
+    assert memory['compact_bytes'] < memory['full_bytes']
+    assert memory['saved_pct'] > 50
+
+
+def test_compact_queries_return_compact_chains(synthetic_db):
+    data = DataHandler(synthetic_db(**SCALE).get_connection(), '2024-01-15', '2024-01-17', ['SPY'],
+                       enable_multi_timeframe=False, compact_dtypes=True)
+    chain = data.update_bars().data['SPY']
+
+    assert chain['bid_price'].dtype == np.float32
+    assert isinstance(chain['symbol'].dtype, pd.CategoricalDtype)
+    assert data.memory_stats()['chains'] == 1
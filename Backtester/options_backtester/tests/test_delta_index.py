@@ -0,0 +1,94 @@
+"""
+Tests for the sorted delta index.
+
+find_delta_strike must pick the same option as the filter-copy-sort
+search it replaced, for every type, target and tolerance.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from delta_index import DeltaIndex
+from strategy import BuyAndHoldStrategy
+
+
+def make_chain(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    option_type = rng.choice(['C', 'P'], n)
+    delta = rng.uniform(0.0, 1.0, n)
+    delta[rng.random(n) < 0.05] = np.nan  # Missing Greeks
+    return pd.DataFrame({
+        'strike': rng.uniform(400, 500, n).round(),
+        'option_type': option_type,
+        'expiration_timestamp': rng.choice([10**15, 2 * 10**15, 3 * 10**15], n),
+        'delta': np.where(option_type == 'P', -delta, delta),
+        'mid_price': rng.uniform(0.05, 10.0, n),
+    }, index=rng.permutation(n) + 1000)  # Non-positional labels
+
+
+def reference_delta_strike(options_df, target_delta, option_type, tolerance):
+    """The filter, copy and sort search (without ties, which it ordered arbitrarily)."""
+    filtered = options_df[options_df['option_type'] == option_type].copy()
+    abs_delta = filtered['delta'].abs() if option_type == 'P' else filtered['delta']
+    filtered['delta_diff'] = abs(abs_delta - (abs(target_delta) if option_type == 'P' else target_delta))
+    within_tolerance = filtered[filtered['delta_diff'] <= tolerance]
+    if len(within_tolerance) == 0:
+        return None
+    return within_tolerance.sort_values('delta_diff', kind='stable').iloc[0]
+
+
+def test_find_delta_strike_matches_reference():
+    strategy = BuyAndHoldStrategy(Queue(), None)
+    chain = make_chain()
+
+    for option_type in ('C', 'P'):
+        for target in (0.0, 0.05, 0.16, -0.30, 0.5, 0.999, 1.2):
+            for tolerance in (0.0, 0.001, 0.02, 0.5):
+                expected = reference_delta_strike(chain, target, option_type, tolerance)
+                found = strategy.find_delta_strike(chain, target, option_type, tolerance)
+
+                if expected is None:
+                    assert found is None
+                else:
+                    assert found.name == expected.name
+                    assert found.equals(expected.drop('delta_diff'))
+
+
+def test_index_is_built_once_per_snapshot():
+    strategy = BuyAndHoldStrategy(Queue(), None)
+    chain = make_chain()
+
+    index = strategy.delta_index(chain)
+    strategy.find_delta_strike(chain, 0.30, 'P')
+    strategy.find_delta_strike(chain, 0.30, 'C')
+    assert strategy.delta_index(chain) is index
+
+    assert strategy.delta_index(chain.copy()) is not index
+
+
+def test_per_expiration_queries():
+    chain = make_chain(seed=1)
+    index = DeltaIndex(chain)
+    expiration = 2 * 10**15
+
+    expiry_puts = chain[(chain['expiration_timestamp'] == expiration) & (chain['option_type'] == 'P')]
+    abs_delta = expiry_puts['delta'].abs()
+
+    position = index.nearest(0.30, 'P', tolerance=0.1, expiration_ts=expiration)
+    assert chain.index[position] == (abs_delta - 0.30).abs().idxmin()
+
+    positions = index.between(0.2, 0.4, 'P', expiration_ts=expiration)
+    in_range = abs_delta[(abs_delta >= 0.2) & (abs_delta <= 0.4)]
+    assert set(chain.index[positions]) == set(in_range.index)
+    assert np.all(np.diff(chain['delta'].abs().to_numpy()[positions]) >= 0)
+
+    assert index.nearest(0.30, 'P', expiration_ts=12345) is None
+    assert len(index.between(0.0, 1.0, 'C', expiration_ts=12345)) == 0
+    assert DeltaIndex(chain.iloc[:0]).nearest(0.30) is None
@@ -0,0 +1,49 @@
+"""
+Tests for the level-gated event logger.
+
+Disabled records must cost no formatting, and the ring sink must keep
+only the most recent records.
+"""
+
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from event_log import EventLogger, make_logger, WARNING
+
+
+class ExplodingArg:
+    """Fails the test if a disabled record is formatted."""
+
+    def __format__(self, spec):
+        raise AssertionError("disabled record was formatted")
+
+
+def test_disabled_records_are_never_formatted():
+    """quiet and level gating skip formatting and output entirely."""
+    buffer = io.StringIO()
+
+    with redirect_stdout(buffer):
+        make_logger(quiet=True).warning("Fill {}", ExplodingArg())
+        EventLogger(level=WARNING).info("Fill {}", ExplodingArg())
+        EventLogger().info("Executed {} {} @ ${:,.2f}", 'BUY', 2, 1234.5)
+
+    assert buffer.getvalue() == "Executed BUY 2 @ $1,234.50\n"
+
+
+def test_ring_sink_keeps_latest_records():
+    """Ring buffer holds the last N records, formatted on read."""
+    logger = EventLogger(sink='ring', capacity=3)
+
+    for i in range(10):
+        logger.info("Position updated: SPY {} contracts", i)
+
+    assert logger.records() == [
+        "Position updated: SPY 7 contracts",
+        "Position updated: SPY 8 contracts",
+        "Position updated: SPY 9 contracts",
+    ]
@@ -0,0 +1,41 @@
+"""
+Tests for event objects and the lock-free event bus.
+"""
+
+import sys
+import os
+from dataclasses import FrozenInstanceError
+from queue import Empty
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from events import EventBus, EventType, create_signal_event, create_order_event
+
+
+def test_events_are_slotted_and_frozen():
+    """Events carry no per-instance dict and cannot be changed once queued."""
+    signal = create_signal_event('SPY', 'SHORT', strikes=[470.0])
+    order = create_order_event('SPY', 'MARKET', 1, 'SELL', strikes=[470.0], option_types=['P'])
+
+    for event in (signal, order):
+        assert not hasattr(event, '__dict__')
+    with pytest.raises(FrozenInstanceError):
+        order.quantity = 2
+    assert order.type == EventType.ORDER and not order.is_multi_leg
+
+
+def test_event_bus_is_fifo_and_raises_empty():
+    """EventBus behaves like the Queue subset the event loop relies on."""
+    bus = EventBus()
+    assert bus.empty()
+
+    for strike in (470.0, 471.0, 472.0):
+        bus.put(create_signal_event('SPY', 'LONG', strikes=[strike]))
+    assert bus.qsize() == 3
+
+    assert [bus.get(block=False).strikes[0] for _ in range(3)] == [470.0, 471.0, 472.0]
+    with pytest.raises(Empty):
+        bus.get(block=False)
@@ -0,0 +1,143 @@
+"""
+Tests for the vectorized slippage model and fill quotes.
+
+The batch model must price every order exactly like the per-order model,
+across all DTE, IV, spread and size tiers.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_handler import DataHandler
+from events import create_order_event, create_spread_order
+from execution import ExecutionHandler
+from event_log import EventLogger
+
+
+def make_quotes(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    mid = rng.uniform(0.01, 10.0, n)
+    spread = mid * rng.uniform(0.0, 0.5, n)
+    return pd.DataFrame({
+        'bid_price': np.maximum(mid - spread / 2, 0.0),
+        'ask_price': mid + spread / 2,
+        'mid_price': mid,
+        'implied_vol': rng.uniform(0.1, 0.8, n),
+        'hours': rng.choice([0.1, 0.5, 0.99, 2.0, 3.9, 24.0, 120.0], n),
+        'quantity': rng.choice([1, 10, 11, 50, 51, 100, 101, 500], n),
+        'side': rng.choice(['BUY', 'SELL'], n),
+    })
+
+
+def test_batch_matches_scalar_model():
+    """Every order gets the same fill, slippage and quality in batch."""
+    execution = ExecutionHandler(Queue(), None, logger=EventLogger(sink='off'))
+    quotes = make_quotes()
+
+    fill_prices, slippages, qualities = execution.model_slippage_batch(
+        quotes, quotes['side'].to_numpy(), quotes['hours'].to_numpy(), quotes['quantity'].to_numpy()
+    )
+
+    for i, row in quotes.iterrows():
+        fill_price, slippage, quality = execution.model_slippage(
+            row, row['side'], row['hours'], row['quantity']
+        )
+        assert np.isclose(fill_prices[i], fill_price)
+        assert np.isclose(slippages[i], slippage)
+        assert qualities[i] == quality
+
+
+def test_reprice_fills_under_stressed_slippage():
+    """Doubling base slippage makes every historical fill more expensive."""
+    execution = ExecutionHandler(Queue(), None, logger=EventLogger(sink='off'))
+    quotes = make_quotes(50, seed=1)
+    quotes = quotes[quotes['ask_price'] - quotes['bid_price'] > 0.01].reset_index(drop=True)
+
+    fill_prices, slippages, qualities = execution.model_slippage_batch(
+        quotes, quotes['side'].to_numpy(), quotes['hours'].to_numpy(), quotes['quantity'].to_numpy()
+    )
+    fills = quotes.rename(columns={'side': 'direction', 'hours': 'hours_to_expiry'})
+    fills['fill_price'] = fill_prices
+
+    repriced = execution.reprice_fills(fills, base_slippage_pct=execution.base_slippage_pct * 2)
+
+    # Fills floored at $0.01 cannot get worse
+    floored = repriced['repriced_fill_price'] <= 0.01
+    assert (repriced.loc[~floored, 'cost_delta'] > 0).all()
+    assert (repriced['repriced_slippage'] > slippages).all()
+
+
+def test_reprice_fills_keeps_limit_fills():
+    """Limit fills traded at their limit: they keep their price under any slippage."""
+    execution = ExecutionHandler(Queue(), None, logger=EventLogger(sink='off'))
+    quotes = make_quotes(50, seed=2)
+    quotes = quotes[quotes['ask_price'] - quotes['bid_price'] > 0.01].reset_index(drop=True)
+
+    fill_prices, slippages, qualities = execution.model_slippage_batch(
+        quotes, quotes['side'].to_numpy(), quotes['hours'].to_numpy(), quotes['quantity'].to_numpy()
+    )
+    fills = quotes.rename(columns={'side': 'direction', 'hours': 'hours_to_expiry'})
+    fills['order_type'] = np.where(np.arange(len(fills)) % 2 == 0, 'LIMIT', 'MARKET')
+    is_limit = fills['order_type'] == 'LIMIT'
+    fills['fill_price'] = np.where(is_limit, fills['mid_price'], fill_prices)
+    fills['slippage'] = np.where(is_limit, 0.0, slippages)
+    fills['execution_quality'] = np.where(is_limit, 'GOOD', qualities)
+
+    repriced = execution.reprice_fills(fills, base_slippage_pct=execution.base_slippage_pct * 2)
+
+    limit = repriced[is_limit]
+    assert not limit['repriced'].any()
+    assert (limit['repriced_fill_price'] == limit['fill_price']).all()
+    assert (limit['repriced_slippage'] == 0).all()
+    assert (limit['cost_delta'] == 0).all()
+
+    market = repriced[~is_limit]
+    assert market['repriced'].all()
+    assert (market['repriced_slippage'] > slippages[~is_limit.to_numpy()]).all()
+
+
+def test_fills_use_the_latest_quote(synthetic_db):
+    """Market and spread fills price off the live quote, not the first one."""
+    db = synthetic_db(days=1, minutes=60, strikes=5, expirations=2)
+    data = DataHandler(db.get_connection(), '2024-01-15', '2024-01-16', ['SPY'],
+                       enable_multi_timeframe=False)
+    execution = ExecutionHandler(Queue(), data, logger=EventLogger(sink='off'))
+    data.current_timestamp = int(data.get_all_timestamps_us()[-1])
+
+    chain = data.get_options_chain('SPY')
+    live = chain[chain['timestamp_available'] == chain['timestamp_available'].max()]
+    first = chain[chain['timestamp_available'] == chain['timestamp_available'].min()]
+    assert len(first) and not first['bid_price'].equals(live['bid_price'])
+
+    def sell(quote, order_id, dated=True):
+        return create_order_event(symbol='SPY', order_type='MARKET', quantity=1, direction='SELL',
+                                  strikes=[float(quote['strike'])], option_types=[quote['option_type']],
+                                  expirations=[int(quote['expiration_timestamp'])] if dated else None,
+                                  order_id=order_id)
+
+    nearest = live['expiration_timestamp'].min()
+    far = live[live['expiration_timestamp'] > nearest].iloc[0]
+    near = live[live['expiration_timestamp'] == nearest].iloc[0]
+
+    execution.execute_market_order(sell(far, 'single'))
+    execution.execute_orders([sell(far, 'batch'), sell(near, 'undated', dated=False)])
+
+    legs = [{'strike': float(quote['strike']), 'option_type': quote['option_type'], 'direction': 'SELL',
+             'expiration_ts': int(quote['expiration_timestamp'])} for quote in (near, far)]
+    execution.execute_order(create_spread_order('SPY', legs, quantity=1, direction='SELL',
+                                                order_id='spread'))
+
+    log = execution.get_fill_log()
+    spread = log[log['order_id'] == 'spread']
+    log = log[log['order_id'] != 'spread'].set_index('order_id')
+    for order_id, quote in (('single', far), ('batch', far), ('undated', near)):
+        assert log.loc[order_id, 'bid_price'] == quote['bid_price']
+        assert log.loc[order_id, 'ask_price'] == quote['ask_price']
+    assert spread['bid_price'].tolist() == [near['bid_price'], far['bid_price']]
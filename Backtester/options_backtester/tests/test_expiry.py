@@ -0,0 +1,155 @@
+"""
+Tests for option expiration processing.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backtest import Backtest
+from clock import to_us
+from database import get_database
+from event_log import EventLogger
+from events import create_fill_event
+from expiry import ExpiryQueue
+from portfolio import Portfolio
+from strategy import Strategy
+from synthetic_data import write_synthetic_db
+
+
+class HoldOvernightPutSeller(Strategy):
+    """Sells one put at 10:00 on the first day and never closes it."""
+
+    def __init__(self, events_queue, data_handler):
+        super().__init__(events_queue, data_handler)
+        self.sold = False
+        self.expired = []
+
+    def calculate_signals(self, market_event):
+        if self.sold or market_event.timestamp.time() != pd.Timestamp('10:00').time():
+            return
+
+        data = market_event.data['SPY']
+        puts = data[data['option_type'] == 'P']
+        option = puts.iloc[-1]  # Highest strike: in the money
+        self.create_signal('SPY', 'SHORT', strength=1.0, strikes=[option['strike']],
+                           metadata={'option_type': 'P'})
+        self.sold = True
+
+    def on_expiry(self, fill_event):
+        self.expired.append(fill_event)
+
+
+def sell_put(portfolio, strike, expiration, quantity=2):
+    portfolio.update_fill(create_fill_event(
+        symbol='SPY', quantity=quantity, direction='SELL', fill_price=3.0, commission=0.0,
+        timestamp=pd.Timestamp('2024-01-16 10:00'), strikes=[strike], option_types=['P'],
+        expirations=[to_us(expiration)]))
+    return portfolio.positions.key('SPY', strike, 'P', to_us(expiration))
+
+
+def test_queue_pops_only_expired_contracts():
+    queue = ExpiryQueue()
+    queue.schedule(3, 300)
+    queue.schedule(1, 100)
+    queue.schedule(1, 100)  # Already queued
+    queue.schedule(2, 200)
+    queue.schedule(4, None)  # Undated contracts never expire
+
+    assert len(queue) == 3 and queue.next_expiration() == 100
+    assert not queue.due(99)
+    assert queue.pop_due(250) == [(100, 1), (200, 2)]
+    assert queue.pop_due(250) == []
+    assert queue.next_expiration() == 300
+
+
+def test_expire_settles_at_intrinsic_value():
+    portfolio = Portfolio(Queue(), initial_capital=100000, logger=EventLogger(sink='off'))
+    expiration = pd.Timestamp('2024-01-16 16:00')
+    itm = sell_put(portfolio, 480.0, expiration)
+    otm = sell_put(portfolio, 460.0, expiration)
+    assert len(portfolio.expiries) == 2
+
+    assigned = portfolio.expire(itm, underlying_price=475.5, timestamp=expiration)
+    expired = portfolio.expire(otm, underlying_price=475.5, timestamp=expiration)
+
+    assert assigned.execution_quality == 'ASSIGNED' and assigned.fill_price == 4.5
+    assert expired.execution_quality == 'EXPIRED' and expired.fill_price == 0.0
+    assert len(portfolio.positions) == 0
+    assert portfolio.expire(itm, 475.5, expiration) is None  # Already flat
+
+    # Short 2 puts at $3.00: lose $1.50/share on one strike, keep the premium on the other
+    assert np.isclose(portfolio.positions.total_realized_pnl(), -150 * 2 + 300 * 2)
+    assert portfolio.greeks.totals()['delta'] == pytest.approx(0.0)
+
+    # Expiry cash settles T+1 like any fill
+    assert portfolio.pending_settlements[-1]['settlement_date'] == pd.Timestamp('2024-01-17 09:30')
+
+
+def test_held_position_expires_overnight(synthetic_db, silent):
+    db = synthetic_db(days=2, minutes=390, strikes=5, expirations=1)
+
+    with silent():
+        backtest = Backtest(symbols=['SPY'], start_date='2024-01-15', end_date='2024-01-17',
+                            initial_capital=100000, strategy_class=HoldOvernightPutSeller,
+                            db_connection=db.get_connection(), enable_checkpoints=False,
+                            quiet=True, auto_close=False)
+        results = backtest.run(verbose=False)
+
+    trades = results['trades']
+    assert len(trades) == 2
+    assert list(trades['direction']) == ['SELL', 'BUY']
+
+    # Settled at the 0DTE expiry, priced off the last underlying print before it
+    (settlement,) = backtest.strategy.expired
+    assert settlement.timestamp == pd.Timestamp('2024-01-15 16:00')
+    assert settlement.commission == 0.0
+    last_price = backtest.data.get_underlying_price_at('SPY', to_us(settlement.timestamp))
+    strike = settlement.strikes[0]
+    assert settlement.fill_price == pytest.approx(max(strike - last_price, 0.0))
+
+    assert len(backtest.portfolio.positions) == 0
+    assert len(backtest.portfolio.expiries) == 0
+
+
+def test_expiry_without_underlying_price_is_retried(tmp_path, silent):
+    db_path = str(tmp_path / 'synthetic.db')
+    write_synthetic_db(db_path, symbols=['SPY'], days=1, minutes=30, strikes=5, expirations=1)
+    db = get_database(db_type='sqlite', db_path=db_path)
+
+    with silent():
+        backtest = Backtest(symbols=['SPY'], start_date='2024-01-15', end_date='2024-01-16',
+                            initial_capital=100000, strategy_class=HoldOvernightPutSeller,
+                            db_connection=db.get_connection(), enable_checkpoints=False, quiet=True)
+
+    expiration = pd.Timestamp('2024-01-15 16:00')
+    portfolio = backtest.portfolio
+    spy = sell_put(portfolio, 480.0, expiration)
+    portfolio.update_fill(create_fill_event(
+        symbol='QQQ', quantity=1, direction='SELL', fill_price=2.0, commission=0.0,
+        timestamp=pd.Timestamp('2024-01-15 10:00'), strikes=[400.0], option_types=['P'],
+        expirations=[to_us(expiration)]))
+
+    backtest.data.current_timestamp = '2024-01-15 16:01'
+    backtest.process_expirations()
+
+    # SPY settles; QQQ has no prices yet, so it stays open and queued
+    assert portfolio.positions.get(spy)['quantity'] == 0
+    assert len(portfolio.positions) == 1
+    assert portfolio.expiries.due(backtest.data.clock.now)
+
+    # QQQ prints arrive (timestamps up to 10:00): retried and settled on the next tick
+    write_synthetic_db(db_path, symbols=['QQQ'], days=1, minutes=30, strikes=5, expirations=1)
+    backtest.data.current_timestamp = '2024-01-15 16:02'
+    backtest.process_expirations()
+
+    assert len(portfolio.positions) == 0
+    assert len(portfolio.expiries) == 0
+    assert [fill.symbol for fill in backtest.strategy.expired] == ['SPY', 'QQQ']
@@ -0,0 +1,136 @@
+"""
+Tests for multi-strategy fan-out over one data pass.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backtest import Backtest
+from multi_strategy import MultiStrategyBacktest
+from example_strategy import SimplePremiumSelling
+from strategy import Strategy, BuyAndHoldStrategy
+from subscription import DataSubscription
+
+
+class PutSeller(Strategy):
+    """Sells puts at a given minute of each hour."""
+
+    def __init__(self, events_queue, data_handler, minute: int = 0, size: float = 1.0):
+        super().__init__(events_queue, data_handler)
+        self.minute = minute
+        self.size = size
+
+    def calculate_signals(self, market_event):
+        if market_event.timestamp.minute != self.minute:
+            return
+
+        for symbol, data in market_event.data.items():
+            puts = data[data['option_type'] == 'P']
+            if len(puts) > 0:
+                option = puts.iloc[0]
+                self.create_signal(symbol, 'SHORT', strength=self.size, strikes=[option['strike']],
+                                   metadata={'option_type': 'P'})
+
+
+class NearPutSeller(PutSeller):
+    """PutSeller on near-the-money puts only; records what it was shown."""
+
+    subscription = DataSubscription(columns=(), option_types=('P',), moneyness=(0.99, 1.01), max_dte=1)
+
+    def __init__(self, events_queue, data_handler, **params):
+        super().__init__(events_queue, data_handler, **params)
+        self.seen = []
+
+    def calculate_signals(self, market_event):
+        self.seen.extend(market_event.data.values())
+        super().calculate_signals(market_event)
+
+
+SCALE = dict(days=1, minutes=120, strikes=5, expirations=1)
+
+
+def test_variants_match_separate_backtests(synthetic_db, silent):
+    """Each variant ends where its own Backtest would, on one shared data pass."""
+    variants = [
+        (PutSeller, {'minute': 0}, None),
+        (PutSeller, {'minute': 30, 'size': 3}, {'initial_capital': 50000, 'commission': 0.65}),
+        (BuyAndHoldStrategy, None, {'max_position_size': 0.005}),
+    ]
+    settings = dict(symbols=['SPY'], start_date='2024-01-15', end_date='2024-01-16', quiet=True)
+
+    db = synthetic_db(**SCALE)
+
+    with silent():
+        fanout = MultiStrategyBacktest(variants=variants, db_connection=db.get_connection(),
+                                       **settings)
+        results = fanout.run()
+
+        separate = []
+        for strategy_class, params, portfolio_config in variants:
+            config = dict(portfolio_config or {})
+            backtest = Backtest(strategy_class=strategy_class, strategy_params=params,
+                                db_connection=db.get_connection(), enable_checkpoints=False,
+                                initial_capital=config.pop('initial_capital', 100000),
+                                commission=config.pop('commission', 0.05), **settings)
+            for key, value in config.items():
+                setattr(backtest.portfolio, key, value)
+            separate.append(backtest.run(verbose=False))
+
+    assert list(results) == ['PutSeller_1', 'PutSeller_2', 'BuyAndHoldStrategy']
+    assert len({id(bt.data) for bt in fanout.backtests.values()}) == 1
+
+    for result, expected in zip(results.values(), separate):
+        assert result['total_trades'] == expected['total_trades']
+        assert np.isclose(result['final_value'], expected['final_value'])
+        pd.testing.assert_series_equal(result['equity_curve']['total_value'],
+                                       expected['equity_curve']['total_value'])
+
+    # A 0.5% cap leaves buy-and-hold no room for a contract
+    assert results['BuyAndHoldStrategy']['total_trades'] == 0
+    assert results['PutSeller_2']['trades']['quantity'].iloc[0] == 2
+
+
+def test_variants_see_only_their_subscription(synthetic_db, silent):
+    """Mixed subscriptions: each variant trades as it would on its own."""
+    variants = [
+        (NearPutSeller, {'minute': 15}, None),
+        (SimplePremiumSelling, None, None),
+        (BuyAndHoldStrategy, None, None),
+        (PutSeller, {'minute': 45}, None),  # Full chain: the merged slice as is
+    ]
+    settings = dict(symbols=['SPY'], start_date='2024-01-15', end_date='2024-01-16',
+                    initial_capital=100000, quiet=True)
+
+    db = synthetic_db(**SCALE)
+
+    with silent():
+        fanout = MultiStrategyBacktest(variants=variants, db_connection=db.get_connection(),
+                                       **settings)
+        results = fanout.run()
+
+        separate = {}
+        for name, (strategy_class, params, _) in zip(fanout.names, variants):
+            backtest = Backtest(strategy_class=strategy_class, strategy_params=params,
+                                db_connection=db.get_connection(), enable_checkpoints=False,
+                                commission=0.05, **settings)
+            separate[name] = (backtest, backtest.run(verbose=False))
+
+    assert fanout.slices['PutSeller'] is None
+
+    for name, result in results.items():
+        backtest, expected = separate[name]
+        assert result['total_trades'] == expected['total_trades']
+        pd.testing.assert_series_equal(result['equity_curve']['total_value'],
+                                       expected['equity_curve']['total_value'])
+
+    near = fanout.backtests['NearPutSeller'].strategy
+    assert near.seen and all(set(chain['option_type']) <= {'P'} for chain in near.seen)
+    assert all('implied_vol' not in chain for chain in near.seen)
+    standalone = separate['NearPutSeller'][0].strategy
+    assert [len(chain) for chain in near.seen] == [len(chain) for chain in standalone.seen]
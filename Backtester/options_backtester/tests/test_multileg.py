@@ -0,0 +1,95 @@
+"""
+Tests for multi-leg spread orders.
+
+A spread fills all of its legs against one chain snapshot or not at all,
+and the portfolio tracks every leg as its own position.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from events import create_spread_order
+from execution import ExecutionHandler
+from portfolio import Portfolio
+from event_log import EventLogger
+
+
+def condor_legs(chain, expiration_ts):
+    atm = chain['strike'].median()
+    return [
+        {'strike': atm - 6, 'option_type': 'P', 'direction': 'BUY', 'expiration_ts': expiration_ts},
+        {'strike': atm - 3, 'option_type': 'P', 'direction': 'SELL', 'expiration_ts': expiration_ts},
+        {'strike': atm + 3, 'option_type': 'C', 'direction': 'SELL', 'expiration_ts': expiration_ts},
+        {'strike': atm + 6, 'option_type': 'C', 'direction': 'BUY', 'expiration_ts': expiration_ts},
+    ]
+
+
+def test_condor_fills_atomically_with_per_leg_slippage(snapshot):
+    """Net premium is the sum of per-leg fills, each priced like a single order."""
+    chain, timestamp = snapshot.chain, snapshot.current_timestamp
+    expiration_ts = int(chain['expiration_timestamp'].max())
+    events = Queue()
+    execution = ExecutionHandler(events, snapshot, logger=EventLogger(sink='off'))
+
+    order = create_spread_order('SPY', condor_legs(chain, expiration_ts), quantity=2,
+                                direction='SELL', order_id='condor')
+    execution.execute_order(order)
+    fill = events.get(block=False)
+
+    assert len(fill.legs) == 4
+    assert fill.direction == 'SELL'  # Iron condor is a net credit
+    assert fill.commission == execution.commission * 8
+
+    net = 0.0
+    for leg in fill.legs:
+        quote = chain[(chain['strike'] == leg['strike']) & (chain['option_type'] == leg['option_type']) &
+                      (chain['expiration_timestamp'] == expiration_ts)].iloc[0]
+        hours = (expiration_ts - timestamp.value // 1000) / 3.6e9
+        fill_price, slippage, _ = execution.model_slippage(quote, leg['direction'], hours, 2)
+        assert np.isclose(leg['fill_price'], fill_price)
+        assert np.isclose(leg['slippage'], slippage)
+        net += fill_price if leg['direction'] == 'BUY' else -fill_price
+
+    assert np.isclose(fill.fill_price, -net)
+    assert len(execution.get_fill_log()) == 4
+
+    # A missing leg rejects the whole spread
+    broken = condor_legs(chain, expiration_ts)
+    broken[3]['strike'] = 10000.0
+    execution.execute_order(create_spread_order('SPY', broken, quantity=1, direction='SELL'))
+    assert events.empty()
+    assert len(execution.get_fill_log()) == 4
+
+
+def test_portfolio_tracks_legs_and_realizes_on_close(snapshot):
+    """Opening and closing a condor flattens every leg and books the P&L."""
+    chain = snapshot.chain
+    expiration_ts = int(chain['expiration_timestamp'].min())
+    events = Queue()
+    execution = ExecutionHandler(events, snapshot, logger=EventLogger(sink='off'))
+    portfolio = Portfolio(events, initial_capital=100000, logger=EventLogger(sink='off'))
+
+    legs = condor_legs(chain, expiration_ts)
+    open_fill = execution.execute_spread_order(create_spread_order('SPY', legs, 1, 'SELL'))
+    portfolio.update_fill(open_fill)
+
+    open_legs = portfolio.positions.open_positions()
+    assert len(open_legs) == 4
+    assert sorted(open_legs['quantity']) == [-1, -1, 1, 1]
+    assert np.isclose(portfolio.unsettled_cash, -open_fill.get_cost())
+
+    reversed_legs = [dict(leg, direction='BUY' if leg['direction'] == 'SELL' else 'SELL') for leg in legs]
+    close_fill = execution.execute_spread_order(create_spread_order('SPY', reversed_legs, 1, 'BUY'))
+    portfolio.update_fill(close_fill)
+
+    assert len(portfolio.positions) == 0
+    realized = portfolio.positions.total_realized_pnl()
+    # Round trip at the same snapshot loses the spreads and slippage
+    assert np.isclose(realized, (open_fill.fill_price - close_fill.fill_price) * 100)
+    assert realized < 0
@@ -0,0 +1,156 @@
+"""
+Tests for the resting limit-order book.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from clock import to_us
+from data_handler import DataHandler
+from event_log import EventLogger
+from events import create_order_event
+from execution import ExecutionHandler
+from order_book import LimitOrderBook
+
+
+EXPIRATION = to_us('2024-01-19 16:00')
+
+
+def limit_order(order_id, direction, strike, limit_price, time_in_force=None):
+    return create_order_event(symbol='SPY', order_type='LIMIT', quantity=1, direction=direction,
+                              strikes=[strike], option_types=['P'], limit_price=limit_price,
+                              order_id=order_id, time_in_force=time_in_force)
+
+
+def make_chain():
+    """Two snapshots of three puts; the later one is the live quote."""
+    return pd.DataFrame({
+        'timestamp_available': [2, 2, 2, 1, 1, 1],
+        'strike': [470.0, 475.0, 480.0, 470.0, 475.0, 480.0],
+        'option_type': ['P'] * 6,
+        'expiration_timestamp': [EXPIRATION] * 6,
+        'bid_price': [1.00, 2.00, 3.00, 0.50, 2.50, 9.00],
+        'ask_price': [1.10, 2.10, 3.10, 0.60, 2.60, 9.10],
+    })
+
+
+def test_match_crosses_latest_quote_only():
+    book = LimitOrderBook(capacity=2)
+    book.add(limit_order('sell-470', 'SELL', 470.0, 0.90), EXPIRATION, EXPIRATION)
+    book.add(limit_order('sell-475', 'SELL', 475.0, 2.40), EXPIRATION, EXPIRATION)  # Stale bid crosses
+    book.add(limit_order('buy-480', 'BUY', 480.0, 3.10), EXPIRATION, EXPIRATION)
+    book.add(limit_order('buy-490', 'BUY', 490.0, 9.99), EXPIRATION, EXPIRATION)  # Not quoted
+
+    chain = make_chain()
+    assert sorted(book.match('SPY', chain)) == [('buy-480', 2), ('sell-470', 0)]
+
+    # Matching does not take orders off the book
+    assert len(book) == 4
+    assert book.remove('sell-470').limit_price == 0.90
+    assert book.match('SPY', chain) == [('buy-480', 2)]
+
+
+def test_cancel_and_expiry_recycle_rows():
+    book = LimitOrderBook(capacity=1)
+    book.add(limit_order('day', 'SELL', 470.0, 5.0), EXPIRATION, 100)
+    book.add(limit_order('gtc', 'SELL', 475.0, 5.0), EXPIRATION, EXPIRATION)
+
+    assert [order.order_id for order in book.remove_expired(100)] == ['day']
+    assert book.remove('day') is None
+    assert list(book.orders) == ['gtc']
+
+    book.add(limit_order('next', 'BUY', 480.0, 1.0), EXPIRATION, EXPIRATION)
+    assert book._size == 2  # Reused the freed row
+    assert [order.order_id for order in book.remove_all('SPY')] == ['gtc', 'next']
+    assert len(book) == 0 and book.match('SPY', make_chain()) == []
+
+
+@pytest.fixture
+def execution(synthetic_db):
+    db = synthetic_db(days=1, minutes=30, strikes=9, expirations=2)
+    data = DataHandler(db.get_connection(), '2024-01-15', '2024-01-16', ['SPY'],
+                       enable_multi_timeframe=False)
+    return ExecutionHandler(Queue(), data, logger=EventLogger(sink='off'))
+
+
+def latest_quotes(execution):
+    chain = execution.data.get_options_chain('SPY')
+    chain = chain.sort_values('timestamp_available', kind='stable')
+    return chain.drop_duplicates(['strike', 'option_type', 'expiration_timestamp'], keep='last')
+
+
+def test_resting_order_fills_when_quote_crosses(execution):
+    ticks = execution.data.get_all_timestamps_us()
+    first, last = int(ticks[0]), int(ticks[-1])
+
+    execution.data.current_timestamp = last
+    later = latest_quotes(execution).set_index(['strike', 'option_type', 'expiration_timestamp'])
+    execution.data.current_timestamp = first
+    now = latest_quotes(execution).set_index(['strike', 'option_type', 'expiration_timestamp'])
+
+    # A contract whose bid rises: sell at the later bid, above today's
+    rising = later['bid_price'].reindex(now.index) > now['bid_price'] + 0.01
+    strike, option_type, expiration_ts = now.index[np.flatnonzero(rising)[0]]
+    limit = float(later.loc[(strike, option_type, expiration_ts), 'bid_price'])
+
+    order = create_order_event(symbol='SPY', order_type='LIMIT', quantity=2, direction='SELL',
+                               strikes=[strike], option_types=[option_type], limit_price=limit,
+                               order_id='resting', expirations=[int(expiration_ts)],
+                               time_in_force='GTC')
+    assert execution.execute_limit_order(order) is None
+    assert list(execution.book.orders) == ['resting']
+
+    # IOC orders that do not cross never rest
+    ioc = create_order_event(symbol='SPY', order_type='LIMIT', quantity=1, direction='SELL',
+                             strikes=[strike], option_types=[option_type], limit_price=limit,
+                             order_id='ioc', expirations=[int(expiration_ts)], time_in_force='IOC')
+    assert execution.execute_limit_order(ioc) is None
+    assert 'ioc' not in execution.book.orders
+
+    execution.data.current_timestamp = last
+    (fill,) = execution.match_resting_orders()
+
+    assert fill.order_id == 'resting' and fill.fill_price == pytest.approx(limit)
+    assert fill.expirations == [int(expiration_ts)] and fill.slippage == 0
+    assert execution.events.get_nowait() is fill
+    assert len(execution.book) == 0
+    assert execution.get_fill_log()['order_id'].tolist() == ['resting']
+
+
+def test_day_orders_expire_and_cancel_events(execution):
+    execution.data.current_timestamp = int(execution.data.get_all_timestamps_us()[0])
+    quotes = latest_quotes(execution)
+    put = quotes[quotes['expiration_timestamp'] == quotes['expiration_timestamp'].max()].iloc[0]
+
+    def rest(order_id, time_in_force):
+        execution.execute_order(create_order_event(
+            symbol='SPY', order_type='LIMIT', quantity=1, direction='BUY',
+            strikes=[float(put['strike'])], option_types=[put['option_type']], limit_price=0.001,
+            order_id=order_id, expirations=[int(put['expiration_timestamp'])],
+            time_in_force=time_in_force))
+
+    rest('day', None)
+    rest('gtc', 'GTC')
+    rest('cancelled', 'GTC')
+    assert len(execution.book) == 3
+
+    execution.execute_order(create_order_event(symbol='SPY', order_type='CANCEL', quantity=0,
+                                               direction=None, order_id='cancelled'))
+    assert sorted(execution.book.orders) == ['day', 'gtc']
+
+    # DAY orders end at the close; GTC orders work until the contract expires
+    execution.data.current_timestamp = '2024-01-15 16:00'
+    assert execution.match_resting_orders() == []
+    assert list(execution.book.orders) == ['gtc']
+    assert execution.events.empty()
+
+    with pytest.raises(ValueError):
+        execution.execute_limit_order(limit_order('bad', 'BUY', 470.0, 1.0, time_in_force='FOK'))
@@ -0,0 +1,115 @@
+"""
+Tests for the contract-level position table.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_handler import DataHandler
+from event_log import EventLogger
+from events import EventType, SignalEvent
+from execution import ExecutionHandler
+from portfolio import Portfolio
+from positions import PositionTable, encode_contract, decode_contract
+from synthetic_data import generate_chains
+
+
+def test_contract_ids_round_trip():
+    """IDs are unique per contract and decode back to the same contract."""
+    expiration_ts = 1705352400 * 10**6  # 2024-01-15 16:00 ET
+    for args in [(0, expiration_ts, 470.0, 'P'), (3, expiration_ts, 470.0, 'C'),
+                 (1023, expiration_ts + 86400 * 10**6, 12345.125, 'C')]:
+        assert decode_contract(encode_contract(*args)) == args
+
+    ids = {encode_contract(0, expiration_ts, strike, right)
+           for strike in np.arange(400, 500, 0.5) for right in 'CP'}
+    assert len(ids) == 400
+
+
+def test_marks_open_contracts_in_one_gather():
+    """Each contract is valued at its own latest mid, shorts negative."""
+    chain = generate_chains(symbols=['SPY'], days=1, minutes=3, strikes=11, expirations=2)
+    latest = chain[chain['timestamp_available'] == chain['timestamp_available'].max()]
+    table = PositionTable(capacity=2)
+
+    held = latest.sample(6, random_state=0)
+    quantities = [1, -2, 3, -1, 5, -4]
+    for (_, row), quantity in zip(held.iterrows(), quantities):
+        table.apply_fill('SPY', row['strike'], row['option_type'], int(row['expiration_timestamp']),
+                         quantity, 1.00)
+
+    assert len(table) == 6
+    expected = sum(q * row['mid_price'] * 100 for (_, row), q in zip(held.iterrows(), quantities))
+    assert np.isclose(table.market_value({'SPY': chain}), expected)
+
+    # Closing half a position realizes P&L against the average price
+    row = held.iloc[2]
+    realized = table.apply_fill('SPY', row['strike'], row['option_type'],
+                                int(row['expiration_timestamp']), -2, 1.50)
+    assert np.isclose(realized, 0.50 * 2 * 100)
+    assert table.get(table.key('SPY', row['strike'], row['option_type'],
+                               int(row['expiration_timestamp'])))['quantity'] == 1
+
+
+def test_conservative_marks_and_greek_exposure():
+    """Longs mark at bid, shorts at ask; Greeks aggregate per contract."""
+    chain = generate_chains(symbols=['SPY'], days=1, minutes=1, strikes=11, expirations=1)
+    table = PositionTable()
+
+    long_row, short_row = chain.iloc[4], chain.iloc[7]
+    for row, quantity in ((long_row, 2), (short_row, -3)):
+        table.apply_fill('SPY', row['strike'], row['option_type'], int(row['expiration_timestamp']),
+                         quantity, row['mid_price'])
+
+    mid_value = table.market_value({'SPY': chain})
+    conservative = table.market_value({'SPY': chain}, pricing='conservative')
+    expected = (2 * long_row['bid_price'] - 3 * short_row['ask_price']) * 100
+
+    assert np.isclose(conservative, expected)
+    assert conservative < mid_value
+    assert np.isclose(table.unrealized_pnl().sum(), conservative - mid_value)
+
+    exposure = table.exposure()
+    assert np.isclose(exposure['delta'], (2 * long_row['delta'] - 3 * short_row['delta']) * 100)
+    assert np.isclose(exposure['vega'], (2 * long_row['vega'] - 3 * short_row['vega']) * 100)
+
+
+def test_single_leg_orders_trade_the_signalled_expiration(synthetic_db):
+    """Same strike in two expirations: entry and exit both trade the signalled one."""
+    db = synthetic_db(days=1, minutes=3, strikes=5, expirations=2)
+    data = DataHandler(db.get_connection(), '2024-01-15', '2024-01-16', ['SPY'],
+                       enable_multi_timeframe=False)
+    data.current_timestamp = int(data.get_all_timestamps_us()[0])
+
+    events = Queue()
+    portfolio = Portfolio(events, initial_capital=100000, logger=EventLogger(sink='off'))
+    execution = ExecutionHandler(events, data, logger=EventLogger(sink='off'))
+
+    chain = data.get_options_chain('SPY')
+    first, later = sorted(chain['expiration_timestamp'].unique())
+    strike = float(chain.loc[chain['expiration_timestamp'] == later, 'strike'].iloc[0])
+    assert strike in set(chain.loc[chain['expiration_timestamp'] == first, 'strike'])
+
+    def trade(signal_type):
+        portfolio.update_signal(SignalEvent(
+            type=EventType.SIGNAL, symbol='SPY', signal_type=signal_type, strength=1.0,
+            strikes=[strike], metadata={'option_type': 'P', 'expiration_ts': int(later)}))
+        order = events.get_nowait()
+        assert order.expirations == [int(later)]
+        execution.execute_order(order)
+        fill = events.get_nowait()
+        assert fill.expirations == [int(later)]
+        portfolio.update_fill(fill)
+
+    trade('SHORT')
+    assert portfolio.positions.get(portfolio.positions.key('SPY', strike, 'P', int(later)))['quantity'] == -1
+
+    trade('EXIT')
+    assert len(portfolio.positions) == 0
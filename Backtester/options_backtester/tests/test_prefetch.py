@@ -0,0 +1,100 @@
+"""
+Tests for background session prefetch in DataHandler.
+"""
+
+import sys
+import os
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backtest import Backtest
+from data_handler import DataHandler
+
+
+def test_prefetched_chains_match_synchronous_queries(synthetic_db):
+    """Every tick sees the same timestamps and chains with and without prefetch."""
+    db = synthetic_db(symbols=('SPY', 'QQQ'), days=3, minutes=20, strikes=5, expirations=2)
+
+    # Skip the first session to check start_date is honoured
+    settings = dict(start_date='2024-01-16', end_date='2024-01-18', symbols=['SPY', 'QQQ'],
+                    enable_multi_timeframe=False)
+    direct = DataHandler(db.get_connection(), **settings)
+    prefetched = DataHandler(db.get_connection(), prefetch_depth=1, **settings)
+
+    ticks = 0
+    while True:
+        expected = direct.update_bars()
+        actual = prefetched.update_bars()
+        if expected is None:
+            assert actual is None
+            break
+
+        ticks += 1
+        assert actual.timestamp == expected.timestamp
+        for symbol in settings['symbols']:
+            pd.testing.assert_frame_equal(actual.data[symbol], expected.data[symbol])
+
+        # Narrower DTE windows are served from the block too
+        pd.testing.assert_frame_equal(prefetched.get_options_chain('SPY', max_dte=1),
+                                      direct.get_options_chain('SPY', max_dte=1))
+
+    prefetched.close()
+    stats = prefetched.prefetch_stats()
+
+    assert ticks == 2 * 20
+    assert stats['blocks'] == 2 and stats['depth'] == 1
+    assert stats['stall_seconds'] >= 0
+
+
+def test_prefetch_runs_no_queries_per_tick_with_multi_timeframe(synthetic_db, monkeypatch):
+    """Default settings (multi-timeframe bars on): ticks are served from blocks only."""
+    db = synthetic_db(days=2, minutes=20, strikes=5, expirations=2)
+
+    settings = dict(start_date='2024-01-15', end_date='2024-01-17', symbols=['SPY'])
+    direct = DataHandler(db.get_connection(), **settings)
+    prefetched = DataHandler(db.get_connection(), prefetch_depth=1, **settings)
+    prefetched.get_all_timestamps_us()  # Read once up front for the loader
+
+    queries = []
+    run_query = prefetched._query
+
+    def counted_query(*args, **kwargs):
+        queries.append(args)
+        return run_query(*args, **kwargs)
+
+    monkeypatch.setattr(prefetched, '_query', counted_query)
+
+    while True:
+        expected = direct.update_bars()
+        actual = prefetched.update_bars()
+        if expected is None:
+            assert actual is None
+            break
+        assert prefetched.get_underlying_price('SPY') == direct.get_underlying_price('SPY')
+
+    prefetched.close()
+
+    assert queries == []
+    assert prefetched.get_timeframe_bars('SPY', 5) == direct.get_timeframe_bars('SPY', 5)
+    assert len(direct.get_timeframe_bars('SPY', 5)) > 0
+
+
+def test_prefetched_reads_are_profiled_and_counted(synthetic_db, morning_put_seller, silent):
+    """Loader reads show up in the profile and compact counters, one query per symbol and block."""
+    db = synthetic_db(days=2, minutes=20, strikes=5, expirations=2)
+
+    with silent():
+        backtest = Backtest(symbols=['SPY'], start_date='2024-01-15', end_date='2024-01-17',
+                            initial_capital=100000, strategy_class=morning_put_seller,
+                            db_connection=db.get_connection(), enable_checkpoints=False, quiet=True,
+                            profile=True, prefetch_depth=1, compact_dtypes=True)
+        results = backtest.run(verbose=False)
+
+    (prefetch,) = [row for row in results['profile'] if row['stage'] == 'prefetch']
+    assert prefetch['queries'] == 2 and prefetch['rows'] > 0
+    assert results['chain_memory']['chains'] == 2
+    assert results['chain_memory']['compact_bytes'] < results['chain_memory']['full_bytes']
+    assert backtest.data.prefetch_stats()['blocks'] == 2
@@ -0,0 +1,61 @@
+"""
+Tests for the per-stage event loop profiler.
+"""
+
+import sys
+import os
+import json
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from profiling import StageProfiler
+
+
+class FakeDataHandler:
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def get_options_chain(self):
+        self.profiler.record_query(rows=50)
+
+    def update_bars(self):
+        self.profiler.record_query(rows=1)
+        self.get_options_chain()
+
+
+class FakeStrategy:
+    def __init__(self, data):
+        self.data = data
+
+    def calculate_signals(self):
+        self.data.get_options_chain()
+
+
+def test_queries_are_attributed_to_calling_stage():
+    """Queries issued inside a stage count toward that stage only."""
+    profiler = StageProfiler()
+    data = FakeDataHandler(profiler)
+    strategy = FakeStrategy(data)
+
+    profiler.wrap(data, 'update_bars')
+    profiler.wrap(strategy, 'calculate_signals')
+
+    profiler.start()
+    for _ in range(10):
+        data.update_bars()
+        strategy.calculate_signals()
+    profiler.stop()
+
+    summary = {row['stage']: row for row in profiler.summary()}
+
+    assert summary['update_bars']['calls'] == 10
+    assert summary['update_bars']['queries'] == 20
+    assert summary['update_bars']['rows'] == 510
+    assert summary['calculate_signals']['queries'] == 10
+    assert summary['calculate_signals']['rows'] == 500
+    assert summary['update_bars']['p50_us'] <= summary['update_bars']['p99_us']
+
+    # Table is JSON-serializable for the results payload
+    json.dumps(profiler.summary())
+    assert 'update_bars' in profiler.format_table()
@@ -0,0 +1,53 @@
+"""
+Tests for the structured progress channel.
+
+Records must be valid NDJSON and rate limited by wall time, so fast runs
+do not pay for a write per iteration.
+"""
+
+import sys
+import os
+import io
+import json
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from progress import ProgressReporter, SCHEMA_VERSION
+
+
+def test_records_are_rate_limited_ndjson():
+    """Only start, forced and final records are written within the interval."""
+    stream = io.StringIO()
+    reporter = ProgressReporter(stream, min_interval=60)
+
+    reporter.start(total=1000)
+    written = [reporter.update(i, trades=1, equity=100000.0) for i in range(1, 1001)]
+    reporter.update(1000, trades=2, equity=101000.0, force=True)
+    reporter.finish(1000, trades=2, equity=101000.0)
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    assert not any(written)
+    assert [r['type'] for r in records] == ['start', 'progress', 'done']
+    assert all(r['v'] == SCHEMA_VERSION for r in records)
+    assert records[1]['pct'] == 100.0
+    assert records[1]['trades'] == 2
+    assert records[2]['equity'] == 101000.0
+
+
+def test_open_fd_leaves_descriptor_open():
+    """Worker mode reopens the same fd per job, so close() must not close it."""
+    read_fd, write_fd = os.pipe()
+
+    for job in range(2):
+        reporter = ProgressReporter.open(write_fd, min_interval=0)
+        reporter.start(total=10)
+        reporter.close()
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        lines = f.read().splitlines()
+
+    assert len(lines) == 2
+    assert json.loads(lines[0])['type'] == 'start'
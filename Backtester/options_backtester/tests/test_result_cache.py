@@ -0,0 +1,81 @@
+"""
+Tests for the backtest result cache.
+
+Identical configs against unchanged data must hit; any change to the
+config, the data version or the engine must miss.
+"""
+
+import sys
+import os
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from result_cache import RUNNER_SCRIPT, ResultCache, normalize_config, source_fingerprint
+
+
+BASE_CONFIG = {
+    'config_id': 'abc',
+    'symbols': ['SPY'],
+    'start_date': '2024-01-01',
+    'end_date': '2024-01-31',
+    'initial_capital': 100000,
+    'strategy_name': 'BuyAndHold',
+}
+
+DATA_VERSION = {'database': 'sqlite:///test.db', 'max_id': 42}
+
+
+def test_key_ignores_config_id_and_defaults():
+    """Reloading the page submits a new config_id but the same run."""
+    cache = ResultCache(cache_dir=tempfile.mkdtemp())
+
+    reloaded = dict(BASE_CONFIG, config_id='xyz', commission=0.05,
+                    strategy_name='BuyAndHoldStrategy')
+
+    assert cache.make_key(BASE_CONFIG, DATA_VERSION, 'v1') == \
+        cache.make_key(reloaded, DATA_VERSION, 'v1')
+    assert normalize_config(reloaded)['strategy_params'] == {}
+
+
+def test_key_changes_with_data_config_and_code():
+    """New data, different params or engine changes must invalidate."""
+    cache = ResultCache(cache_dir=tempfile.mkdtemp())
+    key = cache.make_key(BASE_CONFIG, DATA_VERSION, 'v1')
+
+    assert key != cache.make_key(BASE_CONFIG, dict(DATA_VERSION, max_id=43), 'v1')
+    assert key != cache.make_key(dict(BASE_CONFIG, commission=0.65), DATA_VERSION, 'v1')
+    assert key != cache.make_key(BASE_CONFIG, DATA_VERSION, 'v2')
+
+
+def test_round_trip_and_lru_eviction():
+    """Entries round-trip, and the least recently used is evicted first."""
+    cache = ResultCache(cache_dir=tempfile.mkdtemp(), max_bytes=250)
+    payload = {'initial_capital': 100000, 'pad': 'x' * 60}
+
+    cache.put('a', payload)
+    cache.put('b', payload)
+    os.utime(os.path.join(cache.cache_dir, 'a.json'), ns=(1, 1))
+    os.utime(os.path.join(cache.cache_dir, 'b.json'), ns=(2, 2))
+
+    assert cache.get('a') == payload  # Bumps 'a' to most recently used
+    cache.put('c', payload)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == payload
+    assert cache.get('c') == payload
+    assert cache.get_stats()['total_bytes'] <= 250
+
+
+def test_fingerprint_covers_runner_script(tmp_path):
+    """The runner builds the cached payload, so editing it invalidates entries."""
+    src = tmp_path / 'src'
+    src.mkdir()
+    (src / 'engine.py').write_text('x = 1\n')
+    runner = tmp_path / RUNNER_SCRIPT
+    runner.write_text('y = 1\n')
+
+    before = source_fingerprint(str(src))
+    runner.write_text('y = 22\n')
+    assert source_fingerprint(str(src)) != before
@@ -0,0 +1,82 @@
+"""
+Tests for the streaming results writer.
+
+Every format must carry the same data as the legacy row-by-row JSON.
+"""
+
+import sys
+import os
+import io
+import json
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+from results_writer import ResultsWriter
+
+
+def make_results(n: int = 7) -> dict:
+    """Results dict shaped like Backtest.generate_results() output."""
+    equity = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-15 09:30', periods=n, freq='min'),
+        'total_value': np.linspace(100000, 100600, n),
+        'settled_cash': 100000.0,
+        'unsettled_cash': -500.0,
+        'num_positions': np.arange(n) % 2,
+    })
+    equity['returns'] = equity['total_value'].pct_change()
+
+    trades = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-15 09:30', periods=3, freq='min'),
+        'symbol': 'SPY',
+        'direction': ['BUY', 'SELL', 'BUY'],
+        'quantity': [1, 1, 2],
+        'fill_price': [2.5, 2.75, np.nan],
+    })
+
+    return {
+        'initial_capital': 100000,
+        'sharpe_ratio': np.float64(1.25),
+        'equity_curve': equity,
+        'trades': trades,
+        'positions': pd.DataFrame(),
+    }
+
+
+def test_json_matches_legacy_shape():
+    """Single-document JSON keeps equity_curve and trades_data record lists."""
+    buffer = io.StringIO()
+    ResultsWriter(buffer, 'json', chunk_size=3).write(make_results())
+    parsed = json.loads(buffer.getvalue())
+
+    assert parsed['sharpe_ratio'] == 1.25
+    assert 'positions' not in parsed and 'trades' not in parsed
+    assert len(parsed['equity_curve']) == 7
+    assert set(parsed['equity_curve'][0]) == {
+        'timestamp', 'total_value', 'settled_cash', 'unsettled_cash', 'num_positions'
+    }
+    assert parsed['equity_curve'][-1]['total_value'] == 100600
+    assert parsed['trades_data'][2]['fill_price'] is None
+    assert parsed['trades_data'][0]['timestamp'].startswith('2024-01-15T09:30:00')
+
+
+def test_ndjson_and_columnar_chunks():
+    """Line formats stream a summary, bounded chunks and an end marker."""
+    for fmt, body_key in (('ndjson', 'rows'), ('columnar', 'columns')):
+        buffer = io.StringIO()
+        ResultsWriter(buffer, fmt, chunk_size=3).write(make_results())
+        lines = [json.loads(line) for line in buffer.getvalue().splitlines()]
+
+        assert lines[0]['type'] == 'summary'
+        assert lines[-1] == {'type': 'end', 'sections': {'equity_curve': 7, 'trades_data': 3}}
+
+        equity_chunks = [line[body_key] for line in lines if line['type'] == 'equity_curve']
+        assert len(equity_chunks) == 3  # 3 + 3 + 1 rows
+
+        if fmt == 'columnar':
+            values = sum((chunk['total_value'] for chunk in equity_chunks), [])
+        else:
+            values = [row['total_value'] for chunk in equity_chunks for row in chunk]
+        assert values == list(np.linspace(100000, 100600, 7))
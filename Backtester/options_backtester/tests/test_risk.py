@@ -0,0 +1,85 @@
+"""
+Tests for the portfolio Greeks book and Greek risk limits.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from events import create_signal_event, create_order_event
+from execution import ExecutionHandler
+from portfolio import Portfolio
+from event_log import EventLogger
+from positions import GREEKS
+from synthetic_data import generate_chains
+
+
+def test_fills_update_book_incrementally(snapshot):
+    """Net Greeks after each fill match a full rebuild from the table."""
+    chain = snapshot.chain
+    events = Queue()
+    execution = ExecutionHandler(events, snapshot, logger=EventLogger(sink='off'))
+    portfolio = Portfolio(events, initial_capital=100000, logger=EventLogger(sink='off'))
+
+    strikes = np.sort(chain['strike'].unique())
+    atm, otm_put = strikes[10], strikes[8]
+    for strike, option_type, direction, quantity in [(atm, 'C', 'BUY', 3), (otm_put, 'P', 'SELL', 2),
+                                                     (atm, 'C', 'SELL', 1)]:
+        order = create_order_event('SPY', 'MARKET', quantity, direction, strikes=[strike],
+                                   option_types=[option_type])
+        execution.execute_order(order)
+        portfolio.update_fill(events.get(block=False))
+
+    incremental = portfolio.get_greeks_exposure('SPY')
+    portfolio.greeks.rebuild(portfolio.positions)
+    rebuilt = portfolio.get_greeks_exposure('SPY')
+
+    for greek in GREEKS:
+        assert np.isclose(incremental[greek], rebuilt[greek])
+    assert incremental['delta'] > 0  # Net long calls, short puts
+    assert portfolio.get_greeks_exposure('QQQ') == {greek: 0.0 for greek in GREEKS}
+
+
+def test_signals_breaching_limits_are_skipped():
+    """Adding delta beyond the limit is rejected; reducing it is allowed."""
+    events = Queue()
+    portfolio = Portfolio(events, initial_capital=100000, logger=EventLogger(sink='off'),
+                          greek_limits={'delta': 150})
+    portfolio.greeks.add('SPY', np.array([120.0, 0.0, 0.0, 0.0]))
+
+    portfolio.update_signal(create_signal_event('SPY', 'LONG', strength=1, strikes=[470.0],
+                                                metadata={'delta': 0.5}))
+    assert events.empty()
+
+    portfolio.update_signal(create_signal_event('SPY', 'SHORT', strength=1, strikes=[470.0],
+                                                metadata={'delta': 0.5}))
+    assert events.get(block=False).direction == 'SELL'
+
+    # Other underlyings have their own budget
+    portfolio.update_signal(create_signal_event('QQQ', 'LONG', strength=1, strikes=[400.0],
+                                                metadata={'delta': 0.5}))
+    assert not events.empty()
+
+
+def test_tick_rebuild_follows_marks():
+    """Marking refreshes the Greeks from the tick's chain."""
+    chain = generate_chains(symbols=['SPY'], days=1, minutes=2, strikes=11, expirations=1)
+    first, last = sorted(chain['timestamp_available'].unique())
+    portfolio = Portfolio(Queue(), initial_capital=100000, logger=EventLogger(sink='off'))
+
+    quote = chain[chain['timestamp_available'] == first].iloc[0]
+    portfolio.positions.apply_fill('SPY', quote['strike'], quote['option_type'],
+                                   int(quote['expiration_timestamp']), 2, quote['mid_price'],
+                                   {greek: quote[greek] for greek in GREEKS})
+
+    tick = chain[chain['timestamp_available'] == last]
+    summary = portfolio.mark_to_market({'SPY': tick})
+    marked = tick[(tick['strike'] == quote['strike']) & (tick['option_type'] == quote['option_type'])].iloc[0]
+
+    assert np.isclose(summary['delta'], marked['delta'] * 200)
+    assert np.isclose(portfolio.get_greeks_exposure('SPY')['vega'], marked['vega'] * 200)
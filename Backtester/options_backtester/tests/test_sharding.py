@@ -0,0 +1,109 @@
+"""
+Tests for day-sharded parallel backtests.
+
+A run stitched together from sessions simulated in parallel must match
+the sequential run: same trades, same equity curve.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from backtest import Backtest
+from event_log import EventLogger
+from events import EventType, SignalEvent
+from portfolio import Portfolio
+from sharding import ShardedBacktest
+from strategy import BuyAndHoldStrategy
+
+
+SCALE = dict(days=3, minutes=390, strikes=5, expirations=1)
+
+
+def run_both(db, strategy_class, silent, workers=2):
+    settings = dict(symbols=['SPY'], start_date='2024-01-15', end_date='2024-01-18',
+                    initial_capital=100000, strategy_class=strategy_class, quiet=True)
+
+    with silent():
+        sequential = Backtest(db_connection=db.get_connection(), enable_checkpoints=False,
+                              **settings).run(verbose=False)
+        sharded = ShardedBacktest(db=db, workers=workers, **settings)
+        stitched = sharded.run()
+
+    return sequential, stitched, sharded
+
+
+def assert_same_run(sequential, stitched):
+    assert stitched['total_trades'] == sequential['total_trades']
+    assert np.isclose(stitched['final_value'], sequential['final_value'])
+
+    columns = ['total_value', 'settled_cash', 'unsettled_cash', 'num_positions']
+    expected = sequential['equity_curve']
+    actual = stitched['equity_curve']
+    assert list(actual['timestamp']) == list(expected['timestamp'])
+    assert np.allclose(actual[columns].to_numpy(dtype=float), expected[columns].to_numpy(dtype=float))
+
+
+def test_independent_sessions_are_stitched_without_resimulation(synthetic_db, morning_put_seller, silent):
+    """Daily flat sessions run in parallel and carry cash and T+1 settlements."""
+    sequential, stitched, sharded = run_both(synthetic_db(**SCALE), morning_put_seller, silent)
+
+    assert stitched['sharding'] == {'sessions': 3, 'workers': 2, 'resimulated': 0}
+    assert sequential['total_trades'] > 3  # Opens and 3:55pm closes
+    assert_same_run(sequential, stitched)
+
+
+def test_carried_strategy_state_forces_resimulation(synthetic_db, silent):
+    """Buy-and-hold only buys once, so later sessions re-run with its state."""
+    sequential, stitched, sharded = run_both(synthetic_db(**SCALE), BuyAndHoldStrategy, silent)
+
+    assert stitched['sharding']['resimulated'] == 2
+    assert_same_run(sequential, stitched)
+
+
+class HourlyBarReader(BuyAndHoldStrategy):
+    """Buy-and-hold that also looks at hourly bars (which restart each session when sharded)."""
+
+    def calculate_signals(self, market_event):
+        for symbol in market_event.data:
+            self.data.get_timeframe_bar(symbol, 60)
+        super().calculate_signals(market_event)
+
+
+def test_timeframe_bar_strategies_are_refused(synthetic_db, silent):
+    db = synthetic_db(**SCALE)
+    sharded = ShardedBacktest(symbols=['SPY'], start_date='2024-01-15', end_date='2024-01-18',
+                              initial_capital=100000, strategy_class=HourlyBarReader, db=db,
+                              workers=1, quiet=True)
+
+    with silent(), pytest.raises(ValueError, match='multi-timeframe'):
+        sharded.run()
+
+
+def test_position_size_cash_range_matches_sizing():
+    """Settled cash anywhere in the returned range gives the same size; the bounds are tight."""
+    portfolio = Portfolio(None, initial_capital=100000, logger=EventLogger(sink='off'))
+
+    def size_at(signal, cash):
+        portfolio.settled_cash = cash
+        return portfolio.calculate_position_size(signal)[0]
+
+    for strength in (0.5, 1.0, 3.0, 25.0):
+        signal = SignalEvent(type=EventType.SIGNAL, symbol='SPY', signal_type='SHORT', strength=strength)
+        for settled_cash in (0.0, 15000.0, 40000.0, 100000.0, 1e6):
+            portfolio.settled_cash = settled_cash
+            size, (low, high) = portfolio.calculate_position_size(signal)
+            assert low <= settled_cash < high
+
+            inside = [cash for cash in (low, (low + high) / 2, low + 1) if np.isfinite(cash)]
+            assert all(size_at(signal, cash) == size for cash in inside)
+
+            if low > 0:
+                assert size_at(signal, low - 1) != size
+            if np.isfinite(high):
+                assert size_at(signal, high) != size
@@ -0,0 +1,40 @@
+"""
+Tests for fast cold start.
+
+Heavy optional dependencies must stay deferred until first use, since
+every backtest the web server spawns pays for module-level imports.
+"""
+
+import sys
+import os
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def loaded_modules(code: str) -> set:
+    """Run code in a fresh interpreter and return top-level modules loaded."""
+    proc = subprocess.run(
+        [sys.executable, '-c', f"{code}\nimport sys\nprint(' '.join(sys.modules))"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return {name.split('.')[0] for name in proc.stdout.split()}
+
+
+def test_run_backtest_defers_heavy_imports():
+    """run_backtest must not import sklearn, scipy, tqdm or requests eagerly."""
+    modules = loaded_modules('import run_backtest')
+
+    for heavy in ('sklearn', 'scipy', 'tqdm', 'requests', 'strategy_validation'):
+        assert heavy not in modules, f"{heavy} imported at startup"
+
+
+def test_package_import_is_lazy():
+    """Importing the package resolves core names only on first access."""
+    modules = loaded_modules('import src')
+    assert 'pandas' not in modules
+    assert 'sqlalchemy' not in modules
+
+    modules = loaded_modules('import src\nsrc.FillEvent')
+    assert 'pandas' in modules
+    assert 'sqlalchemy' not in modules
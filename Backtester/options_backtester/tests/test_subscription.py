@@ -0,0 +1,88 @@
+"""
+Tests for strategy data subscriptions.
+"""
+
+import sys
+import os
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_handler import DataHandler
+from example_strategy import SimplePremiumSelling
+from subscription import DataSubscription, REQUIRED_COLUMNS
+
+
+SUBSCRIPTION = DataSubscription(columns=('implied_vol',), max_dte=3, option_types=('P',),
+                                moneyness=(0.97, 1.03))
+
+
+SCALE = dict(days=2, minutes=15, strikes=7, expirations=2)
+
+
+def make_handler(db, **kwargs):
+    return DataHandler(db(**SCALE).get_connection(), start_date='2024-01-15', end_date='2024-01-17',
+                       symbols=['SPY'], enable_multi_timeframe=False, **kwargs)
+
+
+def test_pushdown_matches_in_memory_filter(synthetic_db):
+    """The SQL slice equals the full chain filtered in pandas."""
+    data = make_handler(synthetic_db)
+    data.subscribe(SUBSCRIPTION)
+
+    rows = 0
+    while (market_event := data.update_bars()) is not None:
+        chain = market_event.data['SPY']
+        expected = SUBSCRIPTION.apply(data.get_options_chain('SPY', max_dte=3))
+        pd.testing.assert_frame_equal(chain, expected, check_dtype=False)
+
+        assert list(chain.columns) == list(REQUIRED_COLUMNS) + ['implied_vol']
+        assert set(chain['option_type']) <= {'P'}
+        rows += len(chain)
+
+    assert rows > 0
+
+
+def test_prefetched_slices_match_pushdown(synthetic_db):
+    """Subscriptions are applied to prefetched blocks the same way."""
+    direct = make_handler(synthetic_db)
+    prefetched = make_handler(synthetic_db, prefetch_depth=1)
+    for data in (direct, prefetched):
+        data.subscribe(SUBSCRIPTION)
+
+    while (expected := direct.update_bars()) is not None:
+        actual = prefetched.update_bars()
+        pd.testing.assert_frame_equal(actual.data['SPY'], expected.data['SPY'], check_dtype=False)
+
+    assert prefetched.update_bars() is None
+    prefetched.close()
+
+
+def test_premium_selling_sees_every_row(synthetic_db):
+    """SimplePremiumSelling's subscription only drops columns it never reads."""
+    data = make_handler(synthetic_db)
+    data.subscribe(SimplePremiumSelling.subscription)
+
+    while (market_event := data.update_bars()) is not None:
+        full = data.get_options_chain('SPY')
+        chain = market_event.data['SPY']
+        pd.testing.assert_frame_equal(chain, full[list(chain.columns)], check_dtype=False)
+
+
+def test_merge_covers_every_subscription():
+    puts = DataSubscription(columns=('implied_vol',), option_types=('P',), moneyness=(0.9, 1.0))
+    calls = DataSubscription(columns=('volume',), max_dte=3, option_types=('C',), moneyness=(1.0, 1.2))
+
+    merged = DataSubscription.merge([puts, calls])
+    assert merged == DataSubscription(columns=('implied_vol', 'volume'), max_dte=7,
+                                      option_types=('P', 'C'), moneyness=(0.9, 1.2))
+
+    # Any full-chain subscriber widens the merge to the full chain
+    assert DataSubscription.merge([puts, None]) is None
+    assert DataSubscription.merge([puts, DataSubscription()]).columns is None
+
+    with pytest.raises(ValueError):
+        DataSubscription(columns=('delta; DROP TABLE options_data_pit',))
@@ -0,0 +1,83 @@
+"""
+Tests for the trading calendar and business-day T+1 settlement.
+"""
+
+import sys
+import os
+from queue import Queue
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from clock import from_us, to_us
+from event_log import EventLogger
+from events import create_fill_event
+from portfolio import Portfolio
+from timeframe_aggregator import MultiTimeframeAggregator
+from trading_calendar import TradingCalendar
+
+
+def day(date: str) -> int:
+    return to_us(pd.Timestamp(date))
+
+
+def test_sessions_skip_weekends_and_holidays():
+    calendar = TradingCalendar('2024-01-01', '2024-12-31')
+
+    for holiday in ('2024-01-01', '2024-01-15', '2024-03-29', '2024-06-19', '2024-07-04',
+                    '2024-11-28', '2024-12-25'):
+        assert not calendar.is_session(day(holiday)), holiday
+    assert not calendar.is_session(day('2024-01-13'))  # Saturday
+    assert calendar.is_session(day('2024-01-16'))
+
+    # Friday -> Monday, and over Good Friday / Easter weekend
+    assert calendar.next_session(day('2024-01-12 14:00')) == day('2024-01-16')
+    assert calendar.next_session(day('2024-03-28')) == day('2024-04-01')
+
+    # Outside the precomputed window the same rules apply
+    assert calendar.next_session(day('2025-12-24')) == day('2025-12-26')
+    assert not calendar.is_session(day('2025-01-20'))  # MLK day 2025
+
+
+def test_early_close_moves_the_auto_close_cutoff():
+    calendar = TradingCalendar('2024-11-25', '2024-11-29')
+
+    opening, cutoff, close = calendar.session_bounds(day('2024-11-29 10:00'))
+    assert from_us(opening) == pd.Timestamp('2024-11-29 09:30')
+    assert from_us(cutoff) == pd.Timestamp('2024-11-29 12:55')
+    assert from_us(close) == pd.Timestamp('2024-11-29 13:00')
+
+    assert calendar.in_auto_close(day('2024-11-29 12:56'))
+    assert not calendar.in_auto_close(day('2024-11-29 15:56'))
+    assert calendar.in_auto_close(day('2024-11-27 15:56'))
+
+
+def test_friday_fills_settle_at_monday_open():
+    portfolio = Portfolio(Queue(), initial_capital=100000, logger=EventLogger(sink='off'),
+                          calendar=TradingCalendar('2024-01-01', '2024-01-31'))
+    fill = create_fill_event(symbol='SPY', quantity=1, direction='SELL', fill_price=2.0, commission=0.65,
+                             timestamp=pd.Timestamp('2024-01-19 15:55'), strikes=[470.0], option_types=['P'])
+    portfolio.update_fill(fill)
+
+    settlement = portfolio.pending_settlements[0]
+    assert settlement['settlement_date'] == pd.Timestamp('2024-01-22 09:30')
+
+    portfolio.process_settlements(pd.Timestamp('2024-01-20 15:55'))  # Old calendar-day T+1
+    assert portfolio.settled_cash == 100000
+
+    portfolio.process_settlements(day('2024-01-22 09:30'))
+    assert portfolio.settled_cash == 100000 + settlement['amount']
+    assert portfolio.unsettled_cash == 0 and portfolio.pending_settlements == []
+
+
+def test_bar_starts_from_session_open():
+    aggregator = MultiTimeframeAggregator(timeframes=[15, 60], calendar=TradingCalendar('2024-01-02', '2024-01-02'))
+    for minute in pd.date_range('2024-01-02 09:30', '2024-01-02 11:29', freq='min'):
+        aggregator.aggregate_bar({'timestamp': minute, 'open': 1.0, 'high': 1.0, 'low': 1.0,
+                                  'close': 1.0, 'volume': 1})
+
+    assert [bar['timestamp'].strftime('%H:%M') for bar in aggregator.get_bars(60)] == ['09:30']
+    assert aggregator.get_bar(15)['timestamp'] == pd.Timestamp('2024-01-02 11:00')
+    assert aggregator._get_bar_start(pd.Timestamp('2024-01-02 10:44:59'), 15) == pd.Timestamp('2024-01-02 10:30')
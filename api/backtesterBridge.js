@@ -39,7 +39,9 @@ export class BacktesterBridge {
         initial_capital: config.initial_capital,
         strategy_name: config.strategy_name,
         strategy_params: JSON.parse(config.strategy_params || '{}'),
-        commission: config.commission || 0.05
+        commission: config.commission || 0.05,
+        // Structured progress arrives on fd 3 (see src/progress.py)
+        progress_channel: 3
       };
 
       // Create temporary config file
@@ -48,7 +50,9 @@ export class BacktesterBridge {
 
       // Spawn Python process
       const pythonScript = path.join(this.backtesterPath, 'run_backtest.py');
-      const pythonProcess = spawn(this.pythonPath, [pythonScript, configPath]);
+      const pythonProcess = spawn(this.pythonPath, [pythonScript, configPath], {
+        stdio: ['pipe', 'pipe', 'pipe', 'pipe']
+      });
 
       this.runningBacktests.set(configId, pythonProcess);
 
@@ -106,6 +110,42 @@ export class BacktesterBridge {
         }
       });
 
+      // Structured NDJSON progress channel
+      let progressBuffer = '';
+      pythonProcess.stdio[3].on('data', (data) => {
+        progressBuffer += data.toString();
+        const lines = progressBuffer.split('\n');
+        progressBuffer = lines.pop();
+
+        for (const line of lines) {
+          if (!line.trim() || !global.broadcastToAllUsers) continue;
+
+          let record;
+          try {
+            record = JSON.parse(line);
+          } catch (err) {
+            continue;
+          }
+
+          if (record.type === 'progress') {
+            global.broadcastToAllUsers({
+              type: 'backtest_progress',
+              config_id: configId,
+              config_name: config.name,
+              current_iteration: record.iteration,
+              total_iterations: record.total,
+              progress_percent: record.pct,
+              iterations_per_second: record.iter_per_sec,
+              eta_seconds: record.eta_s,
+              eta_formatted: this.formatTime(record.eta_s || 0),
+              trades: record.trades,
+              equity: record.equity,
+              sim_timestamp: record.timestamp
+            });
+          }
+        }
+      });
+
       // Collect stderr
       pythonProcess.stderr.on('data', (data) => {
         stderr += data.toString();